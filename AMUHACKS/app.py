@@ -1,30 +1,117 @@
-from fastapi import FastAPI
+import json
+import asyncio
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from logic.router import safety_router
 from detection.mood_detector import detect_mood
 from detection.financial_intent_detector import detect_financial_intent
-from logic.step_manager import run_steps
+from detection.signal_extractor import extract_signals
+from config.settings import (
+    SIGNAL_EXTRACTOR,
+    BATCH_MAX_ITEMS,
+    BATCH_LLM_CONCURRENCY,
+    BATCH_STREAM_THRESHOLD
+)
+from logic.step_manager import run_steps, arun_steps, astream_steps, anext_step, emergency_override
+from logic.session_store import SessionStore
 from utils.json_formatter import format_json
+from llm.groq_client import response_cache
 
 
 class UserInput(BaseModel):
     user_text: str
 
 
+class BatchInput(BaseModel):
+    texts: list[str]
+    stream: bool | None = None
+
+
+class SessionReply(BaseModel):
+    user_reply: str | None = None
+
+
 app = FastAPI(title="Financial Crisis Support AI")
 
+sessions = SessionStore()
 
 
-@app.post("/crisis-support")
-def crisis_support(data: UserInput):
 
-    user_text = data.user_text
+def analyze(user_text):
+
+    if SIGNAL_EXTRACTOR:
+        signals = extract_signals(user_text)
+        return signals["mood"], signals["intent"], signals["shock"], signals["risk_level"]
 
     mood = detect_mood(user_text)
     intent, shock = detect_financial_intent(user_text)
     risk_level = safety_router(user_text, mood, shock)
 
+    return mood, intent, shock, risk_level
+
+
+def analyze_batch(texts):
+
+    # ✅ Detector stage once per distinct text - ticket backlogs repeat a lot
+    analyzed = {text: analyze(text) for text in dict.fromkeys(texts)}
+
+    return [analyzed[text] for text in texts]
+
+
+async def batch_results(texts):
+
+    """Async generator - per-item results in input order, LLM stage bounded by a semaphore"""
+
+    semaphore = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+
+    async def run_item(index, text, signals):
+
+        async with semaphore:
+            try:
+                result = await arun_steps(text, *signals)
+            except Exception as e:
+                result = {"status": "error", "message": str(e)}
+
+        return format_json({"index": index, **result})
+
+    tasks = [
+        asyncio.create_task(run_item(index, text, signals))
+        for index, (text, signals) in enumerate(zip(texts, analyze_batch(texts)))
+    ]
+
+    try:
+        # Items run concurrently but are handed out in input order
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/crisis-support")
+async def crisis_support(data: UserInput):
+
+    user_text = data.user_text
+
+    mood, intent, shock, risk_level = analyze(user_text)
+
+    # 🔥 Async LLM calls - no worker thread is held while waiting on Groq
+    result = await arun_steps(user_text, mood, intent, shock, risk_level)
+
+    return format_json(result)
+
+
+@app.post("/crisis-support/sync")
+def crisis_support_sync(data: UserInput):
+
+    # Thread-pool version kept for comparison (benchmarks/financial_async_load.py)
+    user_text = data.user_text
+
+    mood, intent, shock, risk_level = analyze(user_text)
+
     result = run_steps(user_text, mood, intent, shock, risk_level)
 
     return format_json(result)
@@ -33,3 +120,120 @@ def crisis_support(data: UserInput):
 @app.get("/")
 def home():
     return {"message": "Financial Crisis Support AI is running"}
+
+
+@app.get("/llm-cache")
+def llm_cache_stats():
+    return response_cache.stats()
+
+
+def sse_event(event, data):
+
+    return f"event: {event}\ndata: {json.dumps(format_json(data))}\n\n"
+
+
+@app.post("/crisis-support/stream")
+async def crisis_support_stream(data: UserInput):
+
+    user_text = data.user_text
+
+    mood, intent, shock, risk_level = analyze(user_text)
+
+    async def events():
+
+        # 🔥 Each step goes out as soon as it is generated, then one final status event
+        async for kind, payload in astream_steps(user_text, mood, intent, shock, risk_level):
+            yield sse_event("step" if kind == "step" else "status", payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def session_step(session_id, session, user_reply=None):
+
+    # 🔥 One step at a time per session - concurrent /next calls queue up here
+    async with session["lock"]:
+
+        # A request queued behind the one that finished the flow finds it gone
+        if sessions.get(session_id) is None:
+            raise HTTPException(status_code=404, detail="Session not found or expired")
+
+        step, result = await anext_step(session, user_reply)
+
+        if result is not None:
+            # ✅ Flow finished - free the slot
+            sessions.delete(session_id)
+            return format_json({"session_id": session_id, **result})
+
+        return format_json({
+            "session_id": session_id,
+            "status": "in_progress",
+            "steps_taken": len(session["history"]),
+            "step": step
+        })
+
+
+@app.post("/sessions")
+async def create_session(data: UserInput):
+
+    user_text = data.user_text
+
+    # 🔥 Detectors run once per session, not once per step
+    mood, intent, shock, risk_level = analyze(user_text)
+
+    override = emergency_override(risk_level)
+    if override:
+        return format_json(override)
+
+    session = {
+        "user_text": user_text,
+        "mood": mood,
+        "intent": intent,
+        "shock": shock,
+        "risk_level": risk_level,
+        "history": [],
+        "lock": asyncio.Lock()
+    }
+
+    session_id = sessions.create(session)
+
+    return await session_step(session_id, session)
+
+
+@app.post("/sessions/{session_id}/next")
+async def next_session_step(session_id: str, data: SessionReply | None = None):
+
+    session = sessions.get(session_id)
+
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    return await session_step(session_id, session, data.user_reply if data else None)
+
+
+@app.post("/crisis-support/batch")
+async def crisis_support_batch(data: BatchInput):
+
+    texts = data.texts
+
+    if len(texts) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(texts)} items (max {BATCH_MAX_ITEMS})"
+        )
+
+    stream = data.stream if data.stream is not None else len(texts) > BATCH_STREAM_THRESHOLD
+
+    if not stream:
+        return {"results": [item async for item in batch_results(texts)]}
+
+    async def lines():
+
+        # 🔥 Large batches: one JSON line per item as soon as it (and all before it) are done
+        async for item in batch_results(texts):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,5 +1,54 @@
+import os
+
 MAX_STEPS = 7
 OPTIMAL_STEPS = 5
 
 MODEL_PROVIDER = "groq"
 MODEL_NAME = "llama-3.3-70b-versatile"
+
+FALLBACK_MODEL_NAME = "llama-3.1-8b-instant"
+LATENCY_P95_THRESHOLD_SECONDS = 5.0
+LATENCY_WINDOW_SIZE = 50
+LATENCY_MIN_SAMPLES = 5
+FALLBACK_COOLDOWN_SECONDS = 60
+
+# One LLM call returns every step; run_steps checks them locally
+MULTI_STEP_GENERATION = os.getenv("MULTI_STEP_GENERATION", "false").lower() == "true"
+
+# Step-by-step session API (POST /sessions)
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+
+# Single-scan detector stage with match positions (detection/signal_extractor.py)
+SIGNAL_EXTRACTOR = os.getenv("SIGNAL_EXTRACTOR", "false").lower() == "true"
+
+# POST /crisis-support/batch
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+BATCH_STREAM_THRESHOLD = int(os.getenv("BATCH_STREAM_THRESHOLD", "50"))
+
+# call_llm response cache (llm/response_cache.py); set a SQLite path to persist it
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH") or None
+
+# Few-shot examples per prompt, picked by intent/shock/mood and word overlap
+FEW_SHOT_TOP_K = int(os.getenv("FEW_SHOT_TOP_K", "3"))
+
+# run_steps time budget; 0 disables it. No new LLM call starts unless the
+# remaining budget covers the primary model's p95 (or the estimate below)
+STEP_DEADLINE_SECONDS = float(os.getenv("STEP_DEADLINE_SECONDS", "25"))
+STEP_ESTIMATE_SECONDS = float(os.getenv("STEP_ESTIMATE_SECONDS", "3"))
+
+# Fire all step requests of run_steps at once and keep the prefix up to the
+# first resolved/emergency step (extra LLM calls for lower latency)
+SPECULATIVE_STEPS = os.getenv("SPECULATIVE_STEPS", "false").lower() == "true"
+SPECULATIVE_MAX_WORKERS = int(os.getenv("SPECULATIVE_MAX_WORKERS", "32"))
+
+# Token bucket in front of every Groq request (llm/rate_limiter.py); 0 disables it.
+# On by default only with speculation, which multiplies the call rate
+LLM_RATE_LIMIT_PER_SECOND = float(
+    os.getenv("LLM_RATE_LIMIT_PER_SECOND", "20" if SPECULATIVE_STEPS else "0")
+)
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", "20"))
@@ -1,19 +1,20 @@
-def detect_financial_intent(text: str):
-    t = text.lower()
-
-    if any(x in t for x in ["scam","fraud","hacked"]):
-        return "fraud","fraud_shock"
+# Checked in order - the first rule with a matching keyword wins
+INTENT_RULES = [
+    ("fraud", "fraud_shock", ["scam","fraud","hacked"]),
+    ("debt", "debt_shock", ["loan","emi","debt"]),
+    ("salary_issue", "income_shock", ["salary","not paid"]),
+    ("financial_loss", "asset_shock", ["lost money","crypto","trading loss"]),
+    ("job_loss", "income_shock", ["job lost","laid off"])
+]
 
-    if any(x in t for x in ["loan","emi","debt"]):
-        return "debt","debt_shock"
+DEFAULT_INTENT = ("financial_loss", "income_shock")
 
-    if any(x in t for x in ["salary","not paid"]):
-        return "salary_issue","income_shock"
 
-    if any(x in t for x in ["lost money","crypto","trading loss"]):
-        return "financial_loss","asset_shock"
+def detect_financial_intent(text: str):
+    t = text.lower()
 
-    if any(x in t for x in ["job lost","laid off"]):
-        return "job_loss","income_shock"
+    for intent, shock, keywords in INTENT_RULES:
+        if any(x in t for x in keywords):
+            return intent, shock
 
-    return "financial_loss","income_shock"
+    return DEFAULT_INTENT
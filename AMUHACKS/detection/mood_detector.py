@@ -1,20 +1,21 @@
-def detect_mood(text: str) -> str:
-    t = text.lower()
+PANIC_WORDS = [
+    "panic","can't breathe","heart racing",
+    "dying","losing control","terrified"
+]
+
+STRESS_WORDS = [
+    "worried","stressed","anxious",
+    "tense","overthinking","scared"
+]
 
-    panic_words = [
-        "panic","can't breathe","heart racing",
-        "dying","losing control","terrified"
-    ]
 
-    stress_words = [
-        "worried","stressed","anxious",
-        "tense","overthinking","scared"
-    ]
+def detect_mood(text: str) -> str:
+    t = text.lower()
 
-    if any(w in t for w in panic_words):
+    if any(w in t for w in PANIC_WORDS):
         return "panic"
 
-    if any(w in t for w in stress_words):
+    if any(w in t for w in STRESS_WORDS):
         return "stress"
 
     return "neutral"
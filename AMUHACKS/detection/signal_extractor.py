@@ -0,0 +1,108 @@
+import re
+
+from detection.mood_detector import PANIC_WORDS, STRESS_WORDS
+from detection.financial_intent_detector import INTENT_RULES, DEFAULT_INTENT
+from logic.router import EXTREME_RISK_PHRASES, route_risk
+
+
+class SignalExtractor:
+    """
+    Mood, intent/shock and extreme-risk detection in one scan.
+    All lexicons go into one trie; a regex compiled from the trie finds
+    each position where some term starts, and the trie walk from there
+    reports every term (overlaps included), so results match the
+    separate detectors exactly. Positions index the lowercased text.
+    """
+
+    def __init__(self, panic_words=PANIC_WORDS, stress_words=STRESS_WORDS,
+                 intent_rules=INTENT_RULES, extreme_phrases=EXTREME_RISK_PHRASES):
+        self.intent_rules = intent_rules
+        self._trie = {}
+
+        for word in panic_words:
+            self._add(word, ("mood", "panic"))
+        for word in stress_words:
+            self._add(word, ("mood", "stress"))
+        for index, (intent, _, keywords) in enumerate(intent_rules):
+            for word in keywords:
+                self._add(word, ("intent", index))
+        for phrase in extreme_phrases:
+            self._add(phrase, ("risk", "extreme"))
+
+        self._pattern = re.compile(self._trie_regex(self._trie))
+
+    def _add(self, term, signal):
+        node = self._trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, []).append((term, signal))
+
+    def _trie_regex(self, node):
+        # Prefix-factored alternation, e.g. "lo(?:an|st money)"
+        branches = [re.escape(ch) + self._trie_regex(child)
+                    for ch, child in sorted(node.items(), key=lambda kv: kv[0] or "") if ch is not None]
+        if not branches:
+            return ""
+        if len(branches) == 1 and None not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if None in node else "")
+
+    def matches(self, text):
+        t = text.lower()
+        found = []
+        match = self._pattern.search(t)
+
+        while match:
+            start = match.start()
+            node = self._trie
+
+            for end in range(start, len(t)):
+                node = node.get(t[end])
+                if node is None:
+                    break
+                for term, signal in node.get(None, ()):
+                    found.append({"term": term, "signal": signal, "start": start, "end": end + 1})
+
+            # Resume one past the start so overlapping terms are not skipped
+            match = self._pattern.search(t, start + 1)
+
+        return found
+
+    def extract(self, text):
+        found = self.matches(text)
+        kinds = {m["signal"] for m in found}
+
+        if ("mood", "panic") in kinds:
+            mood = "panic"
+        elif ("mood", "stress") in kinds:
+            mood = "stress"
+        else:
+            mood = "neutral"
+
+        rules = [index for kind, index in kinds if kind == "intent"]
+        intent, shock = self.intent_rules[min(rules)][:2] if rules else DEFAULT_INTENT
+
+        risk_level = route_risk(mood, shock, ("risk", "extreme") in kinds)
+
+        return {
+            "mood": mood,
+            "intent": intent,
+            "shock": shock,
+            "risk_level": risk_level,
+            "matches": [
+                {"term": m["term"], "signal": f"{m['signal'][0]}:{self._label(m['signal'])}",
+                 "start": m["start"], "end": m["end"]}
+                for m in found
+            ]
+        }
+
+    def _label(self, signal):
+        kind, value = signal
+        return self.intent_rules[value][0] if kind == "intent" else value
+
+
+signal_extractor = SignalExtractor()
+
+
+def extract_signals(text: str):
+    return signal_extractor.extract(text)
@@ -0,0 +1,63 @@
+from logic.timer_decider import decide_timer
+
+
+# Safe, generic next steps per intent for when the LLM loop runs out of time
+NEXT_STEP_TEMPLATES = {
+    "fraud": [
+        "Call your bank now and ask them to block your cards and UPI.",
+        "Report the fraud on the cybercrime helpline 1930 or cybercrime.gov.in.",
+        "Do not share any OTP or PIN, even with callers claiming to be the bank."
+    ],
+    "debt": [
+        "Write down each loan or EMI with its amount and due date.",
+        "Call your lender and ask about restructuring or a payment holiday.",
+        "Avoid taking a new loan to pay off an old one today."
+    ],
+    "salary_issue": [
+        "Write down the months and amounts that are unpaid.",
+        "Ask HR in writing (email) for a date when salary will be paid.",
+        "List the bills that cannot wait and the ones that can."
+    ],
+    "financial_loss": [
+        "Pause all further trades or transfers for today.",
+        "Write down what you still have - savings, income, assets.",
+        "Talk it through with someone you trust before deciding anything."
+    ],
+    "job_loss": [
+        "List your essential monthly expenses.",
+        "Check your final settlement, PF and any severance you are owed.",
+        "Tell one trusted person what happened today."
+    ]
+}
+
+DEFAULT_NEXT_STEPS = [
+    "Pause and avoid big financial decisions today.",
+    "Write down what happened and what you owe or are owed.",
+    "Reach out to a trusted person to talk it through."
+]
+
+
+def build_partial_response(history, intent, mood, reason):
+
+    templates = NEXT_STEP_TEMPLATES.get(intent, DEFAULT_NEXT_STEPS)
+
+    next_steps = [
+        {
+            "step": len(history) + i,
+            "instruction": instruction,
+            "timer_seconds": decide_timer(mood),
+            "actionable": True,
+            "resolved": False,
+            "templated": True
+        }
+        for i, instruction in enumerate(templates, 1)
+    ]
+
+    return {
+        "status": "partial",
+        "reason": reason,
+        "steps_taken": len(history),
+        "steps": history,
+        "next_steps": next_steps,
+        "message": "Here is what you can do next while we finish preparing guidance."
+    }
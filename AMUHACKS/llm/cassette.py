@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+def request_key(messages, **params):
+
+    payload = json.dumps(
+        {"messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """
+    Record/replay store for call_llm responses.
+
+    mode "record" appends every response (with model, usage and observed
+    latency) to a JSONL file, "replay" serves them back without calling
+    Groq, optionally sleeping for the recorded latency.
+
+    Copy of the medical app's runtime/cassette.py - this app runs on its
+    own and its config package clashes with the root one, so it can't
+    import it. Keys cover the messages only (there are no graph nodes
+    here) and replay(sleep=False) lets acall_llm await the latency.
+    Keep fixes to the shared parts in sync.
+    """
+
+    def __init__(self, path, mode="off", replay_latency=False):
+
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._entries = {}
+        self._cursor = {}
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+
+    def _open(self, mode):
+
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self):
+
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found for replay: {self.path}")
+
+        with self._open("r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["k"], []).append(entry)
+
+    def record(self, key, content, model, latency, usage):
+
+        line = json.dumps(
+            {"k": key, "m": model, "c": content, "l": round(latency, 4), "u": usage},
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            with self._open("a") as f:
+                f.write(line + "\n")
+
+    def replay(self, key, sleep=True):
+
+        with self._lock:
+            entries = self._entries.get(key)
+
+            if not entries:
+                raise CassetteMiss(f"No recorded response for request {key}")
+
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            entry = entries[index % len(entries)]
+
+        # Async callers pass sleep=False and await the latency themselves
+        if self.replay_latency and sleep:
+            time.sleep(entry["l"])
+
+        return entry
@@ -0,0 +1,110 @@
+import json
+import re
+import threading
+
+
+def tokens(text):
+
+    return frozenset(re.findall(r"[a-z0-9']+", text.lower()))
+
+
+class FewShotStore:
+    """
+    Few-shot library indexed by intent, shock and mood. select() ranks
+    the examples sharing a tag with the request (tag matches first, then
+    word overlap with the user text) and returns the top k. Each example's
+    user/assistant messages are serialized once at load time, and the
+    message prefix for each selection is built once and reused.
+    Prefix dicts are shared between requests and must not be mutated.
+    """
+
+    TAG_WEIGHTS = {"intent": 3, "shock": 2, "mood": 1}
+
+    def __init__(self, examples, systems, k=2, tagger=None):
+
+        self.k = k
+        self.systems = systems
+        self._examples = []
+        self._index = {tag: {} for tag in self.TAG_WEIGHTS}
+        self._prefixes = {}
+        self._lock = threading.Lock()
+
+        for ex in examples:
+            tags = {tag: ex.get(tag) for tag in self.TAG_WEIGHTS}
+
+            # Untagged examples get the detectors' reading of their user text
+            if tagger and not all(tags.values()):
+                detected = tagger(ex["user"])
+                tags = {tag: tags[tag] or detected.get(tag) for tag in tags}
+
+            example_id = len(self._examples)
+            self._examples.append({
+                "tags": tags,
+                "tokens": tokens(ex["user"]),
+                "user": {"role": "user", "content": ex["user"]},
+                "step": {"role": "assistant", "content": json.dumps(ex["assistant"])},
+                "steps": {"role": "assistant", "content": json.dumps({"steps": [ex["assistant"]]})}
+            })
+
+            for tag, value in tags.items():
+                self._index[tag].setdefault(value, []).append(example_id)
+
+    def __len__(self):
+
+        return len(self._examples)
+
+    def select(self, user_text, mood, intent, shock):
+
+        if len(self._examples) <= self.k:
+            return tuple(range(len(self._examples)))
+
+        wanted = {"intent": intent, "shock": shock, "mood": mood}
+        candidates = set()
+
+        for tag, value in wanted.items():
+            candidates.update(self._index[tag].get(value, ()))
+
+        # Not enough tagged neighbours - rank the whole library
+        if len(candidates) < self.k:
+            candidates = range(len(self._examples))
+
+        query = tokens(user_text)
+
+        def score(example_id):
+            ex = self._examples[example_id]
+            tag_score = sum(
+                weight for tag, weight in self.TAG_WEIGHTS.items()
+                if ex["tags"][tag] == wanted[tag]
+            )
+            union = query | ex["tokens"]
+            overlap = len(query & ex["tokens"]) / len(union) if union else 0.0
+            return (tag_score, overlap, -example_id)
+
+        ranked = sorted(candidates, key=score, reverse=True)[:self.k]
+
+        # Keep library order so the same selection always yields the same prefix
+        return tuple(sorted(ranked))
+
+    def prefix(self, mode, example_ids):
+
+        key = (mode, example_ids)
+        prefix = self._prefixes.get(key)
+
+        if prefix is None:
+            messages = [{"role": "system", "content": self.systems[mode]}]
+
+            for example_id in example_ids:
+                ex = self._examples[example_id]
+                messages.append(ex["user"])
+                messages.append(ex[mode])
+
+            prefix = tuple(messages)
+
+            with self._lock:
+                prefix = self._prefixes.setdefault(key, prefix)
+
+        return prefix
+
+    def messages(self, mode, user_text, mood, intent, shock):
+
+        return list(self.prefix(mode, self.select(user_text, mood, intent, shock)))
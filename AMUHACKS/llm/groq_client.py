@@ -1,17 +1,63 @@
 import os
 import json
-from groq import Groq
-from config.settings import MODEL_NAME
+import hashlib
+import time
+import asyncio
+from groq import Groq, AsyncGroq
+from llm.cassette import Cassette, request_key
+from llm.model_policy import model_policy
+from llm.response_cache import ResponseCache
+from llm.few_shot_store import FewShotStore
+from llm.rate_limiter import RateLimiter, RateLimitTimeout
+from detection.mood_detector import detect_mood
+from detection.financial_intent_detector import detect_financial_intent
+from config.settings import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_SQLITE_PATH,
+    FEW_SHOT_TOP_K,
+    LLM_RATE_LIMIT_PER_SECOND,
+    LLM_RATE_LIMIT_BURST
+)
+from utils.logger import log
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 🎞️ Record/replay (LLM_CASSETTE_MODE=off|record|replay) for offline runs
+cassette = Cassette(
+    os.getenv("LLM_CASSETTE_PATH", "cassettes/financial.jsonl.gz"),
+    mode=os.getenv("LLM_CASSETTE_MODE", "off"),
+    replay_latency=os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "false").lower() == "true"
+)
+
 api_key = os.getenv("GROQ_API_KEY")
 
-if not api_key:
+if not api_key and cassette.mode != "replay":
     raise ValueError("GROQ_API_KEY not found in .env file")
 
-client = Groq(api_key=api_key)
+client = Groq(api_key=api_key) if api_key else None
+
+# 🔥 Shared by all requests - keeps parallel step generation under the provider limit
+rate_limiter = RateLimiter(LLM_RATE_LIMIT_PER_SECOND, LLM_RATE_LIMIT_BURST)
+
+# 🔥 One AsyncGroq client shared by all requests (httpx pools connections per event loop)
+_async_client = None
+_async_client_loop = None
+
+
+def get_async_client():
+
+    global _async_client, _async_client_loop
+
+    loop = asyncio.get_running_loop()
+
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = AsyncGroq(api_key=api_key)
+        _async_client_loop = loop
+
+    return _async_client
 
 with open("llm/system_instruction.txt", encoding="utf-8") as f:
     SYSTEM = f.read()
@@ -19,24 +65,97 @@ with open("llm/system_instruction.txt", encoding="utf-8") as f:
 with open("llm/few_shot_examples.json", encoding="utf-8") as f:
     FEW_SHOTS = json.load(f)
 
+# 🔥 Multi-step mode - the whole plan in one response instead of one call per step
+STEPS_INSTRUCTION = """
+
+MULTI-STEP MODE:
+Return every step in one response, in order, wrapped as:
+
+{
+ "steps": [ step objects following the schema above ]
+}
+
+Set "resolved": true on the step after which the situation is handled and stop there.
+"""
+
+
+def tag_example(text):
+
+    intent, shock = detect_financial_intent(text)
+
+    return {"intent": intent, "shock": shock, "mood": detect_mood(text)}
+
+
+# ✅ Only the top-k relevant examples go into each prompt, serialized once at startup
+few_shots = FewShotStore(
+    FEW_SHOTS,
+    systems={"step": SYSTEM, "steps": SYSTEM + STEPS_INSTRUCTION},
+    k=FEW_SHOT_TOP_K,
+    tagger=tag_example
+)
+
+# ✅ Editing the system prompt or few-shots invalidates cached responses
+PROMPT_VERSION = hashlib.sha256(
+    (SYSTEM + json.dumps(FEW_SHOTS, sort_keys=True) + str(FEW_SHOT_TOP_K)).encode("utf-8")
+).hexdigest()[:16]
+
+response_cache = ResponseCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl=LLM_CACHE_TTL_SECONDS,
+    sqlite_path=LLM_CACHE_SQLITE_PATH,
+    enabled=LLM_CACHE_ENABLED
+)
 
-def call_llm(user_text, mood, intent, shock, step):
 
-    messages = [
-        {"role": "system", "content": SYSTEM}
-    ]
+def request_options(deadline, now):
 
-    # Few shot examples
-    for ex in FEW_SHOTS:
-        messages.append({
-            "role": "user",
-            "content": ex["user"]
-        })
+    # ⏱️ run_steps deadline - the request may not outlive the remaining budget
+    if deadline is None:
+        return {}
 
-        messages.append({
-            "role": "assistant",
-            "content": json.dumps(ex["assistant"])
-        })
+    return {"timeout": max(deadline - now, 0.1)}
+
+
+def out_of_time(deadline):
+
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _create(model, messages, deadline=None):
+
+    rate_limiter.acquire(deadline)
+
+    start = time.monotonic()
+
+    try:
+        res = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.2,
+            response_format={"type": "json_object"},
+            **request_options(deadline, start)
+        )
+    except Exception:
+        model_policy.record(model, time.monotonic() - start, ok=False)
+
+        if model == model_policy.fallback or out_of_time(deadline):
+            raise
+
+        # Primary failed - retry the same request on the fallback model
+        log(f"call_llm: {model} failed, retrying on {model_policy.fallback}")
+        return _create(model_policy.fallback, messages, deadline)
+
+    latency = time.monotonic() - start
+    model_policy.record(model, latency)
+    log(f"call_llm: model={model} latency={latency:.2f}s")
+
+    return res, model
+
+
+def build_messages(user_text, mood, intent, shock, step, history=None):
+
+    # System prompt + the most relevant few-shot examples
+    messages = few_shots.messages("step", user_text, mood, intent, shock)
 
     prompt = f"""
 User situation: {user_text}
@@ -45,6 +164,48 @@ Mood: {mood}
 Financial intent: {intent}
 Shock category: {shock}
 Current step: {step}
+{format_history(history)}
+Return ONLY valid JSON.
+Do not explain.
+Follow the schema strictly.
+"""
+
+    messages.append({
+        "role": "user",
+        "content": prompt
+    })
+
+    return messages
+
+
+def format_history(history):
+
+    # ✅ Session API - later steps see what was already suggested and how the user replied
+    if not history:
+        return ""
+
+    lines = ["", "Previous steps:"]
+
+    for item in history:
+        line = f"{item.get('step')}. {item.get('instruction')}"
+        if item.get("user_reply"):
+            line += f" (user replied: {item['user_reply']})"
+        lines.append(line)
+
+    return "\n".join(lines) + "\n"
+
+
+def build_steps_messages(user_text, mood, intent, shock, max_steps):
+
+    messages = few_shots.messages("steps", user_text, mood, intent, shock)
+
+    prompt = f"""
+User situation: {user_text}
+
+Mood: {mood}
+Financial intent: {intent}
+Shock category: {shock}
+Maximum steps: {max_steps}
 
 Return ONLY valid JSON.
 Do not explain.
@@ -56,20 +217,40 @@ Follow the schema strictly.
         "content": prompt
     })
 
-    try:
+    return messages
 
-        res = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=messages,
-            temperature=0.2,
-            response_format={"type": "json_object"}
-        )
 
-        content = res.choices[0].message.content
+def parse_output(content, model):
+
+    output = json.loads(content)
+
+    if isinstance(output, dict):
+        output["_model"] = model
+
+    return output
+
+
+def parse_steps(content, model, max_steps):
+
+    output = json.loads(content)
+
+    if isinstance(output, dict):
+        output = output.get("steps", [])
+
+    if not isinstance(output, list):
+        return []
+
+    steps = [step for step in output if isinstance(step, dict)][:max_steps]
+
+    for step in steps:
+        step["_model"] = model
+
+    return steps
 
-        return json.loads(content)
 
-    except json.JSONDecodeError:
+def fallback_output(step, error):
+
+    if isinstance(error, json.JSONDecodeError):
 
         # 🔥 LLM returned garbage
         return {
@@ -81,15 +262,195 @@ Follow the schema strictly.
             "_internal_status": "llm_json_error"
         }
 
+    # 🔥 API failure fallback (VERY IMPORTANT FOR DEMO)
+
+    return {
+        "step": step,
+        "instruction": "Our system is experiencing a delay. Please pause and avoid financial decisions for a moment.",
+        "timer_seconds": 30,
+        "actionable": False,
+        "resolved": False,
+        "_internal_status": str(error)
+    }
+
+
+def cache_key(user_text, mood, intent, shock, step, history):
+
+    # Session steps depend on the conversation so far - never cached
+    if history:
+        return None
+
+    return response_cache.key(PROMPT_VERSION, user_text, mood, intent, shock, step)
+
+
+def cache_output(key, output):
+
+    # 🔥 Only real answers - fallback dicts carry _internal_status
+    if key and isinstance(output, dict) and "_internal_status" not in output:
+        response_cache.put(key, output)
+
+
+def _record(key, res, model, latency):
+
+    cassette.record(
+        key,
+        res.choices[0].message.content,
+        model,
+        latency,
+        {
+            "prompt_tokens": res.usage.prompt_tokens,
+            "completion_tokens": res.usage.completion_tokens
+        } if res.usage else {}
+    )
+
+
+def _complete(messages, deadline=None):
+
+    model = model_policy.choose()
+    key = request_key(messages) if cassette.mode != "off" else None
+
+    if cassette.mode == "replay":
+        entry = cassette.replay(key)
+        return entry["c"], entry["m"]
+
+    start = time.monotonic()
+    res, model = _create(model, messages, deadline)
+
+    if cassette.mode == "record":
+        _record(key, res, model, time.monotonic() - start)
+
+    return res.choices[0].message.content, model
+
+
+def call_llm(user_text, mood, intent, shock, step, history=None, deadline=None):
+
+    key = cache_key(user_text, mood, intent, shock, step, history)
+    cached = response_cache.get(key) if key else None
+
+    if cached is not None:
+        return cached
+
+    messages = build_messages(user_text, mood, intent, shock, step, history)
+
+    try:
+        content, model = _complete(messages, deadline)
+        output = parse_output(content, model)
+
+    except RateLimitTimeout:
+        # Not a model answer - run_steps turns this into partial guidance
+        raise
+
     except Exception as e:
+        return fallback_output(step, e)
 
-        # 🔥 API failure fallback (VERY IMPORTANT FOR DEMO)
+    cache_output(key, output)
 
-        return {
-            "step": step,
-            "instruction": "Our system is experiencing a delay. Please pause and avoid financial decisions for a moment.",
-            "timer_seconds": 30,
-            "actionable": False,
-            "resolved": False,
-            "_internal_status": str(e)
-        }
+    return output
+
+
+def call_llm_steps(user_text, mood, intent, shock, max_steps, deadline=None):
+
+    messages = build_steps_messages(user_text, mood, intent, shock, max_steps)
+
+    try:
+        content, model = _complete(messages, deadline)
+        return parse_steps(content, model, max_steps)
+
+    except Exception as e:
+        # 🔥 Caller falls back to one call per step
+        log(f"call_llm_steps: failed ({e}), generating steps one by one")
+        return []
+
+
+async def _acreate(model, messages, deadline=None):
+
+    await rate_limiter.aacquire(deadline)
+
+    start = time.monotonic()
+
+    try:
+        res = await get_async_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.2,
+            response_format={"type": "json_object"},
+            **request_options(deadline, start)
+        )
+    except Exception:
+        model_policy.record(model, time.monotonic() - start, ok=False)
+
+        if model == model_policy.fallback or out_of_time(deadline):
+            raise
+
+        # Primary failed - retry the same request on the fallback model
+        log(f"acall_llm: {model} failed, retrying on {model_policy.fallback}")
+        return await _acreate(model_policy.fallback, messages, deadline)
+
+    latency = time.monotonic() - start
+    model_policy.record(model, latency)
+    log(f"acall_llm: model={model} latency={latency:.2f}s")
+
+    return res, model
+
+
+async def _acomplete(messages, deadline=None):
+
+    model = model_policy.choose()
+    key = request_key(messages) if cassette.mode != "off" else None
+
+    if cassette.mode == "replay":
+        entry = cassette.replay(key, sleep=False)
+
+        if cassette.replay_latency:
+            await asyncio.sleep(entry["l"])
+
+        return entry["c"], entry["m"]
+
+    start = time.monotonic()
+    res, model = await _acreate(model, messages, deadline)
+
+    if cassette.mode == "record":
+        _record(key, res, model, time.monotonic() - start)
+
+    return res.choices[0].message.content, model
+
+
+async def acall_llm(user_text, mood, intent, shock, step, history=None, deadline=None):
+
+    """Async call_llm - same messages, fallbacks, cache and cassette handling"""
+
+    key = cache_key(user_text, mood, intent, shock, step, history)
+    cached = response_cache.get(key) if key else None
+
+    if cached is not None:
+        return cached
+
+    messages = build_messages(user_text, mood, intent, shock, step, history)
+
+    try:
+        content, model = await _acomplete(messages, deadline)
+        output = parse_output(content, model)
+
+    except RateLimitTimeout:
+        # Not a model answer - run_steps turns this into partial guidance
+        raise
+
+    except Exception as e:
+        return fallback_output(step, e)
+
+    cache_output(key, output)
+
+    return output
+
+
+async def acall_llm_steps(user_text, mood, intent, shock, max_steps, deadline=None):
+
+    messages = build_steps_messages(user_text, mood, intent, shock, max_steps)
+
+    try:
+        content, model = await _acomplete(messages, deadline)
+        return parse_steps(content, model, max_steps)
+
+    except Exception as e:
+        log(f"acall_llm_steps: failed ({e}), generating steps one by one")
+        return []
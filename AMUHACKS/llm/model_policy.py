@@ -0,0 +1,72 @@
+import time
+import threading
+from collections import deque
+
+from config.settings import (
+    MODEL_NAME,
+    FALLBACK_MODEL_NAME,
+    LATENCY_P95_THRESHOLD_SECONDS,
+    LATENCY_WINDOW_SIZE,
+    LATENCY_MIN_SAMPLES,
+    FALLBACK_COOLDOWN_SECONDS
+)
+
+
+class ModelFallbackPolicy:
+    """
+    Routes call_llm to the faster fallback model while the primary
+    model's rolling p95 latency is over threshold or it is erroring.
+    After the cooldown the primary is probed again.
+    """
+
+    def __init__(self, primary=MODEL_NAME, fallback=FALLBACK_MODEL_NAME,
+                 threshold=LATENCY_P95_THRESHOLD_SECONDS,
+                 window_size=LATENCY_WINDOW_SIZE,
+                 min_samples=LATENCY_MIN_SAMPLES,
+                 cooldown=FALLBACK_COOLDOWN_SECONDS):
+        self.primary = primary
+        self.fallback = fallback
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self._latencies = {primary: deque(maxlen=window_size), fallback: deque(maxlen=window_size)}
+        self._degraded_until = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def p95(self, model):
+        with self._lock:
+            samples = sorted(self._latencies[model])
+        if not samples:
+            return None
+        return samples[max(0, int(0.95 * len(samples) + 0.5) - 1)]
+
+    def choose(self):
+        with self._lock:
+            if self._degraded_until is None:
+                return self.primary
+            if time.monotonic() < self._degraded_until:
+                return self.fallback
+            self._degraded_until = None
+            self._probing = True
+            return self.primary
+
+    def record(self, model, latency, ok=True):
+        with self._lock:
+            if ok:
+                self._latencies[model].append(latency)
+            if model != self.primary:
+                return
+            probing, self._probing = self._probing, False
+            window = self._latencies[model]
+
+        p95 = self.p95(model)
+        slow = len(window) >= self.min_samples and p95 > self.threshold
+
+        if not ok or slow or (probing and latency > self.threshold):
+            with self._lock:
+                window.clear()
+                self._degraded_until = time.monotonic() + self.cooldown
+
+
+model_policy = ModelFallbackPolicy()
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimitTimeout(TimeoutError):
+    pass
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every Groq request (sync and async).
+    Each request reserves a token up front; when the bucket is empty the
+    reservation is for a future token and the caller sleeps until then,
+    so bursts queue in arrival order instead of hitting provider 429s.
+    rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+
+    def _reserve(self, deadline):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+            # Would miss the caller's deadline - give up without spending a token
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitTimeout("Rate limit wait exceeds the deadline")
+
+            self._tokens -= 1
+            if wait:
+                self.waits += 1
+            return wait
+
+    def acquire(self, deadline=None):
+        if self.rate <= 0:
+            return
+        wait = self._reserve(deadline)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, deadline=None):
+        if self.rate <= 0:
+            return
+        wait = self._reserve(deadline)
+        if wait:
+            await asyncio.sleep(wait)
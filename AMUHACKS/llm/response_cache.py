@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_text(text):
+
+    # "I lost my job " and "i  lost my JOB" are the same request
+    return " ".join(str(text).lower().split())
+
+
+class ResponseCache:
+    """
+    Cache of parsed call_llm outputs keyed by the normalized step inputs
+    and the prompt version. Entries live in an in-memory LRU and, when a
+    sqlite_path is given, in SQLite so they survive restarts. Values are
+    stored as JSON, so every hit returns a fresh dict callers may mutate.
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600, sqlite_path=None, enabled=True):
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+
+        if enabled and sqlite_path:
+            directory = os.path.dirname(sqlite_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+            self._db.execute("DELETE FROM llm_cache WHERE expires <= ?", (time.time(),))
+            self._db.commit()
+
+    def key(self, prompt_version, user_text, mood, intent, shock, step):
+
+        payload = json.dumps(
+            [prompt_version, normalize_text(user_text), mood, intent, shock, step]
+        )
+
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+
+        if not self.enabled:
+            return None
+
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[1], row[0])
+                    self._remember(key, entry)
+
+            if entry is not None and entry[0] <= now:
+                self._forget(key)
+                self.expired += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return json.loads(entry[1])
+
+    def put(self, key, output):
+
+        if not self.enabled:
+            return
+
+        entry = (time.time() + self.ttl, json.dumps(output))
+
+        with self._lock:
+            self._remember(key, entry)
+            self.stores += 1
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, entry[1], entry[0])
+                )
+                self._db.commit()
+
+    def _remember(self, key, entry):
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _forget(self, key):
+
+        self._entries.pop(key, None)
+
+        if self._db is not None:
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    def stats(self):
+
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "expired": self.expired,
+                "persistent": self._db is not None
+            }
@@ -1,19 +1,28 @@
 from config.constants import SHOCK_SEVERITY
 
+EXTREME_RISK_PHRASES = [
+    "suicide",
+    "kill myself",
+    "want to die",
+    "end my life"
+]
 
-def safety_router(user_text, mood, shock):
 
-    severity = SHOCK_SEVERITY.get(shock, 5)
+def safety_router(user_text, mood, shock):
 
     text = user_text.lower()
 
+    extreme = any(word in text for word in EXTREME_RISK_PHRASES)
+
+    return route_risk(mood, shock, extreme)
+
+
+def route_risk(mood, shock, extreme=False):
+
+    severity = SHOCK_SEVERITY.get(shock, 5)
+
     # 🚨 EXTREME RISK
-    if any(word in text for word in [
-        "suicide",
-        "kill myself",
-        "want to die",
-        "end my life"
-    ]):
+    if extreme:
         return "extreme"
 
     # 🚨 HIGH RISK
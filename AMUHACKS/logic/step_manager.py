@@ -1,12 +1,30 @@
-from llm.groq_client import call_llm
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from llm.groq_client import call_llm, acall_llm, call_llm_steps, acall_llm_steps, out_of_time
+from llm.model_policy import model_policy
+from llm.rate_limiter import RateLimitTimeout
 from logic.timer_decider import decide_timer
 from logic.reevaluator import reevaluate
 from logic.escalation_manager import check_emergency
 from emergency.financial_emergency import build_emergency_response
-from config.settings import MAX_STEPS
+from emergency.partial_guidance import build_partial_response
+from config.settings import (
+    MAX_STEPS,
+    MULTI_STEP_GENERATION,
+    STEP_DEADLINE_SECONDS,
+    STEP_ESTIMATE_SECONDS,
+    SPECULATIVE_STEPS,
+    SPECULATIVE_MAX_WORKERS
+)
+
+_speculation_pool = ThreadPoolExecutor(
+    max_workers=SPECULATIVE_MAX_WORKERS, thread_name_prefix="spec-step"
+)
 
 
-def run_steps(user_text, mood, intent, shock, risk_level):
+def emergency_override(risk_level):
 
     # 🔥 SAFETY OVERRIDE — MUST BE FIRST
     if risk_level == "extreme":
@@ -18,57 +36,334 @@ def run_steps(user_text, mood, intent, shock, risk_level):
             "steps": []
         }
 
+    return None
+
+
+def max_local_steps(risk_level):
+
     # ✅ HIGH RISK USERS → escalate faster
-    MAX_LOCAL_STEPS = 3 if risk_level == "high" else MAX_STEPS
+    return 3 if risk_level == "high" else MAX_STEPS
 
-    history = []
 
-    for step in range(1, MAX_LOCAL_STEPS + 1):
+def prepare_step(llm_output, step, mood):
+
+    # ✅ CRASH PROTECTION (LLMs are unpredictable)
+    if not isinstance(llm_output, dict):
+        llm_output = {}
+
+    llm_output.setdefault("step", step)
+    llm_output.setdefault("instruction", "Pause. Take a slow breath.")
+    llm_output.setdefault("actionable", True)
+    llm_output.setdefault("resolved", False)
+
+    llm_output["timer_seconds"] = decide_timer(mood)
+
+    return llm_output
+
+
+def start_deadline(deadline_seconds):
+
+    if deadline_seconds is None:
+        deadline_seconds = STEP_DEADLINE_SECONDS
+
+    return time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+
+
+def call_fits(deadline):
+
+    # ⏱️ Only start an LLM call we expect to finish before the deadline
+    if deadline is None:
+        return True
+
+    expected = model_policy.p95(model_policy.primary) or STEP_ESTIMATE_SECONDS
+
+    return deadline - time.monotonic() >= expected
+
+
+def budget_error(error, deadline):
+
+    # The rate limiter gives up before the deadline passes - still a budget miss, not a failure
+    return isinstance(error, RateLimitTimeout) or out_of_time(deadline)
+
+
+def budget_reason(error):
+
+    if isinstance(error, RateLimitTimeout):
+        return "LLM rate limit wait exceeds the time budget"
+
+    return "LLM call exceeded the time budget"
+
 
-        try:
-            llm_output = call_llm(user_text, mood, intent, shock, step)
+def timed_out(llm_output, deadline):
 
-            # ✅ CRASH PROTECTION (LLMs are unpredictable)
-            if not isinstance(llm_output, dict):
-                llm_output = {}
+    # Fallback step because the deadline cut the request short
+    return isinstance(llm_output, dict) and "_internal_status" in llm_output and out_of_time(deadline)
 
-            llm_output.setdefault("step", step)
-            llm_output.setdefault("instruction", "Pause. Take a slow breath.")
-            llm_output.setdefault("actionable", True)
-            llm_output.setdefault("resolved", False)
 
-            llm_output["timer_seconds"] = decide_timer(mood)
+def planned_step(planned, step):
 
-        except Exception as e:
-            # 🔥 If LLM completely fails
-            return build_emergency_response(
-                f"LLM failure: {str(e)}"
-            )
+    # ✅ Trust our own step numbering, not the LLM's
+    if step <= len(planned):
+        return dict(planned[step - 1], step=step)
 
-        history.append(llm_output)
+    return None
 
-        # ✅ Reevaluator protection
-        try:
-            reeval = reevaluate(history)
-        except Exception:
-            reeval = {"problem_resolved": False}
 
-        if reeval.get("problem_resolved"):
-            return {
-                "status": "resolved",
-                "steps_taken": step,
-                "steps": history,
-                "message": llm_output["instruction"]
-            }
+def evaluate_step(history, step):
 
-        if check_emergency(step, reeval):
-            return build_emergency_response(
-                "User unable to proceed"
-            )
+    """Final response if the flow ends at this step, else None"""
+
+    # ✅ Reevaluator protection
+    try:
+        reeval = reevaluate(history)
+    except Exception:
+        reeval = {"problem_resolved": False}
+
+    if reeval.get("problem_resolved"):
+        return {
+            "status": "resolved",
+            "steps_taken": step,
+            "steps": history,
+            "message": history[-1]["instruction"]
+        }
+
+    if check_emergency(step, reeval):
+        return build_emergency_response(
+            "User unable to proceed"
+        )
+
+    return None
+
+
+def needs_support(history, steps_taken):
 
     return {
         "status": "needs_support",
-        "steps_taken": MAX_LOCAL_STEPS,
+        "steps_taken": steps_taken,
         "steps": history,
         "message": "External support recommended"
     }
+
+
+def missing_steps(planned, max_local_steps):
+
+    return range(len(planned) + 1, max_local_steps + 1)
+
+
+def run_steps(user_text, mood, intent, shock, risk_level, multi_step=None,
+              deadline_seconds=None, speculative=None):
+
+    override = emergency_override(risk_level)
+    if override:
+        return override
+
+    MAX_LOCAL_STEPS = max_local_steps(risk_level)
+
+    if multi_step is None:
+        multi_step = MULTI_STEP_GENERATION
+
+    if speculative is None:
+        speculative = SPECULATIVE_STEPS
+
+    deadline = start_deadline(deadline_seconds)
+
+    # 🔥 One round trip for the whole plan; any missing steps are fetched one by one
+    planned = call_llm_steps(
+        user_text, mood, intent, shock, MAX_LOCAL_STEPS, deadline
+    ) if multi_step and call_fits(deadline) else []
+
+    # 🔥 Speculative mode - step prompts don't depend on earlier outputs, so fire them all now
+    pending = {
+        step: _speculation_pool.submit(
+            call_llm, user_text, mood, intent, shock, step, deadline=deadline
+        )
+        for step in missing_steps(planned, MAX_LOCAL_STEPS)
+    } if speculative and call_fits(deadline) else {}
+
+    history = []
+
+    try:
+        for step in range(1, MAX_LOCAL_STEPS + 1):
+
+            llm_output = planned_step(planned, step)
+
+            # ⏱️ Out of budget - return what we have instead of hanging
+            if llm_output is None and step not in pending and not call_fits(deadline):
+                return build_partial_response(history, intent, mood, "Time budget exhausted")
+
+            try:
+                if llm_output is None and step in pending:
+                    llm_output = pending[step].result()
+
+                elif llm_output is None:
+                    llm_output = call_llm(user_text, mood, intent, shock, step, deadline=deadline)
+
+                if timed_out(llm_output, deadline):
+                    return build_partial_response(history, intent, mood, "LLM call exceeded the time budget")
+
+                llm_output = prepare_step(llm_output, step, mood)
+
+            except Exception as e:
+                if budget_error(e, deadline):
+                    return build_partial_response(history, intent, mood, budget_reason(e))
+
+                # 🔥 If LLM completely fails
+                return build_emergency_response(
+                    f"LLM failure: {str(e)}"
+                )
+
+            history.append(llm_output)
+
+            # ✅ Same in-order checks - speculative steps after the cutoff are discarded
+            result = evaluate_step(history, step)
+            if result:
+                return result
+
+        return needs_support(history, MAX_LOCAL_STEPS)
+
+    finally:
+        for future in pending.values():
+            future.cancel()
+
+
+async def astream_steps(user_text, mood, intent, shock, risk_level, multi_step=None,
+                        deadline_seconds=None, speculative=None):
+
+    """Async generator - yields ("step", step) as each step is ready, then ("done", result)"""
+
+    override = emergency_override(risk_level)
+    if override:
+        yield "done", override
+        return
+
+    MAX_LOCAL_STEPS = max_local_steps(risk_level)
+
+    if multi_step is None:
+        multi_step = MULTI_STEP_GENERATION
+
+    if speculative is None:
+        speculative = SPECULATIVE_STEPS
+
+    deadline = start_deadline(deadline_seconds)
+
+    # 🔥 One round trip for the whole plan; any missing steps are fetched one by one
+    planned = await acall_llm_steps(
+        user_text, mood, intent, shock, MAX_LOCAL_STEPS, deadline
+    ) if multi_step and call_fits(deadline) else []
+
+    # 🔥 Speculative mode - every missing step is requested at once (rate limiter bounds the burst)
+    pending = {
+        step: asyncio.ensure_future(
+            acall_llm(user_text, mood, intent, shock, step, deadline=deadline)
+        )
+        for step in missing_steps(planned, MAX_LOCAL_STEPS)
+    } if speculative and call_fits(deadline) else {}
+
+    history = []
+
+    try:
+        for step in range(1, MAX_LOCAL_STEPS + 1):
+
+            llm_output = planned_step(planned, step)
+
+            # ⏱️ Out of budget - return what we have instead of hanging
+            if llm_output is None and step not in pending and not call_fits(deadline):
+                yield "done", build_partial_response(history, intent, mood, "Time budget exhausted")
+                return
+
+            try:
+                if llm_output is None:
+                    call = pending.get(step) or acall_llm(
+                        user_text, mood, intent, shock, step, deadline=deadline
+                    )
+
+                    # Hard cutoff - also covers cassette replay and hung connections
+                    llm_output = await (
+                        asyncio.wait_for(call, deadline - time.monotonic()) if deadline else call
+                    )
+
+                if timed_out(llm_output, deadline):
+                    yield "done", build_partial_response(history, intent, mood, "LLM call exceeded the time budget")
+                    return
+
+                llm_output = prepare_step(llm_output, step, mood)
+
+            except Exception as e:
+                if budget_error(e, deadline):
+                    yield "done", build_partial_response(history, intent, mood, budget_reason(e))
+                    return
+
+                # 🔥 If LLM completely fails
+                yield "done", build_emergency_response(
+                    f"LLM failure: {str(e)}"
+                )
+                return
+
+            history.append(llm_output)
+
+            yield "step", llm_output
+
+            # ✅ Same in-order checks - speculative steps after the cutoff are discarded
+            result = evaluate_step(history, step)
+            if result:
+                yield "done", result
+                return
+
+        yield "done", needs_support(history, MAX_LOCAL_STEPS)
+
+    finally:
+        for task in pending.values():
+            task.cancel()
+
+
+async def arun_steps(user_text, mood, intent, shock, risk_level, multi_step=None,
+                     deadline_seconds=None, speculative=None):
+
+    """Async run_steps - awaits each LLM step instead of blocking a thread"""
+
+    async for kind, payload in astream_steps(
+        user_text, mood, intent, shock, risk_level, multi_step, deadline_seconds, speculative
+    ):
+        if kind == "done":
+            return payload
+
+
+async def anext_step(session, user_reply=None):
+
+    """One step of a stored session - returns (step, result); result is None while the flow continues"""
+
+    history = session["history"]
+    prompt_history = history
+
+    # ✅ The reply is only stored once the step built on it succeeds
+    if user_reply and history:
+        prompt_history = history[:-1] + [dict(history[-1], user_reply=user_reply)]
+
+    step = len(history) + 1
+
+    try:
+        llm_output = prepare_step(
+            await acall_llm(
+                session["user_text"], session["mood"], session["intent"],
+                session["shock"], step, prompt_history
+            ),
+            step, session["mood"]
+        )
+
+    except Exception as e:
+        # 🔥 If LLM completely fails
+        return None, build_emergency_response(
+            f"LLM failure: {str(e)}"
+        )
+
+    if prompt_history is not history:
+        history[-1]["user_reply"] = user_reply
+
+    history.append(llm_output)
+
+    result = evaluate_step(history, step)
+
+    if result is None and step >= max_local_steps(session["risk_level"]):
+        result = needs_support(history, step)
+
+    return llm_output, result
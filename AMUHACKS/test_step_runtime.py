@@ -0,0 +1,201 @@
+"""
+Test the financial step runtime against a stubbed Groq client
+Runs offline (from this directory) - time budgets, rate-limit timeouts,
+speculative cutoff, response cache, session store and batch ordering
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+from types import SimpleNamespace
+
+os.environ.setdefault("GROQ_API_KEY", "offline-test")
+
+import llm.groq_client as groq_client
+import logic.step_manager as step_manager
+import app
+from llm.rate_limiter import RateLimiter
+from llm.response_cache import ResponseCache
+from logic.session_store import SessionStore
+
+print("="*70)
+print("FINANCIAL STEP RUNTIME TEST")
+print("="*70)
+
+
+def step_reply(step, resolved_at=None):
+    return {
+        "step": step,
+        "instruction": f"Do step {step}.",
+        "actionable": True,
+        "resolved": step == resolved_at
+    }
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions - answers by the prompt's step number"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, resolved_at=None, delay=0.0, error=None, content=None, delay_for=None):
+        self.resolved_at = resolved_at
+        self.delay = delay
+        self.error = error
+        self.content = content
+        self.delay_for = delay_for
+        self.steps = []
+
+    def _answer(self, messages, timeout):
+        prompt = messages[-1]["content"]
+        step = int(re.search(r"Current step: (\d+)", prompt).group(1))
+        self.steps.append(step)
+
+        delay = self.delay_for(prompt) if self.delay_for else self.delay
+        if timeout is not None and delay >= timeout:
+            return step, timeout, TimeoutError("Request timed out.")
+        return step, delay, self.error
+
+    def _response(self, step):
+        content = self.content if self.content is not None else json.dumps(step_reply(step, self.resolved_at))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    def create(self, model, messages, timeout=None, **kwargs):
+        step, delay, error = self._answer(messages, timeout)
+        time.sleep(delay)
+        if error:
+            raise error
+        return self._response(step)
+
+
+class FakeAsyncCompletions(FakeCompletions):
+
+    async def create(self, model, messages, timeout=None, **kwargs):
+        step, delay, error = self._answer(messages, timeout)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return self._response(step)
+
+
+completions = FakeCompletions()
+async_completions = FakeAsyncCompletions()
+groq_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+groq_client.get_async_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=async_completions))
+groq_client.response_cache = ResponseCache(enabled=False)
+groq_client.rate_limiter = RateLimiter(0, 1)
+
+# Stubbed calls are fast - don't budget 3s per step before p95 has samples
+step_manager.STEP_ESTIMATE_SECONDS = 0.1
+
+ARGS = ("I lost my job today", "anxious", "job_loss", "moderate", "medium")
+
+
+def reset_fakes(**behaviour):
+    completions.reset(**behaviour)
+    async_completions.reset(**behaviour)
+
+
+def run_both(**kwargs):
+    sync_result = step_manager.run_steps(*ARGS, multi_step=False, **kwargs)
+    async_result = asyncio.run(step_manager.arun_steps(*ARGS, multi_step=False, **kwargs))
+    return sync_result, async_result
+
+
+# Test 1: a hung LLM call becomes partial guidance, not an emergency
+print("\n✓ Test 1: deadline")
+reset_fakes(delay=5.0)
+for result in run_both(deadline_seconds=0.5, speculative=False):
+    print(f"  - {result['status']}: {result['reason']}")
+    assert result["status"] == "partial", result
+    assert result["steps_taken"] == 0 and result["next_steps"]
+
+# Test 2: rate-limiter timeouts are budget misses too
+print("\n✓ Test 2: rate-limit timeout")
+reset_fakes(delay=0.01)
+for run in (step_manager.run_steps, step_manager.arun_steps):
+    groq_client.rate_limiter = RateLimiter(1, 1)
+    result = run(*ARGS, multi_step=False, deadline_seconds=1.5, speculative=True)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    print(f"  - {result['status']} after {result['steps_taken']} steps: {result['reason']}")
+    assert result["status"] == "partial", result
+    assert result["reason"] == "LLM rate limit wait exceeds the time budget"
+    assert 1 <= result["steps_taken"] < 7
+groq_client.rate_limiter = RateLimiter(0, 1)
+
+# Test 3: speculative steps after the resolved one are discarded
+print("\n✓ Test 3: speculative cutoff")
+reset_fakes(resolved_at=2, delay=0.01)
+for result, fake in zip(run_both(deadline_seconds=0, speculative=True), (completions, async_completions)):
+    assert result["status"] == "resolved" and result["steps_taken"] == 2, result
+    assert [s["step"] for s in result["steps"]] == [1, 2]
+    assert len(fake.steps) > 2, "All steps should have been requested up front"
+print("  - resolved at step 2, later speculative steps dropped")
+
+# Test 4: fallback outputs never reach the response cache
+print("\n✓ Test 4: cache skips fallbacks")
+groq_client.response_cache = ResponseCache()
+completions.reset(error=RuntimeError("Service unavailable"))
+output = groq_client.call_llm(*ARGS[:4], step=1)
+assert "_internal_status" in output
+completions.reset(content="not json")
+assert "_internal_status" in groq_client.call_llm(*ARGS[:4], step=1)
+assert groq_client.response_cache.stats()["stores"] == 0
+completions.reset()
+first = groq_client.call_llm(*ARGS[:4], step=1)
+second = groq_client.call_llm(*ARGS[:4], step=1)
+assert first == second and len(completions.steps) == 1, "Second call should be a cache hit"
+assert groq_client.response_cache.stats()["stores"] == 1
+groq_client.response_cache = ResponseCache(enabled=False)
+print("  - only real answers are stored")
+
+# Test 5: response cache TTL and LRU eviction
+print("\n✓ Test 5: response cache eviction")
+cache = ResponseCache(max_entries=2, ttl=0.2)
+cache.put("a", {"v": 1})
+cache.put("b", {"v": 2})
+assert cache.get("a") == {"v": 1}
+cache.put("c", {"v": 3})
+assert cache.get("b") is None, "Least recently used entry should be evicted"
+hit = cache.get("a")
+hit["v"] = 99
+assert cache.get("a") == {"v": 1}, "Hits are fresh copies"
+time.sleep(0.25)
+assert cache.get("c") is None and cache.stats()["expired"] == 1
+
+# Test 6: session store TTL and LRU eviction
+print("\n✓ Test 6: session store eviction")
+store = SessionStore(max_sessions=2, ttl=0.2)
+first_id = store.create({"n": 1})
+second_id = store.create({"n": 2})
+assert store.get(first_id) == {"n": 1}
+third_id = store.create({"n": 3})
+assert store.get(second_id) is None and len(store) == 2
+time.sleep(0.1)
+store.get(third_id)
+time.sleep(0.15)
+assert store.get(first_id) is None, "Idle session should expire"
+assert store.get(third_id) == {"n": 3}, "Touching a session renews its TTL"
+
+# Test 7: batch results come back in input order even when later items finish first
+print("\n✓ Test 7: batch order")
+texts = [f"I lost my job, ticket {i}" for i in range(6)]
+async_completions.reset(
+    resolved_at=1,
+    delay_for=lambda prompt: 0.05 * (6 - int(re.search(r"ticket (\d+)", prompt).group(1)))
+)
+
+
+async def collect():
+    return [item async for item in app.batch_results(texts)]
+
+
+results = asyncio.run(collect())
+assert [r["index"] for r in results] == list(range(6)), results
+assert all(r["status"] == "resolved" and "_model" not in r["steps"][0] for r in results)
+print(f"  - {len(results)} items in input order")
+
+print("\n✅ Financial step runtime validated!")
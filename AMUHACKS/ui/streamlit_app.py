@@ -1,7 +1,28 @@
+import json
+
 import streamlit as st
 import requests
 
-API_URL = "http://127.0.0.1:8000/crisis-support"
+API_URL = "http://127.0.0.1:8000/crisis-support/stream"
+
+
+def iter_events(response):
+
+    # Minimal SSE parser - yields (event, data) per blank-line-terminated block
+    event, data = "message", []
+
+    for line in response.iter_lines(decode_unicode=True):
+
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
 
 st.set_page_config(
     page_title="Crisis Support AI",
@@ -23,44 +44,66 @@ if st.button("Get Support"):
         st.warning("Please enter some text")
 
     else:
-        with st.spinner("Analyzing..."):
-            try:
-                response = requests.post(
-                    API_URL,
-                    json={"user_text": user_text},
-                    timeout=10
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # 🔍 DEBUG: show raw backend response
-                    st.subheader("RAW RESPONSE (Debug)")
-                    st.json(data)
-
-                    # ✅ Normal guidance steps
-                    if "steps" in data and data["steps"]:
-                        st.subheader("Guidance")
-                        for step in data["steps"]:
-                            msg = step.get("message")
+        try:
+            # ⏱️ Read timeout applies between events (one step), not to the whole flow
+            response = requests.post(
+                API_URL,
+                json={"user_text": user_text},
+                stream=True,
+                timeout=(5, 30)
+            )
+
+            if response.status_code == 200:
+                data = {}
+                guidance_shown = False
+
+                with st.spinner("Analyzing..."):
+                    for event, payload in iter_events(response):
+
+                        # ✅ Render each guidance step as soon as it arrives
+                        if event == "step":
+                            if not guidance_shown:
+                                st.subheader("Guidance")
+                                guidance_shown = True
+
+                            msg = payload.get("instruction")
                             if msg:
                                 st.info(msg)
 
-                    # 🚨 Emergency block
-                    if data.get("status") == "emergency":
-                        st.error("🚨 Emergency Support")
-                        st.write(data.get("message", ""))
+                        elif event == "status":
+                            data = payload
+
+                # 🔍 DEBUG: show final backend status
+                st.subheader("RAW RESPONSE (Debug)")
+                st.json(data)
+
+                # 🚨 Emergency block
+                if data.get("status") == "emergency":
+                    st.error("🚨 Emergency Support")
+                    st.write(data.get("message", ""))
+
+                    for action in data.get("actions", []):
+                        if isinstance(action, str):
+                            st.write("•", action)
+                        elif action.get("type") == "call":
+                            st.button(
+                                f"📞 {action['label']} ({action['value']})"
+                            )
+                        else:
+                            st.write("•", action.get("label", ""))
+
+                elif data.get("status") == "needs_support":
+                    st.warning(data.get("message", ""))
+
+                # ⏱️ Time budget ran out - show the templated next steps
+                elif data.get("status") == "partial":
+                    st.warning(data.get("message", ""))
 
-                        for action in data.get("actions", []):
-                            if action.get("type") == "call":
-                                st.button(
-                                    f"📞 {action['label']} ({action['value']})"
-                                )
-                            else:
-                                st.write("•", action.get("label", ""))
+                    for step in data.get("next_steps", []):
+                        st.info(step.get("instruction", ""))
 
-                else:
-                    st.error(f"Server error: {response.status_code}")
+            else:
+                st.error(f"Server error: {response.status_code}")
 
-            except Exception as e:
-                st.error(f"Unable to connect to backend API: {e}")
+        except Exception as e:
+            st.error(f"Unable to connect to backend API: {e}")
@@ -1,4 +1,16 @@
 import json
 
+# Server-side bookkeeping that must not reach API clients
+INTERNAL_KEYS = {"_model"}
+
+
+def _strip_internal(data):
+    if isinstance(data, dict):
+        return {k: _strip_internal(v) for k, v in data.items() if k not in INTERNAL_KEYS}
+    if isinstance(data, list):
+        return [_strip_internal(v) for v in data]
+    return data
+
+
 def format_json(data):
-    return json.loads(json.dumps(data))
+    return _strip_internal(json.loads(json.dumps(data)))
@@ -8,13 +8,33 @@ from langgraph.graph import StateGraph, END
 from nodes.normalize_input import normalize_input
 from nodes.classify import classify_crisis
 from nodes.assess_risk import assess_risk
-from nodes.plan_actions import plan_actions
+from nodes.plan_actions import plan_actions, set_first_actions_callback
 from nodes.format_output import format_output, should_continue
-from config import langfuse_client, langfuse_handler
+from nodes.assess_and_plan import assess_and_plan
+from nodes.fused_assessment import fused_assessment
+from nodes.rules_triage import rules_triage
+from runtime.load_shedding import LoadShedder
+from runtime.scheduler import PriorityScheduler
+from triage.keywords import match_red_flags
+from triage.rules import triage_severity
+from config import (
+    langfuse_client, langfuse_handler, ASSESSMENT_ARCHIVE_PATH, SPECULATIVE_PLANNING,
+    LOAD_SHEDDING_CONFIG, SCHEDULER_CONFIG
+)
 from langfuse.decorators import observe, langfuse_context
+import json
+import threading
 import time
 import uuid
 
+_archive_lock = threading.Lock()
+
+load_shedder = LoadShedder(**LOAD_SHEDDING_CONFIG)
+scheduler = PriorityScheduler(
+    max_workers=SCHEDULER_CONFIG["max_workers"],
+    aging_seconds=SCHEDULER_CONFIG["aging_seconds"]
+)
+
 
 class GraphState(TypedDict):
     """State object for the crisis assessment graph"""
@@ -35,6 +55,8 @@ class GraphState(TypedDict):
     completed_steps: List[str]
     previous_severity: Optional[str]
     escalation_history: List[dict]
+    classification_source: str
+    degradation_mode: str
 
 
 def validate_state(state: dict) -> dict:
@@ -80,9 +102,11 @@ def create_crisis_agent():
     2. Crisis Classification -> identifies crisis type and severity
     3. Risk Assessment -> determines escalation needs
     4. Action Planning -> generates immediate actions
+       (with SPECULATIVE_PLANNING, 3 and 4 run in parallel in one node)
     5. Format Output -> assembles JSON response
     
     Memory: Uses LangGraph checkpointing for deterministic state management
+    Under overload run_crisis_assessment bypasses the graph (see load_shedder)
     """
     from langgraph.checkpoint.memory import MemorySaver
     
@@ -100,8 +124,11 @@ def create_crisis_agent():
     # Add nodes with validation
     workflow.add_node("normalize_input", validated_node(normalize_input))
     workflow.add_node("classify_crisis", validated_node(classify_crisis))
-    workflow.add_node("assess_risk", validated_node(assess_risk))
-    workflow.add_node("plan_actions", validated_node(plan_actions))
+    if SPECULATIVE_PLANNING:
+        workflow.add_node("assess_and_plan", validated_node(assess_and_plan))
+    else:
+        workflow.add_node("assess_risk", validated_node(assess_risk))
+        workflow.add_node("plan_actions", validated_node(plan_actions))
     workflow.add_node("format_output", validated_node(format_output))
     
     # Define the flow
@@ -117,9 +144,14 @@ def create_crisis_agent():
         }
     )
     
-    workflow.add_edge("classify_crisis", "assess_risk")
-    workflow.add_edge("assess_risk", "plan_actions")
-    workflow.add_edge("plan_actions", "format_output")
+    if SPECULATIVE_PLANNING:
+        # assess_risk and plan_actions overlap inside one node
+        workflow.add_edge("classify_crisis", "assess_and_plan")
+        workflow.add_edge("assess_and_plan", "format_output")
+    else:
+        workflow.add_edge("classify_crisis", "assess_risk")
+        workflow.add_edge("assess_risk", "plan_actions")
+        workflow.add_edge("plan_actions", "format_output")
     workflow.add_edge("format_output", END)
     
     # Compile with in-memory checkpointing
@@ -129,13 +161,46 @@ def create_crisis_agent():
     return app
 
 
-def run_crisis_assessment(user_input: str, session_id: str = None) -> dict:
+def run_degraded_assessment(state: dict, mode: str) -> dict:
+    """
+    Serve a request outside the graph when load shedding is active:
+    "fused" (one LLM call) or "rules" (no LLM call)
+    """
+    state = validate_state(state)
+    # Both degraded paths read the raw input; skip the normalization call
+    state["normalized_input"] = " ".join(state["user_input"].split())
+    node = fused_assessment if mode == "fused" else rules_triage
+    state = validate_state(node(state))
+    return format_output(state)
+
+
+def archive_assessment(result: dict) -> None:
+    """Append the graph output to the JSONL archive used to train the local classifier"""
+    if not ASSESSMENT_ARCHIVE_PATH or result.get("error"):
+        return
+    record = {
+        "timestamp": time.time(),
+        "user_input": result.get("user_input", ""),
+        "normalized_input": result.get("normalized_input", ""),
+        "crisis_type": result.get("crisis_type", ""),
+        "severity_level": result.get("severity_level", ""),
+        "escalation_required": result.get("escalation_required", False),
+        "classification_source": result.get("classification_source", "")
+    }
+    with _archive_lock:
+        with open(ASSESSMENT_ARCHIVE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def run_crisis_assessment(user_input: str, session_id: str = None, on_first_actions=None) -> dict:
     """
     Run the complete crisis assessment workflow with memory and observability
     
     Args:
         user_input: User's description of the medical situation
         session_id: Optional session ID for tracking
+        on_first_actions: Optional callback(actions) for the critical first
+            steps when PLAN_TWO_PHASE is on (may fire again if plan_actions re-plans)
         
     Returns:
         dict: Complete crisis assessment in JSON format
@@ -176,7 +241,9 @@ def run_crisis_assessment(user_input: str, session_id: str = None) -> dict:
             # Memory fields
             "completed_steps": [],
             "previous_severity": None,
-            "escalation_history": []
+            "escalation_history": [],
+            "classification_source": "",
+            "degradation_mode": "full"
         }
         
         # Run the workflow with checkpointing
@@ -186,7 +253,27 @@ def run_crisis_assessment(user_input: str, session_id: str = None) -> dict:
             "callbacks": [langfuse_handler] if langfuse_handler else []
         }
         
-        result = app.invoke(initial_state, config=config)
+        # Always set, so a callback never leaks into a later call on this thread
+        set_first_actions_callback(on_first_actions)
+        
+        # Keyword pre-triage decides how far down the degradation ladder this
+        # request may go (red flags are never rejected) and its queue priority
+        pre_triage_severity = triage_severity(user_input)
+        with load_shedder.admit(
+            red_flag=bool(match_red_flags(user_input)),
+            severity=pre_triage_severity
+        ) as mode:
+            initial_state["degradation_mode"] = mode
+            if mode == "full":
+                execute = lambda: app.invoke(initial_state, config=config)
+            else:
+                execute = lambda: run_degraded_assessment(initial_state, mode)
+            # Rule-based triage is instant; everything that calls the LLM is scheduled
+            if SCHEDULER_CONFIG["enabled"] and mode != "rules":
+                result = scheduler.run(pre_triage_severity, execute)
+            else:
+                result = execute()
+        archive_assessment(result)
         
         # Update handler metadata with final results
         if langfuse_handler:
@@ -195,7 +282,8 @@ def run_crisis_assessment(user_input: str, session_id: str = None) -> dict:
                 "execution_time_seconds": execution_time,
                 "severity_level": result.get("severity_level", "unknown"),
                 "crisis_type": result.get("crisis_type", "unknown"),
-                "escalation_required": result.get("escalation_required", False)
+                "escalation_required": result.get("escalation_required", False),
+                "degradation_mode": result.get("degradation_mode", "full")
             })
         
         # Flush traces to ensure they're sent immediately
@@ -4,10 +4,37 @@ Streamlit UI for Personal Crisis Decision Assistant
 
 import streamlit as st
 import json
+import queue
 import time
 import uuid
-from agent_graph import run_crisis_assessment, get_graph_visualization
+from concurrent.futures import ThreadPoolExecutor
+from agent_graph import run_crisis_assessment, get_graph_visualization, load_shedder, scheduler
 from config import APP_CONFIG
+from nodes.normalize_input import get_normalize_gate_stats
+from nodes.assess_and_plan import get_speculation_stats
+
+def run_with_first_actions(user_input: str, session_id: str, placeholder) -> dict:
+    """
+    Run the assessment in a worker thread and render the critical first steps
+    (PLAN_TWO_PHASE) into `placeholder` as soon as they arrive; Streamlit can
+    only draw from the script thread, so the callback just hands them over
+    """
+    first_actions = queue.Queue()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(run_crisis_assessment, user_input, session_id, first_actions.put)
+        while not future.done():
+            try:
+                actions = first_actions.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            with placeholder.container():
+                st.markdown("### ⚡ Do This Now")
+                for action in actions:
+                    st.markdown(f"**{action['step_id']}. {action['title']}** - {action['instruction']}")
+                st.caption("Full plan is on the way...")
+    placeholder.empty()
+    return future.result()
+
 
 # Initialize session ID if not exists
 if 'session_id' not in st.session_state:
@@ -186,6 +213,18 @@ with st.sidebar:
         st.markdown("**Agent Graph Flow:**")
         st.text(get_graph_visualization())
         
+        st.markdown("**Input Normalization Gate:**")
+        st.json(get_normalize_gate_stats())
+        
+        st.markdown("**Speculative Planning:**")
+        st.json(get_speculation_stats())
+        
+        st.markdown("**Load Shedding:**")
+        st.json(load_shedder.stats())
+        
+        st.markdown("**Priority Scheduler:**")
+        st.json(scheduler.stats())
+        
         # Show memory state if result exists
         if hasattr(st.session_state, 'last_result') and st.session_state.last_result:
             st.markdown("---")
@@ -248,10 +287,13 @@ with col2:
         if not user_input or user_input.strip() == "":
             st.error("⚠️ Please describe the medical situation first.")
         else:
+            first_actions_placeholder = st.empty()
             with st.spinner("🔄 Analyzing crisis situation..."):
                 try:
-                    # Run the agent with session tracking
-                    result = run_crisis_assessment(user_input, session_id=st.session_state.session_id)
+                    # Run the agent with session tracking, showing the first steps early
+                    result = run_with_first_actions(
+                        user_input, st.session_state.session_id, first_actions_placeholder
+                    )
                     
                     # Store in session state
                     st.session_state.last_result = result
@@ -303,10 +345,13 @@ with col2:
         if not user_input or user_input.strip() == "":
             st.error("⚠️ Please describe the medical situation first.")
         else:
+            first_actions_placeholder = st.empty()
             with st.spinner("🔄 Analyzing crisis situation..."):
                 try:
-                    # Run the agent with session tracking
-                    result = run_crisis_assessment(user_input, session_id=st.session_state.session_id)
+                    # Run the agent with session tracking, showing the first steps early
+                    result = run_with_first_actions(
+                        user_input, st.session_state.session_id, first_actions_placeholder
+                    )
                     
                     # Store in session state
                     st.session_state.last_result = result
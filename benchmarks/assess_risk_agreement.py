@@ -0,0 +1,102 @@
+"""
+Agreement report: rule-based vs LLM assess_risk
+Runs both implementations of the assess_risk node on the scenario set
+and compares escalation decisions and the primary contact.
+
+Usage: python benchmarks/assess_risk_agreement.py [--scenarios benchmarks/scenarios.json] [--classify]
+
+By default the crisis_type/severity from the scenario file are used so
+only assess_risk differs; --classify runs normalize_input + classify_crisis first.
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nodes.assess_risk import assess_risk
+from nodes.classify import classify_crisis
+from nodes.normalize_input import normalize_input
+
+DEFAULT_SCENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json")
+
+
+def base_state(scenario: dict, classify: bool) -> dict:
+    state = {
+        "user_input": scenario["input"],
+        "normalized_input": scenario["input"],
+        "crisis_type": scenario.get("crisis_type", ""),
+        "severity_level": scenario.get("severity_level", ""),
+        "escalation_required": False,
+        "who_to_contact": [],
+        "escalation_reason": "",
+        "escalation_history": [],
+        "error": ""
+    }
+    if classify:
+        state = classify_crisis(normalize_input(state))
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare rule-based and LLM assess_risk")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS)
+    parser.add_argument("--classify", action="store_true", help="Classify with the LLM nodes first")
+    args = parser.parse_args()
+
+    with open(args.scenarios, encoding="utf-8") as f:
+        scenarios = json.load(f)
+
+    total = agree_required = agree_contact = 0
+    timings = {"llm": 0.0, "rules": 0.0}
+    disagreements = []
+
+    for scenario in scenarios:
+        state = base_state(scenario, args.classify)
+        if state.get("error"):
+            print(f"⚠️ Skipping '{scenario['input']}': {state['error']}")
+            continue
+        total += 1
+        outcomes = {}
+        for mode in ("llm", "rules"):
+            start = time.perf_counter()
+            outcomes[mode] = assess_risk(copy.deepcopy(state), mode=mode)
+            timings[mode] += time.perf_counter() - start
+
+        llm, rules = outcomes["llm"], outcomes["rules"]
+        same_required = llm["escalation_required"] == rules["escalation_required"]
+        same_contact = (llm["who_to_contact"][:1] == rules["who_to_contact"][:1])
+        agree_required += same_required
+        agree_contact += same_contact
+        if not (same_required and same_contact):
+            disagreements.append({
+                "input": scenario["input"],
+                "severity": state["severity_level"],
+                "llm": [llm["escalation_required"], llm["who_to_contact"]],
+                "rules": [rules["escalation_required"], rules["who_to_contact"]]
+            })
+
+    print("=" * 70)
+    print("ASSESS_RISK AGREEMENT REPORT (rules vs LLM)")
+    print("=" * 70)
+    print(f"Scenarios compared: {total}")
+    if not total:
+        return
+    print(f"Escalation decision agreement: {agree_required}/{total} ({agree_required / total:.0%})")
+    print(f"Primary contact agreement:     {agree_contact}/{total} ({agree_contact / total:.0%})")
+    print(f"Mean latency - llm: {timings['llm'] / total * 1000:.0f} ms, "
+          f"rules: {timings['rules'] / total * 1000:.2f} ms")
+    if disagreements:
+        print("\nDisagreements:")
+        for d in disagreements:
+            print(f"  [{d['severity']}] {d['input']}")
+            print(f"     llm:   required={d['llm'][0]} contacts={d['llm'][1]}")
+            print(f"     rules: required={d['rules'][0]} contacts={d['rules'][1]}")
+
+
+if __name__ == "__main__":
+    main()
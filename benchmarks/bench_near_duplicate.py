@@ -0,0 +1,85 @@
+"""
+Benchmark: near-duplicate index lookup cost
+Indexes N synthetic medical inputs and measures insert and lookup latency
+for paraphrase hits and misses. Runs offline.
+
+Usage: python benchmarks/bench_near_duplicate.py [--entries 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runtime.near_duplicate import NearDuplicateIndex
+from schema import MEDICAL_CRISIS_KEYWORDS
+
+SUBJECTS = ["my father", "my mother", "my child", "my friend", "a coworker", "my grandmother",
+            "a neighbour", "my husband", "my wife", "a stranger", "my brother", "my sister"]
+MODIFIERS = ["suddenly", "since this morning", "after dinner", "while running", "at night",
+             "after a fall", "for two days", "after taking pills", "during exercise", "at work"]
+EXTRAS = ["and is sweating", "and feels dizzy", "and is vomiting", "and looks pale",
+          "and is confused", "and has a rash", "and cannot stand", "and is shaking"]
+KEYWORDS = [k for words in MEDICAL_CRISIS_KEYWORDS.values() for k in words]
+
+
+def synthetic_input(rng: random.Random, n: int) -> str:
+    """Distinct input: the trailing age makes each entry unique"""
+    return (f"{rng.choice(SUBJECTS)} has {rng.choice(KEYWORDS)} and {rng.choice(KEYWORDS)} "
+            f"{rng.choice(MODIFIERS)} {rng.choice(EXTRAS)} aged{n}")
+
+
+def percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--bands", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    index = NearDuplicateIndex(threshold=args.threshold, bands=args.bands, max_entries=args.entries)
+    texts = [synthetic_input(rng, i) for i in range(args.entries)]
+
+    start = time.perf_counter()
+    for i, text in enumerate(texts):
+        index.add(text, crisis_type="synthetic", severity_level="moderate", assessment="", red_flags=[])
+    insert_seconds = time.perf_counter() - start
+
+    # Paraphrase hits: reworded filler plus one extra word; misses: unseen ages
+    hit_queries = [
+        texts[rng.randrange(len(texts))].replace("has", "is having", 1).replace("my ", "") + " badly"
+        for _ in range(args.queries)
+    ]
+    miss_queries = [synthetic_input(rng, args.entries + i) for i in range(args.queries)]
+
+    results = {}
+    for label, queries in (("hit", hit_queries), ("miss", miss_queries)):
+        latencies, found = [], 0
+        for query in queries:
+            start = time.perf_counter()
+            found += index.lookup(query) is not None
+            latencies.append(time.perf_counter() - start)
+        results[label] = (latencies, found)
+
+    print("=" * 60)
+    print(f"Near-duplicate index: {len(index):,} entries, threshold {args.threshold}, {args.bands} bands")
+    print("=" * 60)
+    print(f"Insert: {insert_seconds:.2f}s total, {insert_seconds / args.entries * 1e6:.1f} µs/entry")
+    for label, (latencies, found) in results.items():
+        print(f"Lookup ({label}): p50 {percentile(latencies, 50) * 1e6:.0f} µs, "
+              f"p95 {percentile(latencies, 95) * 1e6:.0f} µs, "
+              f"p99 {percentile(latencies, 99) * 1e6:.0f} µs, "
+              f"matched {found}/{len(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
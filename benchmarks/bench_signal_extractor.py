@@ -0,0 +1,94 @@
+"""
+Benchmark: single-scan signal extractor vs the separate financial detectors
+Checks that detection/signal_extractor.py agrees with detect_mood,
+detect_financial_intent and safety_router on randomized inputs (lexicon
+terms, overlapping terms, filler), then times both on inputs of growing
+length. Runs offline.
+
+Usage: python benchmarks/bench_signal_extractor.py [--cases 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+FINANCIAL_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "AMUHACKS")
+sys.path.insert(0, FINANCIAL_ROOT)
+
+from detection.mood_detector import PANIC_WORDS, STRESS_WORDS, detect_mood
+from detection.financial_intent_detector import INTENT_RULES, detect_financial_intent
+from detection.signal_extractor import extract_signals
+from logic.router import EXTREME_RISK_PHRASES, safety_router
+
+TERMS = PANIC_WORDS + STRESS_WORDS + [k for _, _, words in INTENT_RULES for k in words] + EXTREME_RISK_PHRASES
+# Near misses and overlaps: "job lost money" holds both "job lost" and "lost money"
+TRICKY = ["job lost money", "scamp", "emission", "not paid salary", "LOAN", "Crypto", "deb t", "suicidal"]
+FILLER = ("the bank called again this morning and nobody would explain anything to me clearly, "
+          "so I keep checking my account and waiting for a reply from customer care. ")
+
+
+def detectors(text: str) -> tuple:
+    mood = detect_mood(text)
+    intent, shock = detect_financial_intent(text)
+    return mood, intent, shock, safety_router(text, mood, shock)
+
+
+def extractor(text: str) -> tuple:
+    signals = extract_signals(text)
+    return signals["mood"], signals["intent"], signals["shock"], signals["risk_level"]
+
+
+def random_text(rng: random.Random) -> str:
+    words = FILLER.split()
+    parts = [rng.choice(words) for _ in range(rng.randint(0, 20))]
+    for _ in range(rng.randint(0, 4)):
+        parts.insert(rng.randint(0, len(parts)), rng.choice(TERMS + TRICKY))
+    return " ".join(parts)
+
+
+def long_text(rng: random.Random, length: int) -> str:
+    # A few signal terms spread through otherwise neutral text
+    text = (FILLER * (length // len(FILLER) + 1))[:length]
+    for term in rng.sample(TERMS, 3):
+        at = rng.randrange(len(text))
+        text = text[:at] + " " + term + " " + text[at:]
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=5_000)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    mismatches = [text for text in (random_text(rng) for _ in range(args.cases))
+                  if detectors(text) != extractor(text)]
+
+    rows = []
+    for length in args.lengths:
+        text = long_text(rng, length)
+        number = max(10, 200_000 // length)
+        old = min(timeit.repeat(lambda: detectors(text), number=number, repeat=5)) / number
+        new = min(timeit.repeat(lambda: extractor(text), number=number, repeat=5)) / number
+        rows.append({
+            "chars": len(text),
+            "detectors_us": round(old * 1e6, 1),
+            "extractor_us": round(new * 1e6, 1),
+            "ratio": round(new / old, 2)
+        })
+
+    print(json.dumps({
+        "agreement_cases": args.cases,
+        "mismatches": len(mismatches),
+        "mismatch_examples": mismatches[:5],
+        "timings": rows
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
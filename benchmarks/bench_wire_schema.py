@@ -0,0 +1,133 @@
+"""
+Compact vs verbose wire schema for plan_actions
+Offline: encodes every fallback-library plan both ways and compares size
+(characters and an approximate token count).
+--live: runs plan_actions on the scenario set with each schema and reports
+completion tokens, latency and output validity from the real model
+(or a cassette - the two schemas produce different request keys).
+
+Usage: python benchmarks/bench_wire_schema.py [--live] [--scenarios benchmarks/scenarios.json] [--limit 10]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact_schema import compact_action
+from schema import ImmediateAction, SEVERITY_LEVELS
+from triage.fallback_plans import CATEGORIES, RECHECK_RESPONSES, get_fallback_plan
+
+DEFAULT_SCENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json")
+
+
+def approx_tokens(text: str) -> int:
+    """Letter runs, digit runs and punctuation - close to BPE counts for JSON keys"""
+    return len(re.findall(r"[A-Za-z]+|\d+|[^A-Za-z\d\s]", text))
+
+
+def offline_report() -> None:
+    verbose_chars, compact_chars, verbose_tokens, compact_tokens = [], [], [], []
+    for category in CATEGORIES:
+        for severity in SEVERITY_LEVELS:
+            for recheck in RECHECK_RESPONSES:
+                plan = get_fallback_plan(category, severity, recheck)
+                verbose = json.dumps({
+                    "immediate_actions": plan.actions(),
+                    "do_not_do": list(plan.do_not_do),
+                    "reassurance_message": plan.reassurance_message
+                })
+                compact = json.dumps({
+                    "a": [compact_action(a) for a in plan.actions()],
+                    "n": list(plan.do_not_do),
+                    "r": plan.reassurance_message
+                })
+                verbose_chars.append(len(verbose))
+                compact_chars.append(len(compact))
+                verbose_tokens.append(approx_tokens(verbose))
+                compact_tokens.append(approx_tokens(compact))
+
+    saved = 1 - sum(compact_tokens) / sum(verbose_tokens)
+    print(f"Plans encoded:          {len(verbose_chars)}")
+    print(f"Mean chars:             verbose {statistics.mean(verbose_chars):.0f}  compact {statistics.mean(compact_chars):.0f}")
+    print(f"Mean approx tokens:     verbose {statistics.mean(verbose_tokens):.0f}  compact {statistics.mean(compact_tokens):.0f}")
+    print(f"Completion tokens saved: {saved:.1%}")
+
+
+def live_report(scenarios: list) -> None:
+    import nodes.plan_actions  # noqa: F401 - make sure the module is loaded
+    plan_module = sys.modules["nodes.plan_actions"]
+    calls = []
+    original = plan_module.chat_completion
+
+    def recording(*args, **kwargs):
+        result = original(*args, **kwargs)
+        calls.append(result)
+        return result
+
+    plan_module.chat_completion = recording
+    plan_module.NEAR_DUPLICATE_CONFIG = dict(plan_module.NEAR_DUPLICATE_CONFIG, reuse_plan=False)
+
+    rows = {}
+    for compact in (False, True):
+        plan_module.COMPACT_WIRE_SCHEMA = compact
+        calls.clear()
+        valid = 0
+        for scenario in scenarios:
+            state = {
+                "normalized_input": scenario["input"],
+                "crisis_type": scenario["crisis_type"],
+                "severity_level": scenario["severity_level"],
+                "escalation_required": scenario["severity_level"] in ("high", "critical"),
+                "error": ""
+            }
+            before = len(calls)
+            state = plan_module.plan_actions(state)
+            if len(calls) == before or state.get("error"):
+                continue
+            try:
+                content = json.loads(calls[-1].content)
+                actions = content.get("a", content.get("immediate_actions", []))
+                if 3 <= len(actions) <= 7:
+                    for action in state["immediate_actions"]:
+                        ImmediateAction(**action)
+                    valid += 1
+            except Exception:
+                pass
+        tokens = [c.usage.get("completion_tokens") for c in calls if c.usage]
+        rows["compact" if compact else "verbose"] = {
+            "calls": len(calls),
+            "completion_tokens_mean": statistics.mean(tokens) if tokens else None,
+            "latency_mean_seconds": statistics.mean(c.latency_seconds for c in calls) if calls else None,
+            "valid_rate": valid / len(scenarios)
+        }
+    plan_module.chat_completion = original
+
+    print(json.dumps(rows, indent=2))
+    verbose, compact = rows["verbose"], rows["compact"]
+    if verbose["completion_tokens_mean"] and compact["completion_tokens_mean"]:
+        print(f"Completion tokens saved: {1 - compact['completion_tokens_mean'] / verbose['completion_tokens_mean']:.1%}")
+        print(f"Latency saved per call:  {verbose['latency_mean_seconds'] - compact['latency_mean_seconds']:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact wire schema benchmark")
+    parser.add_argument("--live", action="store_true", help="Call the model through plan_actions")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    offline_report()
+    if args.live:
+        with open(args.scenarios, encoding="utf-8") as f:
+            scenarios = json.load(f)[:args.limit]
+        print()
+        live_report(scenarios)
+
+
+if __name__ == "__main__":
+    main()
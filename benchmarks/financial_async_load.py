@@ -0,0 +1,129 @@
+"""
+Sync vs async throughput for the financial app
+Sends the same burst of synthetic requests through run_steps on a thread
+pool (how FastAPI serves a sync endpoint - 40 worker threads by default)
+and through arun_steps on one event loop, and compares throughput and
+latency percentiles.
+
+Usage:
+    python benchmarks/financial_async_load.py --requests 200 --concurrency 200
+    python benchmarks/financial_async_load.py --url http://127.0.0.1:8000 --requests 200
+
+With --url the two HTTP endpoints are compared instead
+(/crisis-support/sync and /crisis-support). Use LLM_CASSETTE_MODE=replay
+LLM_CASSETTE_REPLAY_LATENCY=true for offline runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from load_generator import FINANCIAL_ROOT, financial_inputs, percentile
+
+
+def summarize(name: str, latencies: list, wall: float) -> dict:
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / wall,
+        "p50_seconds": percentile(latencies, 50),
+        "p95_seconds": percentile(latencies, 95),
+        "p99_seconds": percentile(latencies, 99)
+    }
+
+
+def load_pipeline():
+    # Both modes replay the same texts - a warm response cache would only measure the cache
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    os.environ.setdefault("LLM_RATE_LIMIT_PER_SECOND", "0")
+    os.chdir(FINANCIAL_ROOT)
+    sys.path.insert(0, FINANCIAL_ROOT)
+    from app import analyze
+    from logic.step_manager import run_steps, arun_steps
+    return analyze, run_steps, arun_steps
+
+
+def run_sync(texts: list, threads: int) -> dict:
+    analyze, run_steps, _ = load_pipeline()
+
+    def one(text):
+        start = time.perf_counter()
+        run_steps(text, *analyze(text))
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, texts))
+    return summarize(f"sync ({threads} threads)", latencies, time.perf_counter() - start)
+
+
+def run_async(texts: list, concurrency: int) -> dict:
+    analyze, _, arun_steps = load_pipeline()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(text):
+            async with semaphore:
+                start = time.perf_counter()
+                await arun_steps(text, *analyze(text))
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(t) for t in texts))
+        return summarize(f"async (concurrency {concurrency})", latencies, time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+def run_http(texts: list, url: str, concurrency: int, path: str) -> dict:
+    import httpx
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(base_url=url, timeout=120) as client:
+
+            async def one(text):
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.post(path, json={"user_text": text})
+                    response.raise_for_status()
+                    return time.perf_counter() - start
+
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(one(t) for t in texts))
+            return summarize(f"http {path}", latencies, time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Financial app sync vs async load test")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200, help="In-flight requests")
+    parser.add_argument("--threads", type=int, default=40, help="Sync worker threads")
+    parser.add_argument("--url", help="Compare the HTTP endpoints of a running server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    inputs = financial_inputs(random.Random(args.seed))
+    texts = [next(inputs)[1] for _ in range(args.requests)]
+
+    if args.url:
+        results = [run_http(texts, args.url, args.concurrency, path)
+                   for path in ("/crisis-support/sync", "/crisis-support")]
+    else:
+        results = [run_sync(texts, args.threads), run_async(texts, args.concurrency)]
+
+    print(json.dumps(results, indent=2))
+    speedup = results[1]["throughput_rps"] / results[0]["throughput_rps"]
+    print(f"Async throughput: {speedup:.1f}x sync")
+
+
+if __name__ == "__main__":
+    main()
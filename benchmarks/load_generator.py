@@ -0,0 +1,245 @@
+"""
+Synthetic Load Generator for crisis scenarios
+Composes realistic inputs from the medical keyword lexicon (schema.py) and
+the financial intents (AMUHACKS/config/constants.py), drives a target at an
+open-loop Poisson arrival rate and reports throughput, latency percentiles,
+error/fallback rates and the severity (or status) distribution over time.
+
+Targets:
+    medical    run_crisis_assessment in-process
+    financial  detectors + run_steps of the financial app in-process
+    http       POST {"user_text": ...} to --url (e.g. the FastAPI /crisis-support)
+
+Usage:
+    python benchmarks/load_generator.py --target medical --rate 2 --duration 60
+    python benchmarks/load_generator.py --target http --url http://127.0.0.1:8000/crisis-support --rate 20
+
+Combine with LLM_CASSETTE_MODE=replay LLM_CASSETTE_REPLAY_LATENCY=true for
+offline runs with realistic latencies.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FINANCIAL_ROOT = os.path.join(ROOT, "AMUHACKS")
+
+MEDICAL_SUBJECTS = ["My father", "My mother", "My 4 year old", "My friend", "My grandmother",
+                    "A coworker", "My husband", "My wife", "I", "A man on the street"]
+MEDICAL_TEMPLATES = [
+    "{subject} has {k1} and {k2} {when}",
+    "{subject} suddenly has {k1}, {when}",
+    "{subject} is dealing with {k1} {when}, also some {k2}",
+    "Help, {subject_lower} has {k1} {when}"
+]
+MEDICAL_WHEN = ["since this morning", "after dinner", "for two days", "right now",
+                "after a fall", "after exercising", "for the last hour", ""]
+
+FINANCIAL_TEMPLATES = {
+    "fraud": ["I think I got scammed, someone {x}", "My account was hacked and {x}"],
+    "debt": ["I can't pay my loan EMI this month and {x}", "My debt keeps growing and {x}"],
+    "salary_issue": ["My salary has not been paid for two months and {x}",
+                     "Company says salary is delayed again, {x}"],
+    "financial_loss": ["I lost money in crypto trading and {x}", "Trading loss wiped my savings, {x}"],
+    "job_loss": ["I was laid off today and {x}", "Job lost after 8 years, {x}"]
+}
+FINANCIAL_FEELINGS = ["I am panicking", "I feel stressed", "I am worried about rent",
+                      "I don't know what to do", "my heart racing", "I am terrified",
+                      "I feel okay but confused", "I am overthinking everything"]
+
+
+def _load_module(name: str, path: str):
+    """Import a file under a private name (the two apps both define `config`)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def medical_inputs(rng: random.Random):
+    schema = _load_module("_lg_schema", os.path.join(ROOT, "schema.py"))
+    categories = list(schema.MEDICAL_CRISIS_KEYWORDS)
+    red_flags = schema.RED_FLAG_SYMPTOMS
+    while True:
+        category = rng.choice(categories)
+        keywords = schema.MEDICAL_CRISIS_KEYWORDS[category]
+        subject = rng.choice(MEDICAL_SUBJECTS)
+        k2 = rng.choice(red_flags) if rng.random() < 0.2 else rng.choice(keywords)
+        text = rng.choice(MEDICAL_TEMPLATES).format(
+            subject=subject, subject_lower=subject.lower() if subject != "I" else "I",
+            k1=rng.choice(keywords), k2=k2, when=rng.choice(MEDICAL_WHEN)
+        ).strip()
+        yield category, text
+
+
+def financial_inputs(rng: random.Random):
+    constants = _load_module("_lg_constants", os.path.join(FINANCIAL_ROOT, "config", "constants.py"))
+    while True:
+        intent = rng.choice(constants.FINANCIAL_INTENTS)
+        template = rng.choice(FINANCIAL_TEMPLATES[intent])
+        yield intent, template.format(x=rng.choice(FINANCIAL_FEELINGS))
+
+
+def medical_target():
+    sys.path.insert(0, ROOT)
+    from agent_graph import run_crisis_assessment
+
+    def run(text: str) -> dict:
+        result = run_crisis_assessment(text)
+        return {
+            "outcome": result.get("severity_level", "unknown"),
+            "fallback": result.get("crisis_type") == "Error"
+        }
+    return run
+
+
+def financial_target():
+    # The financial app resolves its packages and prompt files relative to its folder
+    os.chdir(FINANCIAL_ROOT)
+    sys.path.insert(0, FINANCIAL_ROOT)
+    from detection.mood_detector import detect_mood
+    from detection.financial_intent_detector import detect_financial_intent
+    from logic.router import safety_router
+    from logic.step_manager import run_steps
+
+    def run(text: str) -> dict:
+        mood = detect_mood(text)
+        intent, shock = detect_financial_intent(text)
+        risk_level = safety_router(text, mood, shock)
+        result = run_steps(text, mood, intent, shock, risk_level)
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+        return financial_outcome(result)
+    return run
+
+
+def financial_outcome(result: dict) -> dict:
+    steps = result.get("steps", [])
+    fallback = any("_internal_status" in step for step in steps) or \
+        str(result.get("reason", "")).startswith("LLM failure")
+    return {"outcome": result.get("status", "unknown"), "fallback": fallback}
+
+
+def http_target(url: str, timeout: float):
+    def run(text: str) -> dict:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps({"user_text": text}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read())
+        if "severity_level" in body:
+            return {"outcome": body["severity_level"], "fallback": body.get("crisis_type") == "Error"}
+        return financial_outcome(body)
+    return run
+
+
+def percentile(samples: list, p: float):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def run_load(run, inputs, rate: float, duration: float, rng: random.Random,
+             max_workers: int) -> list:
+    """Open-loop: arrivals follow a Poisson process regardless of completions"""
+    records, lock = [], threading.Lock()
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    t0 = time.perf_counter()
+
+    def execute(arrival: float, label: str, text: str):
+        record = {"arrival": arrival, "label": label, "outcome": None, "fallback": False, "error": None}
+        try:
+            record.update(run(text))
+        except Exception as e:
+            record["error"] = type(e).__name__
+        # Latency is measured from the scheduled arrival, so client-side queueing counts
+        record["latency"] = time.perf_counter() - t0 - arrival
+        record["finished"] = time.perf_counter() - t0
+        with lock:
+            records.append(record)
+
+    next_arrival = 0.0
+    while next_arrival < duration:
+        sleep = next_arrival - (time.perf_counter() - t0)
+        if sleep > 0:
+            time.sleep(sleep)
+        label, text = next(inputs)
+        pool.submit(execute, next_arrival, label, text)
+        next_arrival += rng.expovariate(rate)
+    pool.shutdown(wait=True)
+    return records
+
+
+def report(records: list, rate: float, duration: float, window: float) -> dict:
+    wall = max((r["finished"] for r in records), default=duration)
+    ok = [r for r in records if not r["error"]]
+    latencies = [r["latency"] for r in ok]
+    timeline = defaultdict(Counter)
+    for r in records:
+        timeline[int(r["arrival"] // window)][r["error"] and "error" or r["outcome"]] += 1
+    return {
+        "offered_rate_rps": rate,
+        "requests": len(records),
+        "achieved_throughput_rps": len(ok) / wall if wall else 0.0,
+        "latency_seconds": {f"p{p}": percentile(latencies, p) for p in (50, 90, 95, 99)},
+        "error_rate": 1 - len(ok) / len(records) if records else 0.0,
+        "fallback_rate": sum(r["fallback"] for r in ok) / len(ok) if ok else 0.0,
+        "errors": dict(Counter(r["error"] for r in records if r["error"])),
+        "outcomes_over_time": {
+            f"{w * window:.0f}-{(w + 1) * window:.0f}s": dict(timeline[w]) for w in sorted(timeline)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop synthetic load generator")
+    parser.add_argument("--target", choices=["medical", "financial", "http"], required=True)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/crisis-support")
+    parser.add_argument("--inputs", choices=["medical", "financial"],
+                        help="Input generator (defaults to the target's domain; financial for http)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of arrivals")
+    parser.add_argument("--window", type=float, default=10.0, help="Timeline bucket (seconds)")
+    parser.add_argument("--max-workers", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60.0, help="HTTP timeout (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json-out", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    domain = args.inputs or ("medical" if args.target == "medical" else "financial")
+    inputs = medical_inputs(rng) if domain == "medical" else financial_inputs(rng)
+
+    if args.target == "medical":
+        run = medical_target()
+    elif args.target == "financial":
+        run = financial_target()
+    else:
+        run = http_target(args.url, args.timeout)
+
+    print(f"🚦 {args.target}: {args.rate} req/s for {args.duration}s ({domain} inputs)")
+    records = run_load(run, inputs, args.rate, args.duration, rng, args.max_workers)
+    result = report(records, args.rate, args.duration, args.window)
+    print(json.dumps(result, indent=2))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
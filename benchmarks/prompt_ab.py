@@ -0,0 +1,92 @@
+"""
+Prompt version A/B report
+Offline: approximate input tokens per node for every registered prompt
+version on the scenario set.
+--live: runs normalize_input, classify_crisis, assess_risk and plan_actions
+on the scenarios with each version and prints the registry's per-version
+latency, token usage and output validity.
+
+Usage: python benchmarks/prompt_ab.py [--live] [--versions v1 v2] [--scenarios benchmarks/scenarios.json] [--limit 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_wire_schema import approx_tokens
+from compact_schema import COMPACT_PLAN_FORMAT, COMPACT_FIELDS_RULE
+from prompts import prompt_registry
+
+DEFAULT_SCENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json")
+
+
+def prompt_fields(scenario: dict) -> dict:
+    return {
+        "user_input": scenario["input"],
+        "normalized_input": scenario["input"],
+        "crisis_type": scenario["crisis_type"],
+        "severity": scenario["severity_level"],
+        "escalation_required": scenario["severity_level"] in ("high", "critical"),
+        "response_format": COMPACT_PLAN_FORMAT,
+        "fields_rule": COMPACT_FIELDS_RULE
+    }
+
+
+def offline_report(scenarios: list, versions: list) -> None:
+    print(f"{'node':<18}" + "".join(f"{v + ' tokens':>14}" for v in versions))
+    for node in ["normalize_input", "classify_crisis", "assess_risk", "plan_actions"]:
+        row = f"{node:<18}"
+        for version in versions:
+            prompt = prompt_registry.get(node, version)
+            sizes = [
+                sum(approx_tokens(m["content"]) for m in prompt.messages(**prompt_fields(s)))
+                for s in scenarios
+            ]
+            row += f"{statistics.mean(sizes):>14.0f}"
+        print(row)
+
+
+def live_report(scenarios: list, versions: list) -> None:
+    from nodes.normalize_input import normalize_input
+    from nodes.classify import classify_crisis
+    from nodes.assess_risk import assess_risk
+    from nodes.plan_actions import plan_actions
+    import config
+
+    # Every scenario must reach the LLM for a fair comparison
+    config.NORMALIZE_GATE_CONFIG["enabled"] = False
+    config.NEAR_DUPLICATE_CONFIG["enabled"] = False
+    config.LOCAL_CLASSIFIER_CONFIG["enabled"] = False
+
+    prompt_registry.ab_test = False
+    for version in versions:
+        prompt_registry.default_version = version
+        for scenario in scenarios:
+            state = {"user_input": scenario["input"], "error": "", "escalation_history": []}
+            for node in (normalize_input, classify_crisis, assess_risk, plan_actions):
+                state = node(state)
+    print(json.dumps(prompt_registry.report(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt version A/B report")
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--versions", nargs="+", default=["v1", "v2"])
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.scenarios, encoding="utf-8") as f:
+        scenarios = json.load(f)[:args.limit]
+    offline_report(scenarios, args.versions)
+    if args.live:
+        print()
+        live_report(scenarios, args.versions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Compact Wire Schema
+Short keys and enum codes for the JSON the LLM writes, expanded locally
+into the full ImmediateAction / CrisisResponse field names. Fewer
+completion tokens means less generation time on every planning call.
+
+Expansion also accepts the verbose schema, so a model that ignores the
+compact format still parses.
+"""
+
+SEVERITY_CODES = {"L": "low", "M": "moderate", "H": "high", "C": "critical"}
+CONTACT_CODES = {"A": "ambulance", "H": "nearby hospital", "R": "relative", "F": "friend"}
+# Action flags: code -> (field, value when the letter is present). A missing
+# letter means the opposite, so omitted flags land on the safe defaults of
+# validate_actions (confirmation required, not critical, not repeatable)
+ACTION_FLAGS = {
+    "N": ("user_confirmation_required", False),
+    "C": ("critical", True),
+    "R": ("repeatable", True)
+}
+
+COMPACT_ACTIONS_FORMAT = """"a": [{"i": 1, "t": "<short action title>", "x": "<clear instruction>", "d": <integer 5-120 OR null>, "f": "<flags>"}]"""
+
+COMPACT_LEGEND = """Keys: a=immediate_actions, i=step_id, t=title, x=instruction, d=duration_seconds,
+f=flags (any of N=no user confirmation - urgent steps only, C=critical, R=repeatable; "" for none),
+n=do_not_do, r=reassurance_message, s=severity (L/M/H/C), e=escalation_required (0/1),
+w=who_to_contact (A=ambulance, H=nearby hospital, R=relative, F=friend), y=escalation reason,
+k=crisis_type, m=assessment"""
+
+COMPACT_PLAN_FORMAT = f"""{{
+  {COMPACT_ACTIONS_FORMAT},
+  "n": ["<dangerous action to avoid>", "<another dangerous action to avoid>"],
+  "r": "<calm, supportive message>"
+}}
+{COMPACT_LEGEND}"""
+
+COMPACT_FIRST_STEPS_FORMAT = f"""{{
+  {COMPACT_ACTIONS_FORMAT}
+}}
+{COMPACT_LEGEND}"""
+
+COMPACT_RECHECK_FORMAT = f"""{{
+  "m": "<updated calm explanation>",
+  {COMPACT_ACTIONS_FORMAT},
+  "e": 0 or 1,
+  "w": ["<contact code>"],
+  "y": "<reason>",
+  "r": "<supportive message>"
+}}
+{COMPACT_LEGEND}"""
+
+COMPACT_FUSED_FORMAT = f"""{{
+  "k": "<type of medical issue>",
+  "s": "<L|M|H|C>",
+  "m": "<brief assessment, 1-2 sentences>",
+  "e": 0 or 1,
+  "w": ["<contact code>"],
+  "y": "<why escalation is or isn't needed>",
+  {COMPACT_ACTIONS_FORMAT},
+  "n": ["<dangerous action to avoid>"],
+  "r": "<calm, supportive message>"
+}}
+{COMPACT_LEGEND}"""
+
+# Replaces the verbose "Each step MUST have ALL fields (step_id, ...)" prompt rule
+COMPACT_FIELDS_RULE = "- Each step MUST have ALL keys shown in the format (i, t, x, d, f)"
+
+
+def parse_flag(value) -> bool:
+    """0/1, true/false or their string forms - bool("0") would be True"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def expand_action(action: dict, index: int) -> dict:
+    """One compact action -> ImmediateAction field names"""
+    if "instruction" in action or "title" in action:
+        return action
+    flags = str(action.get("f") or "").upper()
+    expanded = {
+        "step_id": action.get("i", index),
+        "title": action.get("t", f"Action {index}"),
+        "instruction": action.get("x", "Follow medical guidance"),
+        "duration_seconds": action.get("d")
+    }
+    for code, (field, present) in ACTION_FLAGS.items():
+        expanded[field] = present if code in flags else not present
+    return expanded
+
+
+def expand_severity(value: str) -> str:
+    value = str(value or "").strip()
+    return SEVERITY_CODES.get(value.upper(), value.lower())
+
+
+def expand_contacts(values) -> list:
+    return [CONTACT_CODES.get(str(v).upper(), v) for v in values or []]
+
+
+def expand_response(data: dict) -> dict:
+    """
+    Expand a compact LLM response to the verbose keys the nodes read
+    (immediate_actions, do_not_do, reassurance_message, severity_level,
+    escalation_required, who_to_contact, reason/escalation_reason,
+    crisis_type, assessment). Verbose keys pass through unchanged.
+    """
+    expanded = dict(data)
+    if "a" in data:
+        expanded["immediate_actions"] = [
+            expand_action(action, i) for i, action in enumerate(data["a"], 1)
+        ]
+    if "n" in data:
+        expanded["do_not_do"] = list(data["n"])
+    if "r" in data:
+        expanded["reassurance_message"] = data["r"]
+    if "s" in data:
+        expanded["severity_level"] = expand_severity(data["s"])
+    if "e" in data:
+        expanded["escalation_required"] = parse_flag(data["e"])
+    if "w" in data:
+        expanded["who_to_contact"] = expand_contacts(data["w"])
+    if "y" in data:
+        expanded["reason"] = expanded["escalation_reason"] = data["y"]
+    if "k" in data:
+        expanded["crisis_type"] = data["k"]
+    if "m" in data:
+        expanded["assessment"] = data["m"]
+    return expanded
+
+
+def compact_action(action: dict) -> dict:
+    """ImmediateAction dict -> compact form (for benchmarks and few-shot examples)"""
+    return {
+        "i": action["step_id"],
+        "t": action["title"],
+        "x": action["instruction"],
+        "d": action.get("duration_seconds"),
+        "f": "".join(
+            code for code, (field, present) in ACTION_FLAGS.items()
+            if action.get(field, not present) == present
+        )
+    }
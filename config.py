@@ -11,11 +11,19 @@ from langfuse.decorators import observe, langfuse_context
 # Load environment variables
 load_dotenv()
 
+# LLM record/replay cassette (off | record | replay) - replay runs fully offline
+LLM_CASSETTE_CONFIG = {
+    "mode": os.getenv("LLM_CASSETTE_MODE", "off"),
+    "path": os.getenv("LLM_CASSETTE_PATH", "cassettes/medical.jsonl.gz"),
+    "replay_latency": os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "false").lower() == "true"
+}
+
 # Groq API Configuration
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
+if not GROQ_API_KEY and LLM_CASSETTE_CONFIG["mode"] != "replay":
     raise ValueError("GROQ_API_KEY not found in environment variables. Please check your .env file.")
 GROQ_MODEL = "llama-3.3-70b-versatile"
+GROQ_FALLBACK_MODEL = os.getenv("GROQ_FALLBACK_MODEL", "llama-3.1-8b-instant")
 
 # Langfuse Configuration
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
@@ -113,3 +121,111 @@ APP_CONFIG = {
     "top_p": 0.9,
     "disclaimer": "⚠️ DISCLAIMER: This assistant does not replace medical professionals. In any emergency, call emergency services immediately."
 }
+
+# Latency-driven model fallback (p95 thresholds per node, in seconds)
+MODEL_FALLBACK_CONFIG = {
+    "enabled": os.getenv("MODEL_FALLBACK_ENABLED", "true").lower() == "true",
+    "fallback_model": GROQ_FALLBACK_MODEL,
+    "p95_threshold_seconds": {
+        "default": 6.0,
+        "normalize_input": 3.0,
+        "classify_crisis": 4.0,
+        "assess_risk": 4.0,
+        "plan_actions": 8.0,
+        "evaluate_worsening": 8.0
+    },
+    "window_size": 50,
+    "min_samples": 5,
+    "cooldown_seconds": 60
+}
+
+# Local gate that passes short, clearly medical input through normalize_input
+# without an LLM call
+NORMALIZE_GATE_CONFIG = {
+    "enabled": os.getenv("NORMALIZE_GATE_ENABLED", "true").lower() == "true",
+    "max_chars": 160,
+    "max_words": 30,
+    "max_sentences": 2,
+    "max_noise_ratio": 0.15
+}
+
+# Near-duplicate reuse of earlier classifications (and optionally action plans)
+NEAR_DUPLICATE_CONFIG = {
+    "enabled": os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true",
+    "threshold": float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8")),
+    "reuse_plan": os.getenv("NEAR_DUPLICATE_REUSE_PLAN", "false").lower() == "true",
+    "num_perm": 32,
+    "bands": 8,
+    "max_entries": 10000,
+    "ttl_seconds": 3600
+}
+
+# JSONL archive of graph outputs - training data for the local classifier
+ASSESSMENT_ARCHIVE_PATH = os.getenv("ASSESSMENT_ARCHIVE_PATH")
+
+# Local classifier used in front of classify_crisis when confident
+LOCAL_CLASSIFIER_CONFIG = {
+    "enabled": os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() == "true",
+    "model_path": os.getenv("LOCAL_CLASSIFIER_PATH", "models/crisis_classifier.npz"),
+    "confidence_threshold": float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.85"))
+}
+
+# assess_risk implementation: "llm" (prompted) or "rules" (deterministic, no LLM call)
+RISK_ASSESSMENT_MODE = os.getenv("RISK_ASSESSMENT_MODE", "llm")
+
+# Run plan_actions speculatively in parallel with assess_risk
+SPECULATIVE_PLANNING = os.getenv("SPECULATIVE_PLANNING", "true").lower() == "true"
+
+# Optional request hedging: duplicate a call still pending after the node's
+# p<percentile> latency, capped at max_hedge_rate of recent calls
+HEDGING_CONFIG = {
+    "enabled": os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true",
+    "percentile": float(os.getenv("LLM_HEDGING_PERCENTILE", "90")),
+    "min_samples": 20,
+    "max_hedge_rate": float(os.getenv("LLM_HEDGING_MAX_RATE", "0.1")),
+    "rate_window": 200
+}
+
+# Degradation ladder under overload: full graph -> fused single call ->
+# rule-based triage -> 503 for low-severity requests (red flags always served)
+LOAD_SHEDDING_CONFIG = {
+    "enabled": os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() == "true",
+    "max_inflight": {
+        "fused": int(os.getenv("LOAD_SHED_FUSED_AT", "8")),
+        "rules": int(os.getenv("LOAD_SHED_RULES_AT", "16")),
+        "reject": int(os.getenv("LOAD_SHED_REJECT_AT", "32"))
+    },
+    "p95_threshold_seconds": {
+        "fused": 20.0,
+        "rules": 40.0
+    },
+    "window_size": 50,
+    "min_samples": 10,
+    "cooldown_seconds": 30,
+    "retry_after_seconds": 5
+}
+
+# Severity-aware scheduling of graph executions: keyword pre-triage picks the
+# priority class, waiting requests gain one class per aging_seconds
+SCHEDULER_CONFIG = {
+    "enabled": os.getenv("PRIORITY_SCHEDULER_ENABLED", "true").lower() == "true",
+    "max_workers": int(os.getenv("GRAPH_EXECUTORS", "8")),
+    "aging_seconds": float(os.getenv("SCHEDULER_AGING_SECONDS", "10"))
+}
+
+# Short-key JSON for the planning LLM calls (plan_actions, fused assessment,
+# worsening recheck), expanded locally by compact_schema
+COMPACT_WIRE_SCHEMA = os.getenv("COMPACT_WIRE_SCHEMA", "true").lower() == "true"
+
+# Prompt versions per node (prompts.py). With PROMPT_AB_TEST on, a stable
+# ab_share of inputs gets ab_candidate instead of default_version
+PROMPT_REGISTRY_CONFIG = {
+    "default_version": os.getenv("PROMPT_VERSION", "v2"),
+    "ab_test": os.getenv("PROMPT_AB_TEST", "false").lower() == "true",
+    "ab_candidate": os.getenv("PROMPT_AB_CANDIDATE", "v1"),
+    "ab_share": float(os.getenv("PROMPT_AB_SHARE", "0.5"))
+}
+
+# Two-phase action planning: a short call returns the 1-2 most critical steps
+# first while the full plan is generated in parallel
+PLAN_TWO_PHASE = os.getenv("PLAN_TWO_PHASE", "false").lower() == "true"
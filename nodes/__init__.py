@@ -8,6 +8,9 @@ from .assess_risk import assess_risk
 from .plan_actions import plan_actions
 from .format_output import format_output
 from .worsening_check import evaluate_worsening
+from .assess_and_plan import assess_and_plan
+from .fused_assessment import fused_assessment
+from .rules_triage import rules_triage
 
 __all__ = [
     'normalize_input',
@@ -15,5 +18,8 @@ __all__ = [
     'assess_risk',
     'plan_actions',
     'format_output',
-    'evaluate_worsening'
+    'evaluate_worsening',
+    'assess_and_plan',
+    'fused_assessment',
+    'rules_triage'
 ]
@@ -0,0 +1,85 @@
+"""
+Speculative Risk Assessment + Action Planning Node
+Runs plan_actions in parallel with assess_risk using a predicted
+escalation decision, and re-plans only if the prediction was wrong
+"""
+
+import contextvars
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import RISK_ASSESSMENT_MODE
+from nodes.assess_risk import assess_risk
+from nodes.plan_actions import plan_actions
+from runtime.metrics import metrics
+from triage.rules import evaluate_escalation
+
+PLAN_FIELDS = ("immediate_actions", "do_not_do", "reassurance_message")
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="speculative")
+
+
+def _timed(node_func, state: dict):
+    start = time.perf_counter()
+    result = node_func(state)
+    return result, time.perf_counter() - start
+
+
+def _submit(node_func, state: dict):
+    # Each task runs in its own copy of the context so Langfuse keeps the trace
+    return _executor.submit(contextvars.copy_context().run, _timed, node_func, state)
+
+
+def assess_and_plan(state: dict) -> dict:
+    """
+    Assess risk and plan actions with one sequential LLM round trip on a hit
+    """
+    if state.get("error"):
+        return state
+    
+    # The rule engine is instant - nothing to overlap with
+    if RISK_ASSESSMENT_MODE == "rules":
+        return plan_actions(assess_risk(state))
+    
+    predicted = evaluate_escalation(
+        state["normalized_input"], state["severity_level"], state["crisis_type"]
+    )["escalation_required"]
+    
+    start = time.perf_counter()
+    plan_state = copy.deepcopy(state)
+    plan_state["escalation_required"] = predicted
+    risk_future = _submit(assess_risk, copy.deepcopy(state))
+    plan_future = _submit(plan_actions, plan_state)
+    risk_state, risk_seconds = risk_future.result()
+    planned, plan_seconds = plan_future.result()
+    
+    # A failed risk assessment ends the flow, exactly like the sequential graph
+    if risk_state.get("error"):
+        return risk_state
+    
+    if risk_state["escalation_required"] == predicted:
+        metrics.incr("speculation.hit")
+    else:
+        metrics.incr("speculation.miss")
+        planned, plan_seconds = _timed(plan_actions, copy.deepcopy(risk_state))
+    
+    for field in PLAN_FIELDS:
+        risk_state[field] = planned[field]
+    if planned.get("error"):
+        risk_state["error"] = planned["error"]
+    
+    sequential_seconds = risk_seconds + plan_seconds
+    metrics.observe("speculation.latency_saved_seconds", sequential_seconds - (time.perf_counter() - start))
+    return risk_state
+
+
+def get_speculation_stats() -> dict:
+    """Speculation hit rate and wall-clock time saved versus running sequentially"""
+    return {
+        "hits": metrics.counter("speculation.hit"),
+        "misses": metrics.counter("speculation.miss"),
+        "hit_rate": metrics.rate("speculation.hit", "speculation.miss"),
+        "latency_saved_p50_seconds": metrics.percentile("speculation.latency_saved_seconds", 50),
+        "latency_saved_p95_seconds": metrics.percentile("speculation.latency_saved_seconds", 95)
+    }
@@ -4,8 +4,33 @@ Identifies medical crisis type and severity level
 """
 
 import json
+import os
 from typing import TypedDict
-from config import get_groq_client, SYSTEM_PROMPTS, APP_CONFIG
+from config import NEAR_DUPLICATE_CONFIG, LOCAL_CLASSIFIER_CONFIG
+from prompts import prompt_registry
+from runtime.llm_call import chat_completion
+from runtime.assessment_cache import assessment_index
+from runtime.metrics import metrics
+from triage.keywords import match_red_flags
+
+
+_local_classifier = None
+_local_classifier_loaded = False
+
+
+def get_local_classifier():
+    """Load the offline-trained classifier once; None if unavailable"""
+    global _local_classifier, _local_classifier_loaded
+    if not _local_classifier_loaded:
+        _local_classifier_loaded = True
+        path = LOCAL_CLASSIFIER_CONFIG["model_path"]
+        if LOCAL_CLASSIFIER_CONFIG["enabled"] and os.path.exists(path):
+            try:
+                from triage.local_classifier import LocalCrisisClassifier
+                _local_classifier = LocalCrisisClassifier.load(path)
+            except Exception as e:
+                print(f"⚠️ Local classifier unavailable: {e}")
+    return _local_classifier
 
 
 def classify_crisis(state: dict) -> dict:
@@ -15,52 +40,73 @@ def classify_crisis(state: dict) -> dict:
     if state.get("error"):
         return state
     
-    client = get_groq_client()
     normalized_input = state["normalized_input"]
+    red_flags = match_red_flags(normalized_input)
     
-    prompt = f"""Medical situation: "{normalized_input}"
-
-Task: Classify this medical crisis.
-
-Provide your response in this EXACT JSON format:
-{{
-  "crisis_type": "<type of medical issue>",
-  "severity_level": "<low|moderate|high|critical>",
-  "assessment": "<brief calm explanation of what may be happening>"
-}}
-
-Severity Guidelines:
-- LOW: Minor issues, no immediate danger (small cuts, mild headache, minor fever)
-- MODERATE: Concerning symptoms needing attention soon (persistent fever, moderate pain)
-- HIGH: Serious symptoms needing urgent care (severe pain, high fever, persistent vomiting)
-- CRITICAL: Life-threatening, needs immediate emergency (chest pain, difficulty breathing, unconsciousness, severe bleeding)
-
-Be conservative - when in doubt, increase severity level.
-The assessment should be calm, non-alarming, and helpful."""
+    # Reuse the classification of a previously assessed paraphrase
+    if NEAR_DUPLICATE_CONFIG["enabled"]:
+        match = assessment_index.lookup(normalized_input)
+        cached = match[1] if match else {}
+        if "crisis_type" in cached and cached.get("red_flags") == red_flags:
+            metrics.incr("classify_crisis.near_duplicate_hit")
+            state["crisis_type"] = cached["crisis_type"]
+            state["severity_level"] = cached["severity_level"]
+            state["assessment"] = cached["assessment"]
+            state["classification_source"] = "near_duplicate"
+            return state
+        metrics.incr("classify_crisis.near_duplicate_miss")
+    
+    # Confident local prediction replaces the LLM call
+    local_model = get_local_classifier()
+    if local_model is not None:
+        prediction = local_model.predict(normalized_input)
+        if prediction["confidence"] >= LOCAL_CLASSIFIER_CONFIG["confidence_threshold"]:
+            metrics.incr("classify_crisis.local_model_hit")
+            state["crisis_type"] = prediction["crisis_type"]
+            state["severity_level"] = prediction["severity_level"]
+            state["assessment"] = (
+                f"This appears to be a {prediction['crisis_type']} situation "
+                f"of {prediction['severity_level']} severity. Follow the steps below calmly."
+            )
+            state["classification_source"] = "local_model"
+            return state
+        metrics.incr("classify_crisis.local_model_fallback")
+    
+    prompt = prompt_registry.get("classify_crisis", key=normalized_input)
 
     try:
-        response = client.chat.completions.create(
-            model=APP_CONFIG["model"],
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPTS["crisis_classification"]},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=APP_CONFIG["temperature"],
+        response = chat_completion(
+            "classify_crisis",
+            messages=prompt.messages(normalized_input=normalized_input),
             max_tokens=800,
-            response_format={"type": "json_object"}
+            prompt_version=prompt.version
         )
         
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(response.content)
         
         state["crisis_type"] = result.get("crisis_type", "Unknown medical issue")
         state["severity_level"] = result.get("severity_level", "moderate").lower()
         state["assessment"] = result.get("assessment", "Medical situation requiring assessment")
         
         # Validate severity level
-        if state["severity_level"] not in ["low", "moderate", "high", "critical"]:
+        valid = state["severity_level"] in ["low", "moderate", "high", "critical"]
+        prompt_registry.record_validity(prompt, valid)
+        if not valid:
             state["severity_level"] = "moderate"
+        state["classification_source"] = "llm"
+        
+        if NEAR_DUPLICATE_CONFIG["enabled"]:
+            assessment_index.add(
+                normalized_input,
+                crisis_type=state["crisis_type"],
+                severity_level=state["severity_level"],
+                assessment=state["assessment"],
+                red_flags=red_flags
+            )
             
     except Exception as e:
+        if isinstance(e, ValueError):
+            prompt_registry.record_validity(prompt, False)
         state["error"] = f"Error in crisis classification: {str(e)}"
         state["crisis_type"] = "Unknown"
         state["severity_level"] = "moderate"
@@ -4,7 +4,9 @@ Assembles and validates final JSON response
 """
 
 import json
-from schema import CrisisResponse, Escalation
+from schema import CrisisResponse, Escalation, SEVERITY_LEVELS
+from triage.fallback_plans import fallback_plan_for_state
+from triage.rules import triage_severity
 
 
 def format_output(state: dict) -> dict:
@@ -37,6 +39,26 @@ def format_output(state: dict) -> dict:
             },
             "reassurance_message": "Please provide information about a medical situation for assistance."
         }
+        # A node failed after classification - give the fallback plan for the
+        # known severity instead of asking the user to rephrase
+        severity = state.get("severity_level")
+        if severity in SEVERITY_LEVELS and not state.get("classification_source"):
+            # Classification itself failed and left a placeholder severity -
+            # use the keyword pre-triage, but never less than high
+            severity = max(triage_severity(state.get("user_input", "")), "high", key=SEVERITY_LEVELS.index)
+        if severity in SEVERITY_LEVELS:
+            plan = fallback_plan_for_state(dict(state, severity_level=severity))
+            error_response.update({
+                "severity_level": severity,
+                "immediate_actions": plan.actions(),
+                "do_not_do": list(plan.do_not_do),
+                "escalation": {
+                    "required": state.get("escalation_required", True) or severity in ("high", "critical"),
+                    "who_to_contact": state.get("who_to_contact") or ["ambulance"],
+                    "reason": state.get("escalation_reason") or "Unable to complete the assessment - seek medical help"
+                },
+                "reassurance_message": plan.reassurance_message
+            })
         state["final_output"] = error_response
         return state
     
@@ -65,29 +87,20 @@ def format_output(state: dict) -> dict:
         
     except Exception as e:
         # Fallback to manual construction
+        plan = fallback_plan_for_state(state)
         state["final_output"] = {
             "user_prompt": state.get("user_input", ""),
             "crisis_type": state.get("crisis_type", "Unknown"),
             "severity_level": state.get("severity_level", "moderate"),
             "assessment": state.get("assessment", "Medical situation requiring assessment"),
-            "immediate_actions": state.get("immediate_actions", [
-                {
-                    "step_id": 1,
-                    "title": "Seek medical help",
-                    "instruction": "Contact emergency services or go to the nearest hospital.",
-                    "duration_seconds": None,
-                    "user_confirmation_required": False,
-                    "critical": True,
-                    "repeatable": False
-                }
-            ]),
-            "do_not_do": state.get("do_not_do", ["Do not delay seeking help"]),
+            "immediate_actions": state.get("immediate_actions") or plan.actions(),
+            "do_not_do": state.get("do_not_do") or list(plan.do_not_do),
             "escalation": {
                 "required": state.get("escalation_required", True),
                 "who_to_contact": state.get("who_to_contact", ["ambulance"]),
                 "reason": state.get("escalation_reason", "Safety precaution")
             },
-            "reassurance_message": state.get("reassurance_message", "Please seek medical attention."),
+            "reassurance_message": state.get("reassurance_message") or plan.reassurance_message,
             "symptom_recheck": state.get("symptom_recheck")
         }
     
@@ -0,0 +1,109 @@
+"""
+Fused Assessment Node
+Degraded mode: classification, risk assessment and action planning
+in a single LLM call. Falls back to rule-based triage if the call fails.
+"""
+
+import json
+from config import SYSTEM_PROMPTS, COMPACT_WIRE_SCHEMA
+from compact_schema import COMPACT_FUSED_FORMAT, expand_response
+from runtime.llm_call import chat_completion
+from runtime.metrics import metrics
+from nodes.assess_risk import apply_escalation
+from nodes.plan_actions import validate_actions
+from nodes.rules_triage import rules_triage
+from schema import SEVERITY_LEVELS
+from triage.rules import triage_severity
+
+
+FUSED_FORMAT = """{
+  "crisis_type": "<type of medical issue>",
+  "severity_level": "<low|moderate|high|critical>",
+  "assessment": "<brief assessment, 1-2 sentences>",
+  "escalation_required": true/false,
+  "who_to_contact": ["<ambulance|nearby hospital|relative|friend>"],
+  "reason": "<why escalation is or isn't needed>",
+  "immediate_actions": [
+    {
+      "step_id": 1,
+      "title": "<short action title>",
+      "instruction": "<clear instruction>",
+      "duration_seconds": <integer 5-120 OR null>,
+      "user_confirmation_required": true/false,
+      "critical": true/false,
+      "repeatable": true/false
+    }
+  ],
+  "do_not_do": ["<dangerous action to avoid>"],
+  "reassurance_message": "<calm, supportive message>"
+}"""
+
+
+def fused_assessment(state: dict) -> dict:
+    """
+    Produce the full assessment from one LLM call
+    """
+    if state.get("error"):
+        return state
+    
+    normalized_input = state["normalized_input"]
+    
+    response_format = COMPACT_FUSED_FORMAT if COMPACT_WIRE_SCHEMA else FUSED_FORMAT
+    prompt = f"""User input: "{normalized_input}"
+
+Task: If this is clearly NOT about a medical or health situation, respond with {{"crisis_type": "NON_MEDICAL_INPUT"}}.
+Otherwise classify the crisis, decide escalation and plan immediate actions.
+
+Provide response in this EXACT JSON format:
+{response_format}
+
+Rules:
+- critical → escalate, include "ambulance"; high → escalate, include "nearby hospital"
+- 3 to 5 immediate actions, safety first, suitable for untrained civilians
+- NO diagnosis, NO medication advice, NO invasive procedures
+- 2-3 do_not_do items
+- Be conservative - when in doubt, escalate severity"""
+
+    try:
+        response = chat_completion(
+            "fused_assessment",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPTS["crisis_classification"]},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1400
+        )
+        
+        result = expand_response(json.loads(response.content))
+        if result.get("crisis_type") == "NON_MEDICAL_INPUT":
+            state["error"] = "Input is not medical-related. Please describe a medical crisis or health emergency."
+            return state
+        
+        severity = result.get("severity_level", "moderate").lower()
+        actions = result.get("immediate_actions", [])
+        if severity not in SEVERITY_LEVELS or not 1 <= len(actions) <= 7:
+            raise ValueError("fused response failed validation")
+        
+        # Red flags keep at least their rule-based severity (no separate classify call to cross-check)
+        floor = triage_severity(normalized_input)
+        if floor in ("high", "critical") and SEVERITY_LEVELS.index(severity) < SEVERITY_LEVELS.index(floor):
+            severity = floor
+        
+        state["crisis_type"] = result.get("crisis_type", "Unknown")
+        state["severity_level"] = severity
+        state["assessment"] = result.get("assessment", "")
+        state["classification_source"] = "fused"
+        apply_escalation(state, result)
+        state["immediate_actions"] = validate_actions(actions)
+        state["do_not_do"] = result.get("do_not_do", ["Do not delay seeking help"])
+        state["reassurance_message"] = result.get("reassurance_message",
+            "You're taking the right steps by seeking guidance. Stay calm and follow the actions carefully.")
+        metrics.incr("fused_assessment.llm_ok")
+        
+    except Exception as e:
+        # One level further down the ladder rather than an error response
+        print(f"⚠️ Fused assessment failed, using rule-based triage: {e}")
+        metrics.incr("fused_assessment.rules_fallback")
+        state = rules_triage(state)
+    
+    return state
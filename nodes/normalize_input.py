@@ -4,8 +4,17 @@ Cleans and summarizes user input, removes irrelevant text
 """
 
 import json
+import re
 from typing import TypedDict
-from config import get_groq_client, SYSTEM_PROMPTS, APP_CONFIG
+from config import NORMALIZE_GATE_CONFIG
+from prompts import prompt_registry
+from runtime.llm_call import chat_completion
+from runtime.metrics import metrics
+from triage.keywords import is_clearly_medical
+
+
+_CLEAN_CHARS = set(".,'?!-°%/:()")
+_NOISE_PATTERN = re.compile(r"https?://|www\.|@|(.)\1{3,}")
 
 
 class GraphState(TypedDict):
@@ -24,34 +33,65 @@ class GraphState(TypedDict):
     error: str
 
 
+def is_clean_medical_input(text: str) -> bool:
+    """
+    Whether input is short, low-noise and obviously medical, so it can be
+    used as normalized_input without an LLM round trip
+    """
+    cfg = NORMALIZE_GATE_CONFIG
+    text = text.strip()
+    if not text or len(text) > cfg["max_chars"] or len(text.split()) > cfg["max_words"]:
+        return False
+    if len(re.findall(r"[.!?]+(?:\s|$)", text)) > cfg["max_sentences"]:
+        return False
+    if _NOISE_PATTERN.search(text):
+        return False
+    noise = sum(1 for ch in text if not (ch.isalnum() or ch.isspace() or ch in _CLEAN_CHARS))
+    if noise / len(text) > cfg["max_noise_ratio"]:
+        return False
+    return is_clearly_medical(text)
+
+
+def get_normalize_gate_stats() -> dict:
+    """How often the local gate skipped the normalization LLM call"""
+    skipped = metrics.counter("normalize_input.llm_skipped")
+    called = metrics.counter("normalize_input.llm_called")
+    return {
+        "skipped": skipped,
+        "llm_called": called,
+        "skip_rate": metrics.rate("normalize_input.llm_skipped", "normalize_input.llm_called")
+    }
+
+
 def normalize_input(state: GraphState) -> GraphState:
     """
     Normalize and clean user input
     Returns updated state with normalized_input
     """
-    client = get_groq_client()
     user_input = state["user_input"]
     
-    prompt = f"""User input: "{user_input}"
-
-Task: Clean and normalize this input. Extract the core medical concern.
-If this is clearly NOT a medical emergency or health-related input, respond with exactly: NON_MEDICAL_INPUT
-
-Otherwise, provide a clean, concise summary of the medical situation in 1-2 sentences.
-Focus on symptoms, who is affected, and observable facts."""
+    # Short, obviously medical input is already clean - skip the LLM
+    if NORMALIZE_GATE_CONFIG["enabled"] and is_clean_medical_input(user_input):
+        metrics.incr("normalize_input.llm_skipped")
+        state["normalized_input"] = " ".join(user_input.split())
+        state["error"] = ""
+        return state
+    
+    metrics.incr("normalize_input.llm_called")
+    
+    prompt = prompt_registry.get("normalize_input", key=user_input)
 
     try:
-        response = client.chat.completions.create(
-            model=APP_CONFIG["model"],
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPTS["input_normalization"]},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=APP_CONFIG["temperature"],
-            max_tokens=500
+        response = chat_completion(
+            "normalize_input",
+            messages=prompt.messages(user_input=user_input),
+            max_tokens=500,
+            json_mode=False,
+            prompt_version=prompt.version
         )
         
-        normalized = response.choices[0].message.content.strip()
+        normalized = response.content.strip()
+        prompt_registry.record_validity(prompt, bool(normalized))
         
         # Check for non-medical input
         if "NON_MEDICAL_INPUT" in normalized:
@@ -1,36 +1,30 @@
 """
 Decision & Action Planning Node
 Generates immediate actions and things to avoid
+
+With PLAN_TWO_PHASE a short call for the 1-2 most critical steps runs
+alongside the full plan call; its steps are published as soon as they
+arrive (see set_first_actions_callback) and the full plan is merged in
+after them, minus the steps that repeat one of them.
 """
 
+import contextvars
 import json
-from config import get_groq_client, SYSTEM_PROMPTS, APP_CONFIG
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import NEAR_DUPLICATE_CONFIG, COMPACT_WIRE_SCHEMA, PLAN_TWO_PHASE
+from prompts import prompt_registry, VERBOSE_FIELDS_RULE
+from compact_schema import COMPACT_PLAN_FORMAT, COMPACT_FIRST_STEPS_FORMAT, COMPACT_FIELDS_RULE, expand_response
+from runtime.llm_call import chat_completion
+from runtime.assessment_cache import assessment_index
+from runtime.near_duplicate import tokenize, jaccard
+from runtime.metrics import metrics
+from triage.fallback_plans import fallback_plan_for_state
 
 
-def plan_actions(state: dict) -> dict:
-    """
-    Generate step-by-step immediate actions and do_not_do list
-    """
-    if state.get("error"):
-        return state
-    
-    client = get_groq_client()
-    normalized_input = state["normalized_input"]
-    crisis_type = state["crisis_type"]
-    severity = state["severity_level"]
-    escalation_required = state["escalation_required"]
-    
-    prompt = f"""Medical situation: "{normalized_input}"
-Crisis type: {crisis_type}
-Severity: {severity}
-Escalation required: {escalation_required}
-
-Task: Create structured immediate action steps and dangerous actions to avoid.
-
-Provide response in this EXACT JSON format:
-{{
+PLAN_FORMAT = """{
   "immediate_actions": [
-    {{
+    {
       "step_id": 1,
       "title": "<short action title>",
       "instruction": "<clear instruction>",
@@ -38,114 +32,192 @@ Provide response in this EXACT JSON format:
       "user_confirmation_required": true/false,
       "critical": true/false,
       "repeatable": true/false
-    }}
+    }
   ],
   "do_not_do": [
     "<dangerous action to avoid>",
     "<another dangerous action to avoid>"
   ],
   "reassurance_message": "<calm, supportive message>"
-}}
-
-IMMEDIATE ACTIONS REQUIREMENTS:
-- Generate BETWEEN 3 AND 7 steps
-- Each step MUST have ALL fields (step_id, title, instruction, duration_seconds, user_confirmation_required, critical, repeatable)
-- step_id starts at 1 and increments
-- title: 2-5 words, action-oriented
-- instruction: Clear, calm, suitable for untrained civilians
-- duration_seconds: Use null if no timing needed, or realistic values (5-120 seconds) for timed actions
-- user_confirmation_required: false ONLY for urgent actions that can't wait (e.g., calling ambulance)
-- critical: true for life-critical steps (at least one for high/critical severity)
-- repeatable: true for actions like CPR, monitoring, checking breathing
-
-Step ordering:
-1. Safety first (check environment)
-2. Position patient if needed
-3. Call for help (if escalation required)
-4. Immediate interventions (stop bleeding, clear airway, etc.)
-5. Monitoring (breathing, consciousness)
-6. Comfort and reassurance
-
-Safety constraints:
-- NO medical diagnosis
-- NO medication advice
-- NO invasive procedures
-- Assume user is untrained
-
-Guidelines for do_not_do:
-- List 2-4 dangerous actions to avoid
-- Focus on common mistakes people make
-- Be specific
-
-Guidelines for reassurance_message:
-- Calm and supportive tone
-- Acknowledge the situation
-- Encourage rational action
-- 1-2 sentences"""
+}"""
+
+FIRST_STEPS_FORMAT = """{
+  "immediate_actions": [
+    {
+      "step_id": 1,
+      "title": "<short action title>",
+      "instruction": "<clear instruction>",
+      "duration_seconds": <integer 5-120 OR null>,
+      "user_confirmation_required": true/false,
+      "critical": true/false,
+      "repeatable": true/false
+    }
+  ]
+}"""
+
+MAX_FIRST_STEPS = 2
+
+# Full-plan steps this similar to a first step (by title tokens) repeat it
+DUPLICATE_STEP_SIMILARITY = 0.5
+ACTION_SYNONYMS = {
+    "ambulance": "emergency", "911": "emergency", "112": "emergency", "999": "emergency",
+    "paramedics": "emergency", "ems": "emergency", "services": "emergency",
+    "begin": "start", "perform": "start", "do": "start",
+    "compressions": "cpr", "resuscitation": "cpr"
+}
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="first-steps")
+_first_actions_callback = contextvars.ContextVar("first_actions_callback", default=None)
+
+
+def set_first_actions_callback(callback):
+    """
+    Register `callback(actions)` for the current request context; it gets
+    the critical first steps as soon as phase one of planning returns.
+    Returns the token for contextvars reset.
+    """
+    return _first_actions_callback.set(callback)
+
+
+def validate_actions(actions: list) -> list:
+    """Fill in any missing ImmediateAction fields with safe defaults"""
+    validated_actions = []
+    for i, action in enumerate(actions, 1):
+        validated_actions.append({
+            "step_id": action.get("step_id", i),
+            "title": action.get("title", f"Action {i}"),
+            "instruction": action.get("instruction", "Follow medical guidance"),
+            "duration_seconds": action.get("duration_seconds"),
+            "user_confirmation_required": action.get("user_confirmation_required", True),
+            "critical": action.get("critical", False),
+            "repeatable": action.get("repeatable", False)
+        })
+    return validated_actions
+
+
+def _step_tokens(step: dict) -> frozenset:
+    return frozenset(ACTION_SYNONYMS.get(token, token) for token in tokenize(step["title"]))
+
+
+def merge_actions(first_steps: list, plan_steps: list, max_steps: int = 7) -> list:
+    """
+    The first steps keep ids 1..k; full-plan steps follow, renumbered from
+    k + 1, except those that repeat an earlier step ("Call ambulance" and
+    "Call emergency services" are the same step)
+    """
+    merged = [dict(step) for step in first_steps]
+    seen = [_step_tokens(step) for step in merged]
+    for step in plan_steps:
+        if len(merged) >= max_steps:
+            break
+        tokens = _step_tokens(step)
+        if any(jaccard(tokens, other) >= DUPLICATE_STEP_SIMILARITY for other in seen):
+            continue
+        seen.append(tokens)
+        merged.append(dict(step, step_id=len(merged) + 1))
+    return merged
+
+
+def _first_steps(state: dict, callback) -> list:
+    """Phase one: the 1-2 most critical steps from a short LLM call"""
+    start = time.perf_counter()
+    prompt = prompt_registry.get("plan_first_steps", key=state["normalized_input"])
+    response = chat_completion(
+        "plan_first_steps",
+        messages=prompt.messages(
+            normalized_input=state["normalized_input"],
+            crisis_type=state["crisis_type"],
+            severity=state["severity_level"],
+            escalation_required=state["escalation_required"],
+            response_format=COMPACT_FIRST_STEPS_FORMAT if COMPACT_WIRE_SCHEMA else FIRST_STEPS_FORMAT
+        ),
+        max_tokens=300,
+        prompt_version=prompt.version
+    )
+    steps = expand_response(json.loads(response.content)).get("immediate_actions", [])
+    steps = validate_actions(steps[:MAX_FIRST_STEPS])
+    for step_id, step in enumerate(steps, 1):
+        step["step_id"] = step_id
+    prompt_registry.record_validity(prompt, bool(steps))
+    metrics.observe("plan_actions.first_steps_seconds", time.perf_counter() - start)
+    if steps and callback:
+        callback([dict(step) for step in steps])
+    return steps
+
+
+def _collect_first_steps(future) -> list:
+    if future is None:
+        return []
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"⚠️ First-steps call failed: {e}")
+        return []
+
+
+def plan_actions(state: dict) -> dict:
+    """
+    Generate step-by-step immediate actions and do_not_do list
+    """
+    if state.get("error"):
+        return state
+    
+    normalized_input = state["normalized_input"]
+    crisis_type = state["crisis_type"]
+    severity = state["severity_level"]
+    escalation_required = state["escalation_required"]
+    reuse_plan = NEAR_DUPLICATE_CONFIG["enabled"] and NEAR_DUPLICATE_CONFIG["reuse_plan"]
+    
+    # Reuse the plan of a previously assessed paraphrase with the same risk profile
+    if reuse_plan:
+        match = assessment_index.lookup(normalized_input)
+        plan = match[1].get("plan") if match else None
+        if plan and plan["severity_level"] == severity and plan["escalation_required"] == escalation_required:
+            metrics.incr("plan_actions.near_duplicate_hit")
+            state["immediate_actions"] = [dict(action) for action in plan["immediate_actions"]]
+            state["do_not_do"] = list(plan["do_not_do"])
+            state["reassurance_message"] = plan["reassurance_message"]
+            return state
+        metrics.incr("plan_actions.near_duplicate_miss")
+    
+    response_format = COMPACT_PLAN_FORMAT if COMPACT_WIRE_SCHEMA else PLAN_FORMAT
+    fields_rule = COMPACT_FIELDS_RULE if COMPACT_WIRE_SCHEMA else VERBOSE_FIELDS_RULE
+    prompt = prompt_registry.get("plan_actions", key=normalized_input)
+    
+    first_future = None
+    if PLAN_TWO_PHASE:
+        first_future = _executor.submit(
+            contextvars.copy_context().run, _first_steps, dict(state), _first_actions_callback.get()
+        )
+    start = time.perf_counter()
 
     try:
-        response = client.chat.completions.create(
-            model=APP_CONFIG["model"],
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPTS["action_planning"]},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=APP_CONFIG["temperature"],
+        response = chat_completion(
+            "plan_actions",
+            messages=prompt.messages(
+                normalized_input=normalized_input,
+                crisis_type=crisis_type,
+                severity=severity,
+                escalation_required=escalation_required,
+                response_format=response_format,
+                fields_rule=fields_rule
+            ),
             max_tokens=1200,
-            response_format={"type": "json_object"}
+            prompt_version=prompt.version
         )
         
-        result = json.loads(response.choices[0].message.content)
+        result = expand_response(json.loads(response.content))
         
         # Validate and set immediate_actions
         actions = result.get("immediate_actions", [])
         
         # Ensure between 3-7 steps
+        prompt_registry.record_validity(prompt, 3 <= len(actions) <= 7)
         if len(actions) < 3 or len(actions) > 7:
             # Fallback actions if validation fails
-            state["immediate_actions"] = [
-                {
-                    "step_id": 1,
-                    "title": "Ensure safety",
-                    "instruction": "Make sure the environment is safe for both you and the patient.",
-                    "duration_seconds": None,
-                    "user_confirmation_required": True,
-                    "critical": False,
-                    "repeatable": False
-                },
-                {
-                    "step_id": 2,
-                    "title": "Call for help",
-                    "instruction": "Call emergency services immediately and describe the situation.",
-                    "duration_seconds": None,
-                    "user_confirmation_required": False,
-                    "critical": True,
-                    "repeatable": False
-                },
-                {
-                    "step_id": 3,
-                    "title": "Monitor patient",
-                    "instruction": "Stay with the patient and monitor their breathing and consciousness.",
-                    "duration_seconds": 60,
-                    "user_confirmation_required": True,
-                    "critical": True,
-                    "repeatable": True
-                }
-            ]
+            state["immediate_actions"] = fallback_plan_for_state(state).actions()
         else:
-            # Validate each action has required fields
-            validated_actions = []
-            for i, action in enumerate(actions, 1):
-                validated_actions.append({
-                    "step_id": action.get("step_id", i),
-                    "title": action.get("title", f"Action {i}"),
-                    "instruction": action.get("instruction", "Follow medical guidance"),
-                    "duration_seconds": action.get("duration_seconds"),
-                    "user_confirmation_required": action.get("user_confirmation_required", True),
-                    "critical": action.get("critical", False),
-                    "repeatable": action.get("repeatable", False)
-                })
-            state["immediate_actions"] = validated_actions
+            state["immediate_actions"] = validate_actions(actions)
         
         state["do_not_do"] = result.get("do_not_do", [
             "Do not panic or make rushed decisions",
@@ -154,38 +226,31 @@ Guidelines for reassurance_message:
         state["reassurance_message"] = result.get("reassurance_message", 
             "You're taking the right steps by seeking guidance. Stay calm and follow the actions carefully.")
         
+        if first_future is not None:
+            metrics.observe("plan_actions.full_plan_seconds", time.perf_counter() - start)
+            first_steps = _collect_first_steps(first_future)
+            if first_steps:
+                state["immediate_actions"] = merge_actions(first_steps, state["immediate_actions"])
+        
+        # Only plans the model actually produced are worth reusing
+        if reuse_plan and 3 <= len(actions) <= 7:
+            assessment_index.add(normalized_input, plan={
+                "severity_level": severity,
+                "escalation_required": escalation_required,
+                "immediate_actions": [dict(action) for action in state["immediate_actions"]],
+                "do_not_do": list(state["do_not_do"]),
+                "reassurance_message": state["reassurance_message"]
+            })
+        
     except Exception as e:
-        state["error"] = f"Error in action planning: {str(e)}"
-        state["immediate_actions"] = [
-            {
-                "step_id": 1,
-                "title": "Call emergency services",
-                "instruction": "Call emergency services immediately and describe all symptoms.",
-                "duration_seconds": None,
-                "user_confirmation_required": False,
-                "critical": True,
-                "repeatable": False
-            },
-            {
-                "step_id": 2,
-                "title": "Stay with patient",
-                "instruction": "Do not leave the patient alone. Monitor their condition.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": True,
-                "repeatable": False
-            },
-            {
-                "step_id": 3,
-                "title": "Follow dispatcher instructions",
-                "instruction": "Listen carefully to emergency dispatcher and follow their guidance.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": True,
-                "repeatable": False
-            }
-        ]
-        state["do_not_do"] = ["Do not delay seeking professional help"]
-        state["reassurance_message"] = "Please seek immediate medical attention."
+        if isinstance(e, ValueError):
+            prompt_registry.record_validity(prompt, False)
+        fallback_plan_for_state(state).apply(state)
+        # Phase one already gave the critical steps - complete them from the fallback plan
+        first_steps = _collect_first_steps(first_future)
+        if first_steps:
+            state["immediate_actions"] = merge_actions(first_steps, state["immediate_actions"])
+        else:
+            state["error"] = f"Error in action planning: {str(e)}"
     
     return state
@@ -0,0 +1,27 @@
+"""
+Rule-Based Triage Node
+Degraded mode: classification and escalation from keyword rules plus a
+plan from the fallback library - no LLM calls
+"""
+
+from triage.rules import classify_by_rules, evaluate_escalation
+from triage.fallback_plans import fallback_plan_for_state
+from nodes.assess_risk import apply_escalation
+
+
+def rules_triage(state: dict) -> dict:
+    """
+    Classify, assess risk and plan from keyword rules
+    """
+    if state.get("error"):
+        return state
+    
+    normalized_input = state["normalized_input"]
+    state.update(classify_by_rules(normalized_input))
+    state["classification_source"] = "rules"
+    
+    apply_escalation(state, evaluate_escalation(
+        normalized_input, state["severity_level"], state["crisis_type"]
+    ))
+    
+    return fallback_plan_for_state(state).apply(state)
@@ -4,7 +4,30 @@ Re-evaluates crisis after initial steps based on user feedback
 """
 
 import json
-from config import get_groq_client, APP_CONFIG
+from config import COMPACT_WIRE_SCHEMA
+from compact_schema import COMPACT_RECHECK_FORMAT, expand_response
+from runtime.llm_call import chat_completion
+from triage.fallback_plans import get_fallback_plan, crisis_category, RECHECK_MAX_STEPS
+
+
+RECHECK_FORMAT = """{
+  "assessment": "<updated calm explanation>",
+  "immediate_actions": [
+    {
+      "step_id": 1,
+      "title": "<action title>",
+      "instruction": "<clear instruction>",
+      "duration_seconds": <integer OR null>,
+      "user_confirmation_required": true/false,
+      "critical": true/false,
+      "repeatable": true/false
+    }
+  ],
+  "escalation_required": true/false,
+  "who_to_contact": ["contact1", "contact2"],
+  "escalation_reason": "<reason>",
+  "reassurance_message": "<supportive message>"
+}"""
 
 
 def evaluate_worsening(state: dict, user_response: str) -> dict:
@@ -15,7 +38,6 @@ def evaluate_worsening(state: dict, user_response: str) -> dict:
         state: Current graph state with initial assessment
         user_response: "yes" | "no" | "unsure"
     """
-    client = get_groq_client()
     
     original_prompt = state["user_input"]
     previous_severity = state["severity_level"]
@@ -29,21 +51,22 @@ def evaluate_worsening(state: dict, user_response: str) -> dict:
         severity_map = {"low": "moderate", "moderate": "high", "high": "critical", "critical": "critical"}
         new_severity = severity_map.get(previous_severity, "high")
         force_escalation = True
-        max_steps = 5
+        max_steps = RECHECK_MAX_STEPS["yes"]
         
     elif user_response == "unsure":
         action_taken = "reassessed"
         new_severity = previous_severity
         force_escalation = False
-        max_steps = 5
+        max_steps = RECHECK_MAX_STEPS["unsure"]
         
     else:  # "no"
         action_taken = "continued"
         new_severity = previous_severity
         force_escalation = False
-        max_steps = 3
+        max_steps = RECHECK_MAX_STEPS["no"]
     
     # Generate updated assessment and actions
+    response_format = COMPACT_RECHECK_FORMAT if COMPACT_WIRE_SCHEMA else RECHECK_FORMAT
     prompt = f"""Medical situation: "{original_prompt}"
 Previous severity: {previous_severity}
 New severity assessment: {new_severity}
@@ -53,24 +76,7 @@ User reports: Condition has {"WORSENED" if user_response == "yes" else "NOT wors
 Task: Generate updated assessment and immediate actions based on symptom change.
 
 Provide response in this EXACT JSON format:
-{{
-  "assessment": "<updated calm explanation>",
-  "immediate_actions": [
-    {{
-      "step_id": 1,
-      "title": "<action title>",
-      "instruction": "<clear instruction>",
-      "duration_seconds": <integer OR null>,
-      "user_confirmation_required": true/false,
-      "critical": true/false,
-      "repeatable": true/false
-    }}
-  ],
-  "escalation_required": true/false,
-  "who_to_contact": ["contact1", "contact2"],
-  "escalation_reason": "<reason>",
-  "reassurance_message": "<supportive message>"
-}}
+{response_format}
 
 REQUIREMENTS:
 - Generate BETWEEN 3 AND {max_steps} steps maximum
@@ -89,8 +95,8 @@ Severity-specific guidance:
 """
 
     try:
-        response = client.chat.completions.create(
-            model=APP_CONFIG["model"],
+        response = chat_completion(
+            "evaluate_worsening",
             messages=[
                 {
                     "role": "system",
@@ -98,12 +104,10 @@ Severity-specific guidance:
                 },
                 {"role": "user", "content": prompt}
             ],
-            temperature=APP_CONFIG["temperature"],
-            max_tokens=1500,
-            response_format={"type": "json_object"}
+            max_tokens=1500
         )
         
-        result = json.loads(response.choices[0].message.content)
+        result = expand_response(json.loads(response.content))
         
         # Update state
         state["severity_level"] = new_severity
@@ -113,7 +117,7 @@ Severity-specific guidance:
         actions = result.get("immediate_actions", [])
         if len(actions) < 3 or len(actions) > max_steps:
             # Use fallback
-            actions = generate_fallback_actions(new_severity, user_response)
+            actions = generate_fallback_actions(new_severity, user_response, crisis_type)
         else:
             # Validate structure
             validated_actions = []
@@ -158,7 +162,7 @@ Severity-specific guidance:
     except Exception as e:
         # Fallback on error
         state["error"] = f"Error in worsening evaluation: {str(e)}"
-        state["immediate_actions"] = generate_fallback_actions(new_severity, user_response)
+        state["immediate_actions"] = generate_fallback_actions(new_severity, user_response, crisis_type)
         state["severity_level"] = new_severity
         state["escalation_required"] = force_escalation
         state["symptom_recheck"] = {
@@ -172,95 +176,6 @@ Severity-specific guidance:
     return state
 
 
-def generate_fallback_actions(severity: str, user_response: str) -> list:
-    """Generate fallback actions based on severity"""
-    if user_response == "yes":  # Worsened
-        return [
-            {
-                "step_id": 1,
-                "title": "Call emergency services",
-                "instruction": "Call emergency services immediately. The condition has worsened and requires urgent medical evaluation.",
-                "duration_seconds": None,
-                "user_confirmation_required": False,
-                "critical": True,
-                "repeatable": False
-            },
-            {
-                "step_id": 2,
-                "title": "Monitor vital signs",
-                "instruction": "Continue monitoring breathing, consciousness, and any changes in symptoms until help arrives.",
-                "duration_seconds": 60,
-                "user_confirmation_required": True,
-                "critical": True,
-                "repeatable": True
-            },
-            {
-                "step_id": 3,
-                "title": "Stay with patient",
-                "instruction": "Do not leave the patient alone. Be prepared to provide information to emergency responders.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": True,
-                "repeatable": False
-            }
-        ]
-    elif user_response == "unsure":
-        return [
-            {
-                "step_id": 1,
-                "title": "Check vital signs",
-                "instruction": "Check breathing rate, pulse, and level of consciousness carefully.",
-                "duration_seconds": 30,
-                "user_confirmation_required": True,
-                "critical": False,
-                "repeatable": True
-            },
-            {
-                "step_id": 2,
-                "title": "Contact medical advice",
-                "instruction": "Call a medical helpline or your doctor for professional guidance on next steps.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": False,
-                "repeatable": False
-            },
-            {
-                "step_id": 3,
-                "title": "Continue monitoring",
-                "instruction": "Keep watching for any changes and be ready to call emergency services if condition worsens.",
-                "duration_seconds": 120,
-                "user_confirmation_required": True,
-                "critical": False,
-                "repeatable": True
-            }
-        ]
-    else:  # No worsening
-        return [
-            {
-                "step_id": 1,
-                "title": "Continue monitoring",
-                "instruction": "Keep monitoring the situation for any changes over the next few hours.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": False,
-                "repeatable": True
-            },
-            {
-                "step_id": 2,
-                "title": "Follow medical advice",
-                "instruction": "Follow up with healthcare provider as recommended for proper evaluation.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": False,
-                "repeatable": False
-            },
-            {
-                "step_id": 3,
-                "title": "Watch for warning signs",
-                "instruction": "Be alert for any new symptoms or worsening, and seek help immediately if needed.",
-                "duration_seconds": None,
-                "user_confirmation_required": True,
-                "critical": False,
-                "repeatable": True
-            }
-        ]
+def generate_fallback_actions(severity: str, user_response: str, crisis_type: str = "") -> list:
+    """Fallback actions for the recheck answer from the fallback plan library"""
+    return get_fallback_plan(crisis_category(crisis_type), severity, user_response).actions()
@@ -0,0 +1,266 @@
+"""
+Node Prompts
+Registered prompt versions for the graph's LLM nodes.
+
+v1 - the original prompts (system prompts from config.SYSTEM_PROMPTS)
+v2 - boilerplate shared by every node lives once in the system prompt
+     (SHARED_RULES) and node guidance moves from the user message into the
+     node's system prompt, so the per-call user message carries only the
+     situation and the response format
+"""
+
+from config import SYSTEM_PROMPTS, PROMPT_REGISTRY_CONFIG
+from runtime.prompt_registry import PromptRegistry, PromptVersion
+
+
+prompt_registry = PromptRegistry(**PROMPT_REGISTRY_CONFIG)
+
+SYSTEM_KEYS = {
+    "normalize_input": "input_normalization",
+    "classify_crisis": "crisis_classification",
+    "assess_risk": "risk_assessment",
+    "plan_actions": "action_planning"
+}
+
+# v1 plan_actions step rule for the verbose schema; the compact schema swaps in
+# compact_schema.COMPACT_FIELDS_RULE so the prompt never names keys it doesn't want
+VERBOSE_FIELDS_RULE = "- Each step MUST have ALL fields (step_id, title, instruction, duration_seconds, user_confirmation_required, critical, repeatable)"
+
+V1_TEMPLATES = {
+    "normalize_input": """User input: "{user_input}"
+
+Task: Clean and normalize this input. Extract the core medical concern.
+If this is clearly NOT a medical emergency or health-related input, respond with exactly: NON_MEDICAL_INPUT
+
+Otherwise, provide a clean, concise summary of the medical situation in 1-2 sentences.
+Focus on symptoms, who is affected, and observable facts.""",
+
+    "classify_crisis": """Medical situation: "{normalized_input}"
+
+Task: Classify this medical crisis.
+
+Provide your response in this EXACT JSON format:
+{{
+  "crisis_type": "<type of medical issue>",
+  "severity_level": "<low|moderate|high|critical>",
+  "assessment": "<brief calm explanation of what may be happening>"
+}}
+
+Severity Guidelines:
+- LOW: Minor issues, no immediate danger (small cuts, mild headache, minor fever)
+- MODERATE: Concerning symptoms needing attention soon (persistent fever, moderate pain)
+- HIGH: Serious symptoms needing urgent care (severe pain, high fever, persistent vomiting)
+- CRITICAL: Life-threatening, needs immediate emergency (chest pain, difficulty breathing, unconsciousness, severe bleeding)
+
+Be conservative - when in doubt, increase severity level.
+The assessment should be calm, non-alarming, and helpful.""",
+
+    "assess_risk": """Medical situation: "{normalized_input}"
+Crisis type: {crisis_type}
+Current severity: {severity}
+
+Task: Assess if this situation requires emergency escalation.
+
+Red-flag symptoms requiring immediate escalation:
+- Chest pain with sweating, nausea, or shortness of breath
+- Difficulty breathing or choking
+- Unconsciousness or unresponsiveness
+- Severe bleeding that won't stop
+- Stroke symptoms (facial drooping, arm weakness, speech difficulty)
+- Severe allergic reactions (swelling, difficulty breathing)
+- Seizures
+- Suspected poisoning or overdose
+- Severe head injury
+
+Provide response in this EXACT JSON format:
+{{
+  "escalation_required": true/false,
+  "who_to_contact": ["contact1", "contact2"],
+  "reason": "<why escalation is or isn't needed>"
+}}
+
+Contact types to choose from:
+- "ambulance" (for critical emergencies)
+- "nearby hospital" (for high urgency)
+- "relative" (for moderate support)
+- "friend" (for moderate support)
+
+Rules:
+- If severity is "critical" → escalation_required: true, include "ambulance"
+- If severity is "high" → escalation_required: true, include "nearby hospital"
+- If severity is "moderate" → escalation_required: false or true (based on symptoms), include "relative" or "friend"
+- If severity is "low" → escalation_required: false
+
+Be conservative - prioritize safety.""",
+
+    "plan_actions": """Medical situation: "{normalized_input}"
+Crisis type: {crisis_type}
+Severity: {severity}
+Escalation required: {escalation_required}
+
+Task: Create structured immediate action steps and dangerous actions to avoid.
+
+Provide response in this EXACT JSON format:
+{response_format}
+
+IMMEDIATE ACTIONS REQUIREMENTS:
+- Generate BETWEEN 3 AND 7 steps
+{fields_rule}
+- step_id starts at 1 and increments
+- title: 2-5 words, action-oriented
+- instruction: Clear, calm, suitable for untrained civilians
+- duration_seconds: Use null if no timing needed, or realistic values (5-120 seconds) for timed actions
+- user_confirmation_required: false ONLY for urgent actions that can't wait (e.g., calling ambulance)
+- critical: true for life-critical steps (at least one for high/critical severity)
+- repeatable: true for actions like CPR, monitoring, checking breathing
+
+Step ordering:
+1. Safety first (check environment)
+2. Position patient if needed
+3. Call for help (if escalation required)
+4. Immediate interventions (stop bleeding, clear airway, etc.)
+5. Monitoring (breathing, consciousness)
+6. Comfort and reassurance
+
+Safety constraints:
+- NO medical diagnosis
+- NO medication advice
+- NO invasive procedures
+- Assume user is untrained
+
+Guidelines for do_not_do:
+- List 2-4 dangerous actions to avoid
+- Focus on common mistakes people make
+- Be specific
+
+Guidelines for reassurance_message:
+- Calm and supportive tone
+- Acknowledge the situation
+- Encourage rational action
+- 1-2 sentences"""
+}
+
+SHARED_RULES = """
+Rules for every response:
+- Be conservative: when in doubt, escalate severity and prioritize safety
+- NO medical diagnosis, NO medication advice or drug dosages, NO invasive procedures
+- Assume the person helping is untrained; keep a calm, supportive tone
+- When a JSON format is given, follow it exactly
+"""
+
+V2_SYSTEM = {
+    "normalize_input": """You are a medical crisis input processor.
+Summarize the medical situation in 1-2 clean sentences: symptoms, who is
+affected, and observable facts. Remove irrelevant information.
+If the input is clearly NOT medical or health-related, reply exactly: NON_MEDICAL_INPUT
+""",
+
+    "classify_crisis": """You are a medical crisis classifier.
+Identify the type of medical crisis (e.g., cardiac, respiratory, trauma) and its severity.
+
+Severity Guidelines:
+- LOW: Minor issues, no immediate danger (small cuts, mild headache, minor fever)
+- MODERATE: Concerning symptoms needing attention soon (persistent fever, moderate pain)
+- HIGH: Serious symptoms needing urgent care (severe pain, high fever, persistent vomiting)
+- CRITICAL: Life-threatening, needs immediate emergency (chest pain, difficulty breathing, unconsciousness, severe bleeding)
+
+The assessment should be calm, non-alarming, and helpful.
+""",
+
+    "assess_risk": """You are a medical safety risk assessor.
+Decide whether the situation requires emergency escalation.
+
+Red-flag symptoms requiring immediate escalation:
+- Chest pain with sweating, nausea, or shortness of breath
+- Difficulty breathing or choking
+- Unconsciousness or unresponsiveness
+- Severe bleeding that won't stop
+- Stroke symptoms (facial drooping, arm weakness, speech difficulty)
+- Severe allergic reactions (swelling, difficulty breathing)
+- Seizures
+- Suspected poisoning or overdose
+- Severe head injury
+
+Contact types: "ambulance" (critical emergencies), "nearby hospital" (high urgency),
+"relative" or "friend" (moderate support)
+
+Rules:
+- critical → escalation_required: true, include "ambulance"
+- high → escalation_required: true, include "nearby hospital"
+- moderate → escalation based on symptoms, include "relative" or "friend"
+- low → escalation_required: false
+""",
+
+    "plan_actions": """You are a medical crisis action planner.
+Create step-by-step immediate actions and dangerous actions to avoid (do_not_do).
+
+Immediate actions:
+- BETWEEN 3 AND 7 steps, each with every field of the response format; step ids start at 1 and increment
+- title: 2-5 words, action-oriented; instruction: clear and calm
+- duration_seconds: null if no timing needed, otherwise 5-120
+- user_confirmation_required: false ONLY for urgent actions that can't wait (e.g., calling ambulance)
+- critical: true for life-critical steps (at least one for high/critical severity)
+- repeatable: true for actions like CPR, monitoring, checking breathing
+- Order: safety, positioning, call for help (if escalation required), immediate
+  interventions, monitoring, comfort
+
+do_not_do: 2-4 specific, common dangerous mistakes
+reassurance_message: 1-2 calm sentences that acknowledge the situation and encourage rational action
+"""
+}
+
+V2_TEMPLATES = {
+    "normalize_input": """User input: "{user_input}\"""",
+
+    "classify_crisis": """Medical situation: "{normalized_input}"
+
+Classify this medical crisis. Respond in this EXACT JSON format:
+{{
+  "crisis_type": "<type of medical issue>",
+  "severity_level": "<low|moderate|high|critical>",
+  "assessment": "<brief calm explanation of what may be happening>"
+}}""",
+
+    "assess_risk": """Medical situation: "{normalized_input}"
+Crisis type: {crisis_type}
+Current severity: {severity}
+
+Respond in this EXACT JSON format:
+{{
+  "escalation_required": true/false,
+  "who_to_contact": ["contact1", "contact2"],
+  "reason": "<why escalation is or isn't needed>"
+}}""",
+
+    "plan_actions": """Medical situation: "{normalized_input}"
+Crisis type: {crisis_type}
+Severity: {severity}
+Escalation required: {escalation_required}
+
+Respond in this EXACT JSON format:
+{response_format}"""
+}
+
+
+# Phase one of two-phase planning (PLAN_TWO_PHASE) - single version
+FIRST_STEPS_SYSTEM = """You are a medical crisis action planner.
+Give ONLY the 1-2 most critical first steps - what to do in the next minute.
+Each step has every field of the response format; step ids start at 1. critical: true for life-critical steps.
+user_confirmation_required: false ONLY for urgent actions that can't wait (e.g., calling ambulance).
+"""
+
+FIRST_STEPS_TEMPLATE = """Medical situation: "{normalized_input}"
+Crisis type: {crisis_type}
+Severity: {severity}
+Escalation required: {escalation_required}
+
+Respond in this EXACT JSON format:
+{response_format}"""
+
+
+for _node, _template in V1_TEMPLATES.items():
+    prompt_registry.register(PromptVersion(_node, "v1", SYSTEM_PROMPTS[SYSTEM_KEYS[_node]], _template))
+for _node, _template in V2_TEMPLATES.items():
+    prompt_registry.register(PromptVersion(_node, "v2", V2_SYSTEM[_node] + SHARED_RULES, _template))
+prompt_registry.register(PromptVersion("plan_first_steps", "v1", FIRST_STEPS_SYSTEM + SHARED_RULES,
+                                       FIRST_STEPS_TEMPLATE))
@@ -1,5 +1,9 @@
 """
 Quick validation script - Tests key scenarios
+
+Offline, deterministic runs use the LLM cassette:
+    LLM_CASSETTE_MODE=record python quick_test.py   # once, with GROQ_API_KEY
+    LLM_CASSETTE_MODE=replay python quick_test.py   # no network, same responses
 """
 
 import json
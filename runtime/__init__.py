@@ -0,0 +1,28 @@
+"""
+Runtime package for Crisis Decision Assistant
+Latency tracking and model routing shared by the LLM call path.
+The call path itself lives in runtime.llm_call (it needs the Groq config).
+"""
+
+from .latency import RollingLatency
+from .model_policy import ModelFallbackPolicy
+from .metrics import MetricsRegistry, metrics
+from .hedging import RequestHedger
+from .cassette import Cassette, CassetteMiss
+from .load_shedding import LoadShedder, LoadShedError, DEGRADATION_LEVELS
+from .scheduler import PriorityScheduler, PRIORITY_CLASSES
+
+__all__ = [
+    'RollingLatency',
+    'ModelFallbackPolicy',
+    'MetricsRegistry',
+    'metrics',
+    'RequestHedger',
+    'Cassette',
+    'CassetteMiss',
+    'LoadShedder',
+    'LoadShedError',
+    'DEGRADATION_LEVELS',
+    'PriorityScheduler',
+    'PRIORITY_CLASSES'
+]
@@ -0,0 +1,16 @@
+"""
+Shared Assessment Index
+Near-duplicate index of previously assessed inputs, configured from config.py
+"""
+
+from config import NEAR_DUPLICATE_CONFIG
+from runtime.near_duplicate import NearDuplicateIndex
+
+
+assessment_index = NearDuplicateIndex(
+    threshold=NEAR_DUPLICATE_CONFIG["threshold"],
+    num_perm=NEAR_DUPLICATE_CONFIG["num_perm"],
+    bands=NEAR_DUPLICATE_CONFIG["bands"],
+    max_entries=NEAR_DUPLICATE_CONFIG["max_entries"],
+    ttl_seconds=NEAR_DUPLICATE_CONFIG["ttl_seconds"]
+)
@@ -0,0 +1,104 @@
+"""
+LLM Record/Replay Cassette
+Captures prompt/response pairs (with usage and observed latency) to a
+compact JSONL store and serves them back for offline, deterministic runs.
+
+Modes (LLM_CASSETTE_MODE):
+- off:    call the API normally
+- record: call the API and append every response to the cassette
+- replay: never call the API; unknown requests raise CassetteMiss
+
+AMUHACKS/llm/cassette.py is a deliberate copy for the financial app,
+which runs from its own directory with its own `config` package and so
+cannot import this one. The line format is the same; the differences are
+that keys here include the graph node (every node goes through
+chat_completion) and the copy's replay() can leave the latency sleep to
+async callers. Keep fixes to the shared parts in sync.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class CassetteMiss(LookupError):
+    """Replay mode found no recorded response for a request"""
+
+
+def request_key(node: str, messages: list, **params) -> str:
+    """Stable hash of everything that determines a response except the model"""
+    payload = json.dumps({"node": node, "messages": messages, "params": params},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """
+    Append-only store of recorded responses keyed by request hash
+
+    Identical requests recorded several times are replayed in recording
+    order, cycling, so repeated runs see the same sequence.
+    """
+
+    def __init__(self, path: str, mode: str = "off", replay_latency: bool = False):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._entries = {}
+        self._cursor = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self._load()
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found for replay: {self.path}")
+        with self._open("r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["k"], []).append(entry)
+
+    def record(self, key: str, node: str, content: str, model: str,
+               latency_seconds: float, usage: dict) -> None:
+        entry = {
+            "k": key,
+            "n": node,
+            "m": model,
+            "c": content,
+            "l": round(latency_seconds, 4),
+            "u": usage
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._open("a") as f:
+                f.write(line + "\n")
+
+    def replay(self, key: str) -> dict:
+        """
+        Recorded entry for `key` (keys: m=model, c=content, l=latency, u=usage);
+        sleeps for the recorded latency when replay_latency is set
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for request {key}")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            entry = entries[index % len(entries)]
+        if self.replay_latency:
+            time.sleep(entry["l"])
+        return entry
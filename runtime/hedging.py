@@ -0,0 +1,101 @@
+"""
+Hedged Requests
+Issues a duplicate LLM request when the first one is slower than a
+percentile of the node's historical latency, and takes whichever valid
+response arrives first. The share of hedged calls is capped.
+"""
+
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from runtime.latency import RollingLatency
+from runtime.metrics import metrics
+
+
+class RequestHedger:
+    """Per-node latency history plus a bounded hedging budget"""
+
+    def __init__(self, percentile: float = 90, min_samples: int = 20,
+                 max_hedge_rate: float = 0.1, rate_window: int = 200,
+                 window_size: int = 200, max_workers: int = 16):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_hedge_rate = max_hedge_rate
+        self.window_size = window_size
+        self._latencies = {}
+        self._decisions = deque(maxlen=rate_window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def record(self, node: str, latency_seconds: float) -> None:
+        with self._lock:
+            if node not in self._latencies:
+                self._latencies[node] = RollingLatency(self.window_size)
+            window = self._latencies[node]
+        window.record(latency_seconds)
+
+    def delay_for(self, node: str):
+        """Seconds to wait before hedging, or None while history is too short"""
+        with self._lock:
+            window = self._latencies.get(node)
+        if window is None or len(window) < self.min_samples:
+            return None
+        return window.percentile(self.percentile)
+
+    def _decide(self, want_hedge: bool) -> bool:
+        """Record this call's hedging decision; hedge only within the budget"""
+        with self._lock:
+            allowed = want_hedge and (
+                sum(self._decisions) + 1 <= self.max_hedge_rate * (len(self._decisions) + 1)
+            )
+            self._decisions.append(allowed)
+            return allowed
+
+    def hedge_rate(self) -> float:
+        with self._lock:
+            return sum(self._decisions) / len(self._decisions) if self._decisions else 0.0
+
+    def run(self, node: str, call, is_valid=None):
+        """
+        Run `call()`; if it is still pending after the node's hedge delay and
+        the budget allows, race a duplicate and return the first valid result
+
+        The losing request cannot be aborted mid-flight (the Groq client is
+        blocking); it is cancelled if not yet started, otherwise its result
+        is discarded.
+        """
+        delay = self.delay_for(node)
+        if delay is None:
+            self._decide(False)
+            return call()
+
+        first = self._executor.submit(contextvars.copy_context().run, call)
+        done, _ = wait([first], timeout=delay)
+        if not self._decide(not done):
+            return first.result()
+
+        metrics.incr(f"hedging.{node}.hedged")
+        second = self._executor.submit(contextvars.copy_context().run, call)
+        pending = {first, second}
+        invalid, errors = [], []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if is_valid is not None and not is_valid(result):
+                    invalid.append(result)
+                    continue
+                for other in pending:
+                    other.cancel()
+                metrics.incr(f"hedging.{node}.{'hedge' if future is second else 'original'}_won")
+                return result
+        # Neither response was valid - hand back what we have and let the node handle it
+        if invalid:
+            return invalid[0]
+        raise errors[0]
@@ -0,0 +1,37 @@
+"""
+Rolling Latency Windows
+Thread-safe bounded samples of observed call latencies
+"""
+
+import math
+import threading
+from collections import deque
+
+
+class RollingLatency:
+    """Bounded window of the most recent latency samples (seconds)"""
+
+    def __init__(self, window_size: int = 50):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, p: float):
+        """Nearest-rank percentile (0-100), or None when no samples exist"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
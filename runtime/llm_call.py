@@ -0,0 +1,207 @@
+"""
+Shared LLM Call Path
+Single entry point used by the nodes to call Groq. Applies the
+latency-driven model fallback policy and optional request hedging,
+records/replays responses through the cassette, and reports the chosen
+model per call in the Langfuse trace.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+
+from langfuse.decorators import observe, langfuse_context
+
+from config import (
+    get_groq_client, APP_CONFIG, MODEL_FALLBACK_CONFIG, HEDGING_CONFIG, LLM_CASSETTE_CONFIG
+)
+from runtime.cassette import Cassette, request_key
+from runtime.hedging import RequestHedger
+from runtime.metrics import metrics
+from runtime.model_policy import ModelFallbackPolicy
+
+
+model_policy = ModelFallbackPolicy(
+    primary_model=APP_CONFIG["model"],
+    fallback_model=MODEL_FALLBACK_CONFIG["fallback_model"],
+    p95_threshold_seconds=MODEL_FALLBACK_CONFIG["p95_threshold_seconds"],
+    window_size=MODEL_FALLBACK_CONFIG["window_size"],
+    min_samples=MODEL_FALLBACK_CONFIG["min_samples"],
+    cooldown_seconds=MODEL_FALLBACK_CONFIG["cooldown_seconds"]
+)
+
+hedger = RequestHedger(
+    percentile=HEDGING_CONFIG["percentile"],
+    min_samples=HEDGING_CONFIG["min_samples"],
+    max_hedge_rate=HEDGING_CONFIG["max_hedge_rate"],
+    rate_window=HEDGING_CONFIG["rate_window"]
+)
+
+cassette = Cassette(
+    LLM_CASSETTE_CONFIG["path"],
+    mode=LLM_CASSETTE_CONFIG["mode"],
+    replay_latency=LLM_CASSETTE_CONFIG["replay_latency"]
+)
+
+_client = None
+
+
+@dataclass
+class LLMResult:
+    """Outcome of a single chat completion"""
+    content: str
+    model: str
+    latency_seconds: float
+    usage: dict = field(default_factory=dict)
+    fallback_used: bool = False
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = get_groq_client()
+    return _client
+
+
+def _create(model: str, messages: list, max_tokens: int, temperature: float, json_mode: bool):
+    kwargs = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    return _get_client().chat.completions.create(**kwargs)
+
+
+def _is_valid_json(response) -> bool:
+    try:
+        json.loads(response.choices[0].message.content)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _send(node: str, model: str, messages: list, max_tokens: int, temperature: float, json_mode: bool):
+    if not HEDGING_CONFIG["enabled"]:
+        return _create(model, messages, max_tokens, temperature, json_mode)
+    return hedger.run(
+        node,
+        lambda: _create(model, messages, max_tokens, temperature, json_mode),
+        _is_valid_json if json_mode else None
+    )
+
+
+def _usage(response) -> dict:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
+
+
+def _complete(node: str, messages: list, max_tokens: int,
+              json_mode: bool, temperature: float) -> LLMResult:
+    """Call Groq under the fallback policy (and hedging, when enabled)"""
+    enabled = MODEL_FALLBACK_CONFIG["enabled"]
+    primary = model_policy.primary_for(node) if enabled else APP_CONFIG["model"]
+    model = model_policy.choose(node) if enabled else primary
+
+    start = time.monotonic()
+    try:
+        response = _send(node, model, messages, max_tokens, temperature, json_mode)
+    except Exception:
+        if enabled:
+            model_policy.record(node, model, time.monotonic() - start, ok=False)
+        if not enabled or model == model_policy.fallback_model:
+            raise
+        # Transparently retry the same request on the fallback model
+        model = model_policy.fallback_model
+        start = time.monotonic()
+        try:
+            response = _send(node, model, messages, max_tokens, temperature, json_mode)
+        except Exception:
+            model_policy.record(node, model, time.monotonic() - start, ok=False)
+            raise
+    latency = time.monotonic() - start
+    if enabled:
+        model_policy.record(node, model, latency)
+    hedger.record(node, latency)
+
+    return LLMResult(
+        content=response.choices[0].message.content,
+        model=model,
+        latency_seconds=latency,
+        usage=_usage(response),
+        fallback_used=model != primary
+    )
+
+
+@observe(as_type="generation")
+def chat_completion(node: str, messages: list, max_tokens: int,
+                    json_mode: bool = True, temperature: float = None,
+                    prompt_version: str = None) -> LLMResult:
+    """
+    Run a chat completion for `node`, falling back to the faster model
+    when the policy has tripped or the primary model errors
+
+    In cassette replay mode the recorded response is returned instead.
+    prompt_version (from the prompt registry) adds per-version accounting.
+    Raises the underlying exception if the last model tried also fails.
+    """
+    if temperature is None:
+        temperature = APP_CONFIG["temperature"]
+
+    key = None
+    if cassette.mode != "off":
+        key = request_key(node, messages, max_tokens=max_tokens,
+                          json_mode=json_mode, temperature=temperature)
+    if cassette.mode == "replay":
+        entry = cassette.replay(key)
+        result = LLMResult(
+            content=entry["c"],
+            model=entry["m"],
+            latency_seconds=entry["l"],
+            usage=entry["u"],
+            fallback_used=entry["m"] != model_policy.primary_for(node)
+        )
+    else:
+        result = _complete(node, messages, max_tokens, json_mode, temperature)
+        if cassette.mode == "record":
+            cassette.record(key, node, result.content, result.model,
+                            result.latency_seconds, result.usage)
+
+    # Per-node accounting: llm.<node>.latency_seconds / prompt_tokens / completion_tokens
+    metrics.observe(f"llm.{node}.latency_seconds", result.latency_seconds)
+    for name in ("prompt_tokens", "completion_tokens"):
+        if result.usage and result.usage.get(name) is not None:
+            metrics.observe(f"llm.{node}.{name}", result.usage[name])
+    if prompt_version:
+        prefix = f"prompt.{node}.{prompt_version}"
+        metrics.incr(f"{prefix}.calls")
+        metrics.observe(f"{prefix}.latency_seconds", result.latency_seconds)
+        for name in ("prompt_tokens", "completion_tokens"):
+            if result.usage and result.usage.get(name) is not None:
+                metrics.observe(f"{prefix}.{name}", result.usage[name])
+
+    primary = model_policy.primary_for(node)
+    langfuse_context.update_current_observation(
+        name=f"llm:{node}",
+        model=result.model,
+        usage=result.usage or None,
+        metadata={
+            "node": node,
+            "model_selected": result.model,
+            "primary_model": primary,
+            "fallback_used": result.fallback_used,
+            "latency_seconds": round(result.latency_seconds, 3),
+            "primary_p95_seconds": model_policy.p95(node, primary),
+            "prompt_version": prompt_version,
+            "cassette": cassette.mode
+        }
+    )
+    return result
@@ -0,0 +1,130 @@
+"""
+Load Shedding
+Degradation ladder for overload: full graph -> fused single LLM call ->
+rule-based triage -> fast 503 rejection of low-severity requests.
+Requests with red-flag symptoms are never rejected.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from runtime.latency import RollingLatency
+from runtime.metrics import metrics
+
+DEGRADATION_LEVELS = ["full", "fused", "rules", "reject"]
+
+
+class LoadShedError(RuntimeError):
+    """Request rejected under overload - maps to HTTP 503"""
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LoadShedder:
+    """
+    Picks a degradation level from the number of in-flight requests and
+    the p95 end-to-end latency of full-graph requests
+
+    Latency degradation uses the same cooldown/probe cycle as
+    ModelFallbackPolicy: once cooldown_seconds pass the full-graph window
+    is cleared so traffic can probe the full graph again.
+    """
+
+    def __init__(self, max_inflight: dict, p95_threshold_seconds: dict, window_size: int = 50,
+                 min_samples: int = 10, cooldown_seconds: float = 30, retry_after_seconds: int = 5,
+                 enabled: bool = True):
+        self.max_inflight = max_inflight
+        self.p95_threshold_seconds = p95_threshold_seconds
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.enabled = enabled
+        self._full_latency = RollingLatency(window_size)
+        self._inflight = 0
+        self._degraded_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def inflight(self) -> int:
+        with self._lock:
+            return self._inflight
+
+    def _latency_level(self) -> int:
+        if len(self._full_latency) < self.min_samples:
+            return 0
+        if time.monotonic() >= self._degraded_until > 0:
+            # Cooldown over - let full-graph traffic probe again
+            self._full_latency.clear()
+            self._degraded_until = 0.0
+            return 0
+        p95 = self._full_latency.percentile(95)
+        level = 0
+        for index, name in enumerate(DEGRADATION_LEVELS):
+            threshold = self.p95_threshold_seconds.get(name)
+            if threshold is not None and p95 > threshold:
+                level = index
+        if level and not self._degraded_until:
+            self._degraded_until = time.monotonic() + self.cooldown_seconds
+        return level
+
+    def level(self) -> str:
+        """Current degradation level name"""
+        if not self.enabled:
+            return "full"
+        with self._lock:
+            inflight = self._inflight
+            level = self._latency_level()
+        for index, name in enumerate(DEGRADATION_LEVELS):
+            threshold = self.max_inflight.get(name)
+            if threshold is not None and inflight >= threshold:
+                level = max(level, index)
+        return DEGRADATION_LEVELS[level]
+
+    def mode_for(self, red_flag: bool, severity: str) -> str:
+        """
+        Serving mode for a request given its keyword pre-triage;
+        raises LoadShedError for low-severity requests at the reject level
+        """
+        level = self.level()
+        if level != "reject":
+            return level
+        if red_flag or severity != "low":
+            return "rules"
+        metrics.incr("load_shedding.rejected")
+        raise LoadShedError(
+            "Service is overloaded - please retry shortly. "
+            "If this is an emergency, call your local emergency number now.",
+            retry_after=self.retry_after_seconds
+        )
+
+    @contextmanager
+    def admit(self, red_flag: bool, severity: str):
+        """Yield the serving mode while counting the request as in flight"""
+        mode = self.mode_for(red_flag, severity)
+        metrics.incr(f"load_shedding.mode.{mode}")
+        with self._lock:
+            self._inflight += 1
+        start = time.perf_counter()
+        try:
+            yield mode
+        finally:
+            with self._lock:
+                self._inflight -= 1
+                if mode == "full":
+                    self._full_latency.record(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        return {
+            "level": self.level(),
+            "inflight": self.inflight,
+            "full_p95_seconds": self._full_latency.percentile(95),
+            "rejected": metrics.counter("load_shedding.rejected"),
+            "modes": {
+                name: metrics.counter(f"load_shedding.mode.{name}") for name in DEGRADATION_LEVELS[:3]
+            }
+        }
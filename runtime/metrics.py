@@ -0,0 +1,67 @@
+"""
+In-Process Metrics Registry
+Thread-safe counters and value distributions for the runtime paths
+"""
+
+import threading
+
+from runtime.latency import RollingLatency
+
+
+class MetricsRegistry:
+    """Named counters and bounded value distributions"""
+
+    def __init__(self, window_size: int = 1000):
+        self.window_size = window_size
+        self._counters = {}
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = RollingLatency(self.window_size)
+            window = self._values[name]
+        window.record(value)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def rate(self, name: str, *names: str) -> float:
+        """Share of `name` among the counters `name` + `names`"""
+        total = self.counter(name) + sum(self.counter(n) for n in names)
+        return self.counter(name) / total if total else 0.0
+
+    def percentile(self, name: str, p: float):
+        with self._lock:
+            window = self._values.get(name)
+        return window.percentile(p) if window else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._values)
+        return {
+            "counters": counters,
+            "distributions": {
+                name: {
+                    "count": len(self._values[name]),
+                    "p50": self.percentile(name, 50),
+                    "p95": self.percentile(name, 95)
+                }
+                for name in names
+            }
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._values.clear()
+
+
+metrics = MetricsRegistry()
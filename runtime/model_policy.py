@@ -0,0 +1,103 @@
+"""
+Latency-Driven Model Fallback Policy
+Tracks rolling p95 latency per (node, model) and routes a node to its fallback
+model while its primary model is slow or failing
+"""
+
+import threading
+import time
+
+from runtime.latency import RollingLatency
+
+
+class ModelFallbackPolicy:
+    """
+    Per-node routing between a primary and a faster fallback model
+
+    A node is switched to its fallback when the primary's rolling p95 exceeds
+    the node's threshold or a primary call errors. After `cooldown_seconds`
+    the primary is probed again; a single slow or failed probe trips the
+    route straight back to the fallback.
+    """
+
+    def __init__(self, primary_model: str, fallback_model: str,
+                 p95_threshold_seconds: dict, window_size: int = 50,
+                 min_samples: int = 5, cooldown_seconds: float = 60.0,
+                 node_models: dict = None):
+        self.primary_model = primary_model
+        self.fallback_model = fallback_model
+        self.thresholds = p95_threshold_seconds
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        self.node_models = node_models or {}
+        self._latencies = {}
+        self._degraded_until = {}
+        self._probing = set()
+        self._lock = threading.Lock()
+
+    def primary_for(self, node: str) -> str:
+        return self.node_models.get(node, self.primary_model)
+
+    def threshold_for(self, node: str) -> float:
+        return self.thresholds.get(node, self.thresholds["default"])
+
+    def window(self, node: str, model: str) -> RollingLatency:
+        """Latency window of one node on one model - slow nodes don't skew fast ones"""
+        key = (node, model)
+        with self._lock:
+            if key not in self._latencies:
+                self._latencies[key] = RollingLatency(self.window_size)
+            return self._latencies[key]
+
+    def p95(self, node: str, model: str):
+        return self.window(node, model).percentile(95)
+
+    def choose(self, node: str) -> str:
+        """Model to use for the next call made by `node`"""
+        primary = self.primary_for(node)
+        with self._lock:
+            until = self._degraded_until.get(node)
+            if until is None:
+                return primary
+            if time.monotonic() < until:
+                return self.fallback_model
+            # Cooldown elapsed - let the next call probe the primary
+            del self._degraded_until[node]
+            self._probing.add(node)
+            return primary
+
+    def record(self, node: str, model: str, latency_seconds: float, ok: bool = True) -> None:
+        """Record the outcome of a call and trip the node's route if needed"""
+        window = self.window(node, model)
+        if model != self.primary_for(node):
+            if ok:
+                window.record(latency_seconds)
+            return
+
+        threshold = self.threshold_for(node)
+        with self._lock:
+            probing = node in self._probing
+            self._probing.discard(node)
+        if probing:
+            # A probe starts a fresh window - samples from before the trip are stale
+            window.clear()
+        if ok:
+            window.record(latency_seconds)
+        if not ok or (probing and latency_seconds > threshold):
+            self._trip(node, window)
+            return
+        p95 = window.percentile(95)
+        if len(window) >= self.min_samples and p95 is not None and p95 > threshold:
+            self._trip(node, window)
+
+    def is_degraded(self, node: str) -> bool:
+        with self._lock:
+            until = self._degraded_until.get(node)
+        return until is not None and time.monotonic() < until
+
+    def _trip(self, node: str, window: RollingLatency) -> None:
+        # Stale slow samples would otherwise keep the primary tripped forever
+        window.clear()
+        with self._lock:
+            self._degraded_until[node] = time.monotonic() + self.cooldown_seconds
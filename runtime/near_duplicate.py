@@ -0,0 +1,195 @@
+"""
+Near-Duplicate Input Index
+MinHash + LSH banding over normalized inputs so paraphrased descriptions
+of the same situation can reuse a previous assessment
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "is", "are", "was", "were", "be", "been", "am",
+    "has", "have", "having", "had", "my", "his", "her", "their", "our", "i", "he",
+    "she", "they", "we", "it", "this", "that", "of", "to", "in", "on", "at", "for",
+    "with", "from", "after", "very", "lot", "lots", "really", "so", "just", "now",
+    "some", "much", "being", "getting", "got", "seems", "also", "s"
+}
+
+# A paraphrase must agree on these, "sweating" and "not sweating" are not duplicates
+NEGATIONS = {"not", "no", "without", "never", "can't", "cannot", "won't", "isn't", "doesn't", "didn't"}
+
+# ...and on these, "mild bleeding" and "heavy bleeding" call for different plans
+SEVERITY_MODIFIERS = {
+    "mild", "slight", "slightly", "minor", "small", "little", "light", "moderate",
+    "severe", "serious", "heavy", "heavily", "major", "bad", "badly", "extreme",
+    "intense", "massive", "deep", "huge", "worst"
+}
+
+GUARD_WORDS = NEGATIONS | SEVERITY_MODIFIERS
+
+# Collapse common paraphrases onto one token
+SYNONYMS = {
+    "dad": "father", "papa": "father", "mom": "mother", "mum": "mother", "mama": "mother",
+    "kid": "child", "son": "child", "daughter": "child", "baby": "child", "toddler": "child",
+    "grandma": "grandmother", "grandpa": "grandfather",
+    "sweaty": "sweat", "sweats": "sweat", "sweating": "sweat",
+    "breath": "breathe", "breathing": "breathe",
+    "bleed": "bleeding", "bleeds": "bleeding", "blood": "bleeding",
+    "unresponsive": "unconscious", "collapsed": "unconscious", "fainted": "faint",
+    "vomit": "vomiting", "throwing": "vomiting", "puking": "vomiting"
+}
+
+
+def tokenize(text: str) -> frozenset:
+    """Stopword-free, synonym-collapsed token set of a normalized input"""
+    tokens = set()
+    for word in re.findall(r"[a-z0-9']+", text.lower()):
+        word = word.strip("'")
+        word = SYNONYMS.get(word, word)
+        if word and word not in STOPWORDS:
+            tokens.add(word)
+    return frozenset(tokens)
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "big")
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    Bounded LRU index of previously assessed inputs
+
+    Candidates come from LSH buckets over MinHash signatures; a candidate
+    is returned only if it has the same negations and severity modifiers
+    (GUARD_WORDS) and its exact token Jaccard similarity is at least
+    `threshold`. Entries expire after `ttl_seconds` and the least recently
+    used entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 32, bands: int = 8,
+                 max_entries: int = 10000, ttl_seconds: float = 3600, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._perms = [self._perm(seed, i) for i in range(num_perm)]
+        self._entries = OrderedDict()
+        self._buckets = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _perm(seed: int, i: int):
+        digest = hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % _MERSENNE_PRIME or 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+        return a, b
+
+    def signature(self, tokens: frozenset) -> tuple:
+        hashes = [_token_hash(t) for t in tokens] or [0]
+        prime = _MERSENNE_PRIME
+        return tuple(
+            min([(a * h + b) % prime for h in hashes])
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: tuple):
+        r = self.rows
+        return [hash(signature[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def add(self, text: str, **payload) -> None:
+        """Index `text` with `payload`, merging into an existing identical entry"""
+        tokens = tokenize(text)
+        with self._lock:
+            entry = self._entries.get(tokens)
+            if entry is not None:
+                entry["payload"].update(payload)
+                entry["created"] = time.monotonic()
+                self._entries.move_to_end(tokens)
+                return
+        keys = self._band_keys(self.signature(tokens))
+        with self._lock:
+            self._entries[tokens] = {
+                "keys": keys,
+                "payload": dict(payload),
+                "created": time.monotonic()
+            }
+            for band, key in enumerate(keys):
+                self._buckets[band].setdefault(key, set()).add(tokens)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def lookup(self, text: str, threshold: float = None):
+        """
+        Most similar indexed entry at or above the threshold
+
+        Returns (similarity, payload) or None.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        tokens = tokenize(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(tokens)
+        if entry is not None:
+            candidates = {tokens}
+        else:
+            keys = self._band_keys(self.signature(tokens))
+            with self._lock:
+                candidates = set()
+                for band, key in enumerate(keys):
+                    candidates |= self._buckets[band].get(key, set())
+
+        guards = tokens & GUARD_WORDS
+        best, best_score = None, threshold
+        with self._lock:
+            for candidate in candidates:
+                entry = self._entries.get(candidate)
+                if entry is None:
+                    continue
+                if now - entry["created"] > self.ttl_seconds:
+                    self._remove(candidate)
+                    continue
+                if candidate & GUARD_WORDS != guards:
+                    continue
+                score = jaccard(tokens, candidate)
+                if score >= best_score:
+                    best, best_score = candidate, score
+            if best is None:
+                return None
+            self._entries.move_to_end(best)
+            return best_score, dict(self._entries[best]["payload"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+
+    def _remove(self, tokens: frozenset) -> None:
+        entry = self._entries.pop(tokens)
+        for band, key in enumerate(entry["keys"]):
+            members = self._buckets[band].get(key)
+            if members is not None:
+                members.discard(tokens)
+                if not members:
+                    del self._buckets[band][key]
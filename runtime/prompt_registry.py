@@ -0,0 +1,104 @@
+"""
+Prompt Registry
+Versioned system/user prompt pairs per node, with stable A/B assignment
+between a default and a candidate version. Latency and token usage per
+version are recorded by chat_completion (prompt.<node>.<version>.*);
+nodes report output validity through record_validity().
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+
+from runtime.metrics import metrics
+
+
+@dataclass(frozen=True)
+class PromptVersion:
+    """One version of a node's prompt; `template` uses str.format fields"""
+    node: str
+    version: str
+    system: str
+    template: str
+
+    def render(self, **fields) -> str:
+        return self.template.format(**fields)
+
+    def messages(self, **fields) -> list:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(**fields)}
+        ]
+
+
+class PromptRegistry:
+    """
+    Node -> {version: PromptVersion}
+
+    With ab_test on, a request goes to ab_candidate when a hash of its
+    key falls below ab_share - the same input always gets the same
+    version, which keeps cassette replays deterministic.
+    """
+
+    def __init__(self, default_version: str = "v1", ab_test: bool = False,
+                 ab_candidate: str = "v2", ab_share: float = 0.5):
+        self.default_version = default_version
+        self.ab_test = ab_test
+        self.ab_candidate = ab_candidate
+        self.ab_share = ab_share
+        self._prompts = {}
+        self._lock = threading.Lock()
+
+    def register(self, prompt: PromptVersion) -> PromptVersion:
+        with self._lock:
+            self._prompts.setdefault(prompt.node, {})[prompt.version] = prompt
+        return prompt
+
+    def versions(self, node: str) -> list:
+        with self._lock:
+            return list(self._prompts.get(node, {}))
+
+    def _bucket(self, node: str, key: str) -> float:
+        digest = hashlib.sha1(f"{node}:{key}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32
+
+    def get(self, node: str, version: str = None, key: str = "") -> PromptVersion:
+        """
+        Prompt for `node`: the explicit version if given, else the A/B
+        assignment for `key`, else the default version
+        """
+        with self._lock:
+            versions = self._prompts.get(node)
+        if not versions:
+            raise KeyError(f"No prompt registered for node '{node}'")
+        if version is None:
+            version = self.default_version
+            if (self.ab_test and self.ab_candidate in versions
+                    and self._bucket(node, key) < self.ab_share):
+                version = self.ab_candidate
+        if version not in versions:
+            version = next(iter(versions))
+        return versions[version]
+
+    def record_validity(self, prompt: PromptVersion, valid: bool) -> None:
+        outcome = "valid" if valid else "invalid"
+        metrics.incr(f"prompt.{prompt.node}.{prompt.version}.{outcome}")
+
+    def report(self) -> dict:
+        """Calls, latency, token usage and validity per node and version"""
+        with self._lock:
+            nodes = {node: list(versions) for node, versions in self._prompts.items()}
+        report = {}
+        for node, versions in nodes.items():
+            report[node] = {}
+            for version in versions:
+                prefix = f"prompt.{node}.{version}"
+                report[node][version] = {
+                    "calls": metrics.counter(f"{prefix}.calls"),
+                    "latency_p50_seconds": metrics.percentile(f"{prefix}.latency_seconds", 50),
+                    "latency_p95_seconds": metrics.percentile(f"{prefix}.latency_seconds", 95),
+                    "prompt_tokens_p50": metrics.percentile(f"{prefix}.prompt_tokens", 50),
+                    "completion_tokens_p50": metrics.percentile(f"{prefix}.completion_tokens", 50),
+                    "valid_rate": metrics.rate(f"{prefix}.valid", f"{prefix}.invalid")
+                }
+        return report
@@ -0,0 +1,130 @@
+"""
+Severity-Aware Priority Scheduler
+Bounded pool of graph executors fed from one FIFO queue per priority
+class. The next request is the one with the best aged priority, so
+critical requests jump the queue but low-severity ones cannot starve.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from runtime.metrics import metrics
+
+# Highest priority first - the keyword pre-triage severity of a request
+PRIORITY_CLASSES = ["critical", "high", "moderate", "low"]
+
+
+class PriorityScheduler:
+    """
+    Runs submitted calls on max_workers threads in priority order
+
+    Effective priority = class rank - seconds waited / aging_seconds (lower
+    runs first), so a request gains one class of priority for every
+    aging_seconds it waits. Only the head of each class queue can win,
+    which keeps selection O(number of classes).
+    """
+
+    def __init__(self, max_workers: int = 8, aging_seconds: float = 10.0,
+                 classes: list = None):
+        self.max_workers = max_workers
+        self.aging_seconds = aging_seconds
+        self.classes = classes or PRIORITY_CLASSES
+        self._rank = {name: rank for rank, name in enumerate(self.classes)}
+        self._queues = {name: deque() for name in self.classes}
+        self._cond = threading.Condition()
+        self._workers = []
+        self._shutdown = False
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"graph-exec-{len(self._workers)}",
+                                      daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, priority: str, fn, *args, **kwargs) -> Future:
+        """Queue `fn(*args, **kwargs)` under a priority class"""
+        if priority not in self._rank:
+            priority = self.classes[-1]
+        future = Future()
+        ctx = contextvars.copy_context()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("scheduler is shut down")
+            self._start_workers()
+            self._queues[priority].append(
+                (time.monotonic(), future, lambda: ctx.run(fn, *args, **kwargs))
+            )
+            metrics.incr(f"scheduler.{priority}.submitted")
+            self._cond.notify()
+        return future
+
+    def run(self, priority: str, fn, *args, **kwargs):
+        """Submit and block until the call has run; re-raises its exception"""
+        return self.submit(priority, fn, *args, **kwargs).result()
+
+    def _pick(self):
+        """Pop the queued item with the best aged priority (caller holds the lock)"""
+        now = time.monotonic()
+        best, best_score = None, None
+        for name, queue in self._queues.items():
+            if not queue:
+                continue
+            score = self._rank[name] - (now - queue[0][0]) / self.aging_seconds
+            if best_score is None or score < best_score:
+                best, best_score = name, score
+        if best is None:
+            return None
+        # Aging promoted this item over a waiting higher-priority class
+        if any(self._queues[name] for name in self.classes[:self._rank[best]]):
+            metrics.incr("scheduler.aging_promotions")
+        enqueued, future, call = self._queues[best].popleft()
+        metrics.observe(f"scheduler.{best}.wait_seconds", now - enqueued)
+        return future, call
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                item = self._pick()
+                while item is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    item = self._pick()
+            future, call = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(call())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def queue_depth(self) -> dict:
+        with self._cond:
+            return {name: len(queue) for name, queue in self._queues.items()}
+
+    def stats(self) -> dict:
+        """Queue depth plus wait-time percentiles per priority class"""
+        depth = self.queue_depth()
+        return {
+            name: {
+                "queued": depth[name],
+                "submitted": metrics.counter(f"scheduler.{name}.submitted"),
+                "wait_p50_seconds": metrics.percentile(f"scheduler.{name}.wait_seconds", 50),
+                "wait_p95_seconds": metrics.percentile(f"scheduler.{name}.wait_seconds", 95)
+            }
+            for name in self.classes
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers once the queues drain"""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+            workers = list(self._workers)
+        if wait:
+            for worker in workers:
+                worker.join()
@@ -1,6 +1,10 @@
 """
 Test script for the updated immediate actions format
 Validates that all fields are present and properly structured
+
+Offline, deterministic runs use the LLM cassette:
+    LLM_CASSETTE_MODE=record python test_actions.py   # once, with GROQ_API_KEY
+    LLM_CASSETTE_MODE=replay python test_actions.py   # no network, same responses
 """
 
 import json
@@ -0,0 +1,73 @@
+"""
+Test compact wire schema
+Runs offline - checks that compact LLM JSON expands to the full
+ImmediateAction / escalation fields and that verbose JSON passes through
+"""
+
+from compact_schema import expand_response, compact_action
+from schema import ImmediateAction
+from triage.fallback_plans import get_fallback_plan
+
+print("="*70)
+print("COMPACT WIRE SCHEMA TEST")
+print("="*70)
+
+# Test 1: compact plan expands to schema-valid actions
+print("\n✓ Test 1: expand compact plan")
+compact = {
+    "k": "Cardiac emergency",
+    "s": "C",
+    "e": 1,
+    "w": ["A", "R"],
+    "y": "Chest pain with sweating",
+    "a": [
+        {"i": 1, "t": "Call ambulance", "x": "Call emergency services now.", "d": None, "f": "NC"},
+        {"i": 2, "t": "Monitor breathing", "x": "Watch their breathing.", "d": 60, "f": "CR"}
+    ],
+    "n": ["Do not let them walk around"],
+    "r": "Help is coming."
+}
+result = expand_response(compact)
+for action in result["immediate_actions"]:
+    ImmediateAction(**action)
+first, second = result["immediate_actions"]
+print(f"  - {first}")
+assert first["critical"] and not first["user_confirmation_required"] and not first["repeatable"]
+assert second["user_confirmation_required"] and second["repeatable"] and second["duration_seconds"] == 60
+assert result["severity_level"] == "critical" and result["escalation_required"] is True
+assert result["who_to_contact"] == ["ambulance", "relative"]
+assert result["reason"] == result["escalation_reason"] == "Chest pain with sweating"
+assert result["do_not_do"] == ["Do not let them walk around"] and result["reassurance_message"]
+
+# Test 2: verbose responses pass through unchanged
+print("\n✓ Test 2: verbose passthrough")
+plan = get_fallback_plan("trauma", "high")
+verbose = {"immediate_actions": plan.actions(), "do_not_do": list(plan.do_not_do)}
+assert expand_response(verbose) == verbose
+
+# Test 3: compact_action round-trips
+print("\n✓ Test 3: round trip")
+actions = plan.actions()
+assert expand_response({"a": [compact_action(a) for a in actions]})["immediate_actions"] == actions
+
+# Test 4: omitted flags keep the safe defaults, "e" strings parse as flags
+print("\n✓ Test 4: safe defaults")
+action = expand_response({"a": [{"i": 1, "t": "Stay calm", "x": "Breathe slowly."}]})["immediate_actions"][0]
+assert action["user_confirmation_required"] is True, "Missing flags must keep confirmation required"
+assert action["critical"] is False and action["repeatable"] is False
+assert expand_response({"e": "0"})["escalation_required"] is False
+assert expand_response({"e": "1"})["escalation_required"] is True
+assert expand_response({"e": 0})["escalation_required"] is False
+
+# Test 5: the compact prompt doesn't ask for the verbose field names
+print("\n✓ Test 5: prompt rules match the schema")
+from compact_schema import COMPACT_PLAN_FORMAT, COMPACT_FIELDS_RULE
+from prompts import prompt_registry
+for version in prompt_registry.versions("plan_actions"):
+    text = "\n".join(m["content"] for m in prompt_registry.get("plan_actions", version=version).messages(
+        normalized_input="chest pain", crisis_type="Cardiac", severity="critical",
+        escalation_required=True, response_format=COMPACT_PLAN_FORMAT, fields_rule=COMPACT_FIELDS_RULE
+    ))
+    assert "ALL fields (step_id" not in text, f"{version} still lists verbose fields"
+
+print("\n✅ Compact wire schema validated!")
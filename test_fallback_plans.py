@@ -0,0 +1,75 @@
+"""
+Test fallback plan library
+Runs offline - checks coverage, schema validity and immutability of the
+pre-built fallback plans
+"""
+
+from schema import ImmediateAction, SEVERITY_LEVELS
+from triage.fallback_plans import (
+    CATEGORIES, RECHECK_RESPONSES, RECHECK_MAX_STEPS, get_fallback_plan, fallback_plan_for_state
+)
+from nodes.worsening_check import generate_fallback_actions
+from nodes.format_output import format_output
+
+print("="*70)
+print("FALLBACK PLAN LIBRARY TEST")
+print("="*70)
+
+# Test 1: every combination is present and schema-valid
+print("\n✓ Test 1: coverage and schema")
+count = 0
+for category in CATEGORIES:
+    for severity in SEVERITY_LEVELS:
+        for recheck in RECHECK_RESPONSES:
+            plan = get_fallback_plan(category, severity, recheck)
+            actions = plan.actions()
+            max_steps = RECHECK_MAX_STEPS[recheck] if recheck else 7
+            assert 3 <= len(actions) <= max_steps, f"{category}/{severity}/{recheck}: {len(actions)} steps"
+            assert [a["step_id"] for a in actions] == list(range(1, len(actions) + 1))
+            for action in actions:
+                ImmediateAction(**action)
+            if severity in ("high", "critical") or recheck == "yes":
+                assert any(a["critical"] for a in actions), "Urgent plans need a critical step"
+            assert plan.do_not_do and plan.reassurance_message
+            count += 1
+print(f"  - {count} plans validated")
+
+# Test 2: plans are read-only and callers get independent copies
+print("\n✓ Test 2: immutability")
+plan = get_fallback_plan("trauma", "critical")
+try:
+    plan.immediate_actions[0]["title"] = "changed"
+    raise AssertionError("Library actions must be read-only")
+except TypeError:
+    pass
+copy = plan.actions()
+copy[0]["title"] = "changed"
+assert get_fallback_plan("trauma", "critical").immediate_actions[0]["title"] != "changed"
+
+# Test 3: lookups from state, unknown keys and the worsening recheck path
+print("\n✓ Test 3: state lookup and defaults")
+state = fallback_plan_for_state({"crisis_type": "Severe bleeding", "normalized_input": "deep wound on arm",
+                                 "severity_level": "high"}).apply({})
+titles = [a["title"] for a in state["immediate_actions"]]
+print(f"  - Trauma/high: {titles}")
+assert "Apply pressure" in titles and titles[0] == "Call emergency services"
+assert get_fallback_plan("unknown", "???", "maybe") is get_fallback_plan("general", "high", "unsure")
+worsened = generate_fallback_actions("critical", "yes", "Cardiac emergency")
+assert worsened[0]["title"] == "Call emergency services" and not worsened[0]["user_confirmation_required"]
+
+# Test 4: a failed classification doesn't serve its placeholder severity
+print("\n✓ Test 4: classification error")
+failed = {"user_input": "my dad is not breathing", "error": "Error in crisis classification: timeout",
+          "crisis_type": "Unknown", "severity_level": "moderate", "classification_source": "",
+          "escalation_required": False}
+output = format_output(failed)["final_output"]
+print(f"  - {output['severity_level']}: {[a['title'] for a in output['immediate_actions']]}")
+assert output["severity_level"] == "critical"
+assert output["immediate_actions"][0]["title"] == "Call emergency services"
+assert output["escalation"]["required"]
+output = format_output(dict(failed, user_input="I have a mild headache"))["final_output"]
+assert output["severity_level"] == "high", "Unclassified errors are at least high"
+output = format_output(dict(failed, classification_source="llm", severity_level="low"))["final_output"]
+assert output["severity_level"] == "low", "A real classification is trusted"
+
+print("\n✅ Fallback plan library validated!")
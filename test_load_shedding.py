@@ -0,0 +1,69 @@
+"""
+Test load shedding degradation ladder
+Runs offline - checks level selection, red-flag protection and the
+rule-based triage path used at the lowest serving level
+"""
+
+from runtime.load_shedding import LoadShedder, LoadShedError
+from nodes.rules_triage import rules_triage
+from nodes.format_output import format_output
+
+print("="*70)
+print("LOAD SHEDDING TEST")
+print("="*70)
+
+shedder = LoadShedder(
+    max_inflight={"fused": 2, "rules": 3, "reject": 4},
+    p95_threshold_seconds={"fused": 1.0, "rules": 2.0},
+    window_size=10,
+    min_samples=3,
+    cooldown_seconds=60
+)
+
+# Test 1: ladder follows in-flight requests
+print("\n✓ Test 1: in-flight ladder")
+levels = []
+contexts = []
+for _ in range(4):
+    levels.append(shedder.level())
+    ctx = shedder.admit(red_flag=True, severity="critical")
+    ctx.__enter__()
+    contexts.append(ctx)
+levels.append(shedder.level())
+print(f"  - Levels: {levels}")
+assert levels == ["full", "full", "fused", "rules", "reject"]
+
+# Test 2: at the reject level low severity gets 503, moderate and red flags are served
+print("\n✓ Test 2: reject level")
+try:
+    shedder.mode_for(red_flag=False, severity="low")
+    raise AssertionError("Low-severity request should be rejected")
+except LoadShedError as e:
+    print(f"  - Rejected: {e.status_code} retry_after={e.retry_after}")
+    assert e.status_code == 503
+assert shedder.mode_for(red_flag=True, severity="low") == "rules"
+assert shedder.mode_for(red_flag=False, severity="moderate") == "rules"
+for ctx in contexts:
+    ctx.__exit__(None, None, None)
+assert shedder.inflight == 0 and shedder.level() == "full"
+
+# Test 3: slow full-graph requests degrade by latency
+print("\n✓ Test 3: latency ladder")
+for _ in range(3):
+    shedder._full_latency.record(1.5)
+print(f"  - Level after slow requests: {shedder.level()}")
+assert shedder.level() == "fused"
+shedder._degraded_until = 1.0  # cooldown elapsed
+assert shedder.level() == "full", "Cooldown should let the full graph be probed again"
+
+# Test 4: rule-based triage produces a valid response without an LLM
+print("\n✓ Test 4: rule-based triage")
+for text, escalated in [("My father has chest pain and is sweating", True),
+                        ("I have a mild headache since morning", False)]:
+    state = rules_triage({"user_input": text, "normalized_input": text, "error": ""})
+    output = format_output(state)["final_output"]
+    print(f"  - {text}: {output['severity_level']}, escalation={output['escalation']['required']}")
+    assert output["escalation"]["required"] == escalated
+    assert 3 <= len(output["immediate_actions"]) <= 7
+
+print("\n✅ Load shedding validated!")
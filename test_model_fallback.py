@@ -0,0 +1,74 @@
+"""
+Test latency-driven model fallback policy
+Runs offline - exercises the routing decisions without calling Groq
+"""
+
+import time
+from runtime.model_policy import ModelFallbackPolicy
+
+print("="*70)
+print("MODEL FALLBACK POLICY TEST")
+print("="*70)
+
+policy = ModelFallbackPolicy(
+    primary_model="primary",
+    fallback_model="fast",
+    p95_threshold_seconds={"default": 2.0, "plan_actions": 5.0},
+    window_size=10,
+    min_samples=3,
+    cooldown_seconds=0.2
+)
+
+# Step 1: Healthy primary keeps routing to primary
+print("\n1. Healthy primary")
+for _ in range(5):
+    policy.record("classify_crisis", "primary", 0.5)
+assert policy.choose("classify_crisis") == "primary"
+print("✓ Fast calls stay on primary")
+
+# Step 2: Slow p95 trips the node to the fallback
+print("\n2. Slow primary")
+for _ in range(3):
+    policy.record("classify_crisis", "primary", 3.0)
+    policy.record("plan_actions", "primary", 3.0)
+assert policy.choose("classify_crisis") == "fast", "p95 over threshold should route to fallback"
+print("✓ p95 over threshold routes to fallback")
+
+# Per-node thresholds: the same latencies are acceptable for plan_actions
+assert policy.choose("plan_actions") == "primary", "plan_actions threshold is 5s"
+print("✓ Thresholds are applied per node")
+
+# Step 3: Recovery after cooldown
+print("\n3. Recovery")
+time.sleep(0.25)
+assert policy.choose("classify_crisis") == "primary", "Primary should be probed after cooldown"
+policy.record("classify_crisis", "primary", 0.4)
+assert policy.choose("classify_crisis") == "primary"
+print("✓ Fast probe restores primary")
+
+# Step 4: Errors trip immediately, slow probe trips again
+print("\n4. Errors and failed probes")
+policy.record("assess_risk", "primary", 0.1, ok=False)
+assert policy.choose("assess_risk") == "fast", "Error should route to fallback"
+time.sleep(0.25)
+assert policy.choose("assess_risk") == "primary"
+policy.record("assess_risk", "primary", 4.0)
+assert policy.choose("assess_risk") == "fast", "Slow probe should trip again"
+print("✓ Errors and slow probes route to fallback")
+
+# Step 5: Windows are per node - slow plan_actions calls don't trip fast nodes
+print("\n5. Per-node windows")
+for _ in range(5):
+    policy.record("normalize_input", "primary", 0.3)
+for _ in range(5):
+    policy.record("plan_actions", "primary", 4.5)
+    policy.record("normalize_input", "primary", 0.3)
+assert policy.choose("normalize_input") == "primary", "plan_actions latency must not trip normalize_input"
+assert policy.p95("normalize_input", "primary") == 0.3
+assert len(policy.window("plan_actions", "primary")) > 0
+policy.record("plan_actions", "primary", 0.1, ok=False)
+assert policy.choose("plan_actions") == "fast"
+assert len(policy.window("normalize_input", "primary")) > 0, "Tripping one node must not clear another's window"
+print("✓ Latency windows are kept per node")
+
+print("\n✅ Model fallback policy validated!")
@@ -0,0 +1,33 @@
+"""
+Test near-duplicate input matching
+Runs offline - paraphrases match, while inputs that differ in negation
+or severity never share an assessment
+"""
+
+from runtime.near_duplicate import NearDuplicateIndex
+
+print("="*70)
+print("NEAR-DUPLICATE INDEX TEST")
+print("="*70)
+
+index = NearDuplicateIndex(threshold=0.6)
+index.add("child has a small cut on the knee that is bleeding", plan="minor")
+index.add("dad has chest pain and is sweating", plan="cardiac")
+
+# Test 1: paraphrases reuse the entry
+print("\n✓ Test 1: paraphrase")
+match = index.lookup("my father has chest pain and sweating")
+print(f"  - similarity {match[0]:.2f}")
+assert match and match[1]["plan"] == "cardiac"
+
+# Test 2: negations must agree
+print("\n✓ Test 2: negation guard")
+assert index.lookup("dad has chest pain and is not sweating", threshold=0.3) is None
+
+# Test 3: severity modifiers must agree
+print("\n✓ Test 3: severity guard")
+assert index.lookup("child has a small cut on the knee that is bleeding")[1]["plan"] == "minor"
+assert index.lookup("child has a deep cut on the knee that is bleeding", threshold=0.3) is None
+assert index.lookup("child has a cut on the knee that is bleeding heavily", threshold=0.3) is None
+
+print("\n✅ Near-duplicate matching validated!")
@@ -0,0 +1,60 @@
+"""
+Test prompt registry
+Runs offline - checks that every node prompt version renders, A/B
+assignment is stable and per-version validity is counted
+"""
+
+from runtime.prompt_registry import PromptRegistry, PromptVersion
+from prompts import prompt_registry
+
+print("="*70)
+print("PROMPT REGISTRY TEST")
+print("="*70)
+
+# Test 1: every registered node prompt renders in every version
+print("\n✓ Test 1: node prompts render")
+fields = {
+    "user_input": "My father has chest pain",
+    "normalized_input": "Father has chest pain",
+    "crisis_type": "Cardiac emergency",
+    "severity": "critical",
+    "escalation_required": True,
+    "response_format": "{}",
+    "fields_rule": "- Each step MUST have ALL keys"
+}
+for node in ["normalize_input", "classify_crisis", "assess_risk", "plan_actions"]:
+    versions = prompt_registry.versions(node)
+    assert {"v1", "v2"} <= set(versions), f"{node} is missing a version"
+    for version in versions:
+        messages = prompt_registry.get(node, version).messages(**fields)
+        user = messages[1]["content"]
+        assert messages[0]["role"] == "system" and messages[0]["content"]
+        assert fields["normalized_input"] in user or fields["user_input"] in user
+        print(f"  - {node} {version}: system {len(messages[0]['content'])} chars, "
+              f"user {len(messages[1]['content'])} chars")
+
+# Test 2: A/B assignment is stable per key and close to ab_share
+print("\n✓ Test 2: A/B assignment")
+registry = PromptRegistry(default_version="v1", ab_test=True, ab_candidate="v2", ab_share=0.3)
+registry.register(PromptVersion("node", "v1", "system", "{x}"))
+registry.register(PromptVersion("node", "v2", "system", "{x}!"))
+keys = [f"input {i}" for i in range(2000)]
+assigned = [registry.get("node", key=k).version for k in keys]
+share = assigned.count("v2") / len(assigned)
+print(f"  - Candidate share: {share:.2f}")
+assert 0.25 < share < 0.35
+assert assigned == [registry.get("node", key=k).version for k in keys], "Assignment must be stable"
+assert registry.get("node", version="v1").version == "v1"
+assert registry.get("node", version="v9").version == "v1", "Unknown versions fall back to the first"
+
+# Test 3: validity accounting
+print("\n✓ Test 3: validity report")
+prompt = registry.get("node", version="v2")
+registry.record_validity(prompt, True)
+registry.record_validity(prompt, True)
+registry.record_validity(prompt, False)
+rate = registry.report()["node"]["v2"]["valid_rate"]
+print(f"  - v2 valid rate: {rate:.2f}")
+assert abs(rate - 2 / 3) < 1e-9
+
+print("\n✅ Prompt registry validated!")
@@ -0,0 +1,68 @@
+"""
+Test rule-based risk assessment
+Runs offline - checks the deterministic escalation rules used by
+RISK_ASSESSMENT_MODE=rules
+"""
+
+from triage.rules import evaluate_escalation
+
+print("="*70)
+print("RULE-BASED RISK ASSESSMENT TEST")
+print("="*70)
+
+cases = [
+    # (input, severity, crisis_type, expected_required, expected_first_contact)
+    ("Adult with sudden weakness", "critical", "Possible stroke", True, "ambulance"),
+    ("Deep cut on the leg", "high", "Laceration", True, "nearby hospital"),
+    ("Fever for two days", "moderate", "Fever", False, "relative"),
+    ("Mild headache", "low", "Headache", False, None),
+    ("Small child is choking", "low", "Airway obstruction", True, "ambulance"),
+    ("Took too many pills, possible overdose", "moderate", "Poisoning", True, "nearby hospital"),
+]
+
+for text, severity, crisis_type, required, contact in cases:
+    result = evaluate_escalation(text, severity, crisis_type)
+    first = result["who_to_contact"][0] if result["who_to_contact"] else None
+    print(f"\n✓ [{severity}] {text}")
+    print(f"  - Required: {result['escalation_required']}, contacts: {result['who_to_contact']}")
+    print(f"  - Red flags: {result['red_flags']}")
+    assert result["escalation_required"] == required, f"Unexpected escalation for '{text}'"
+    assert first == contact, f"Unexpected primary contact for '{text}': {first}"
+    assert result["reason"], "Reason must always be set"
+
+# Negated red flags don't count; real ones in the same text still do
+print("\n✓ Negation handling")
+from triage.rules import triage_severity, classify_by_rules
+from triage.keywords import match_red_flags
+
+negated = "no chest pain, just a mild headache"
+result = evaluate_escalation(negated, "low", "Headache")
+assert result["red_flags"] == [] and not result["escalation_required"], result
+assert triage_severity(negated) != "critical"
+assert classify_by_rules(negated)["severity_level"] != "critical"
+assert match_red_flags("he doesn't have any difficulty breathing") == []
+assert match_red_flags("he is not breathing") == ["difficulty breathing"], "Negation inside the phrase is the symptom"
+assert match_red_flags("no fever but now chest pain") == ["chest pain"]
+assert match_red_flags("never had chest pain before, now severe chest pain") == ["chest pain"]
+print("  - negated red flags are ignored")
+
+# Negations that don't govern the symptom must not hide it
+for text in ["he can't stop bleeding", "I cannot stop the bleeding",
+             "He can't stop having seizures", "no pulse and not responding"]:
+    assert match_red_flags(text), text
+    assert triage_severity(text) == "critical", f"{text}: {triage_severity(text)}"
+assert match_red_flags("he doesn't have any signs of chest pain") == []
+print("  - 'can't stop ...' and negations of other symptoms still escalate")
+
+# Everyday words shared with red-flag phrasings don't make text clearly medical
+print("\n✓ Ambiguous red-flag variants")
+from triage.keywords import is_clearly_medical
+
+for text in ["my tent collapsed", "my new shoes are fitting well", "I choked on the exam"]:
+    assert not is_clearly_medical(text), text
+assert is_clearly_medical("my friend collapsed and is not responding")
+assert is_clearly_medical("she is having a seizure")
+assert match_red_flags("my dad collapsed") == ["unconscious"], "Escalation still sees the variant"
+print("  - collapsed/choked/fitting need a medical co-term for the gate")
+
+print("\n✅ Rule-based risk assessment validated!")
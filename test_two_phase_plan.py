@@ -0,0 +1,51 @@
+"""
+Test two-phase action planning merge
+Runs offline - checks how the critical first steps and the full plan
+are merged, dropping full-plan steps that repeat a first step
+"""
+
+from nodes.plan_actions import merge_actions
+from triage.fallback_plans import get_fallback_plan
+
+print("="*70)
+print("TWO-PHASE PLAN MERGE TEST")
+print("="*70)
+
+
+def step(step_id, title, critical=False):
+    return {
+        "step_id": step_id,
+        "title": title,
+        "instruction": f"{title}.",
+        "duration_seconds": None,
+        "user_confirmation_required": True,
+        "critical": critical,
+        "repeatable": False
+    }
+
+
+first = [step(1, "Call ambulance", True), step(2, "Start CPR", True)]
+
+# Test 1: repeats of the first steps are dropped by content, real steps kept and renumbered
+print("\n✓ Test 1: merge by content")
+full = [step(1, "Check safety"), step(2, "Call emergency services", True),
+        step(3, "Begin CPR"), step(4, "Monitor breathing"), step(5, "Keep warm")]
+merged = merge_actions(first, full)
+print(f"  - {[(s['step_id'], s['title']) for s in merged]}")
+assert [s["title"] for s in merged] == ["Call ambulance", "Start CPR", "Check safety", "Monitor breathing", "Keep warm"]
+assert [s["step_id"] for s in merged] == [1, 2, 3, 4, 5]
+assert merge_actions(first, [step(1, "Call your doctor")])[-1]["title"] == "Call your doctor"
+
+# Test 2: repeated titles are dropped and the plan stays within 7 steps
+print("\n✓ Test 2: duplicates and cap")
+full = [step(i, f"Step {i}") for i in range(1, 8)] + [step(8, "start cpr")]
+merged = merge_actions(first, full)
+assert len(merged) == 7 and "start cpr" not in [s["title"] for s in merged]
+
+# Test 3: merging into a fallback plan (full plan call failed)
+print("\n✓ Test 3: fallback completion")
+merged = merge_actions(first, get_fallback_plan("cardiac", "critical").actions())
+print(f"  - {[s['title'] for s in merged]}")
+assert merged[:2] == first and len(merged) >= 3
+
+print("\n✅ Two-phase plan merge validated!")
@@ -0,0 +1,21 @@
+"""
+Triage package for Crisis Decision Assistant
+Local, deterministic helpers that run before (or instead of) LLM calls
+"""
+
+from .keywords import match_categories, match_red_flags, is_clearly_medical
+from .rules import evaluate_escalation, triage_severity, classify_by_rules
+from .fallback_plans import FallbackPlan, get_fallback_plan, fallback_plan_for_state, crisis_category
+
+__all__ = [
+    'match_categories',
+    'match_red_flags',
+    'is_clearly_medical',
+    'evaluate_escalation',
+    'triage_severity',
+    'classify_by_rules',
+    'FallbackPlan',
+    'get_fallback_plan',
+    'fallback_plan_for_state',
+    'crisis_category'
+]
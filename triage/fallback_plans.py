@@ -0,0 +1,218 @@
+"""
+Fallback Plan Library
+Immutable, pre-built action plans used whenever an LLM plan is missing or
+invalid: plan_actions validation/errors, format_output, worsening
+rechecks and the degraded (rule-based) serving mode.
+
+Every (crisis category, severity, recheck response) combination is built
+once at import, so a lookup is a single dict access.
+"""
+
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+from schema import MEDICAL_CRISIS_KEYWORDS, SEVERITY_LEVELS
+from triage.keywords import match_categories
+
+GENERAL_CATEGORY = "general"
+CATEGORIES = list(MEDICAL_CRISIS_KEYWORDS) + [GENERAL_CATEGORY]
+RECHECK_RESPONSES = [None, "yes", "unsure", "no"]
+
+# Step limit per recheck answer, shared with the worsening_check prompt
+RECHECK_MAX_STEPS = {"yes": 5, "unsure": 5, "no": 3}
+
+
+class FallbackPlan(NamedTuple):
+    """Read-only plan; use actions()/apply() to get mutable copies"""
+    immediate_actions: tuple
+    do_not_do: tuple
+    reassurance_message: str
+
+    def actions(self) -> list:
+        return [dict(action) for action in self.immediate_actions]
+
+    def apply(self, state: dict) -> dict:
+        """Write the plan into a graph state"""
+        state["immediate_actions"] = self.actions()
+        state["do_not_do"] = list(self.do_not_do)
+        state["reassurance_message"] = self.reassurance_message
+        return state
+
+
+def _step(title, instruction, duration=None, confirm=True, critical=False, repeatable=False):
+    return {
+        "title": title,
+        "instruction": instruction,
+        "duration_seconds": duration,
+        "user_confirmation_required": confirm,
+        "critical": critical,
+        "repeatable": repeatable
+    }
+
+
+# One first-aid step specific to each crisis category
+CATEGORY_STEPS = {
+    "cardiac": _step("Keep them resting",
+                     "Help them sit down and rest in a comfortable position. Loosen any tight clothing."),
+    "respiratory": _step("Help them sit upright",
+                         "Help them sit upright, leaning slightly forward, and keep fresh air around them."),
+    "neurological": _step("Protect from injury",
+                          "Clear the space around them. If they are drowsy, lay them on their side. "
+                          "Note the time symptoms started."),
+    "trauma": _step("Apply pressure",
+                    "Press firmly on any bleeding with a clean cloth and keep the injured part still."),
+    "allergic": _step("Remove the trigger",
+                      "Move them away from whatever may have caused the reaction and watch their breathing."),
+    "fever": _step("Keep them cool",
+                   "Remove extra layers and let them rest. Offer small sips of water if they are fully alert."),
+    "poisoning": _step("Keep the substance",
+                       "Keep the container or substance to show responders and note when it was taken."),
+    "pain": _step("Keep them still",
+                  "Help them into the most comfortable position and keep them still.")
+}
+
+CATEGORY_DO_NOT_DO = {
+    "cardiac": "Do not let them walk around or exert themselves",
+    "respiratory": "Do not make them lie flat",
+    "neurological": "Do not put anything in their mouth",
+    "trauma": "Do not remove objects stuck in a wound",
+    "allergic": "Do not give food or drink",
+    "fever": "Do not use ice-cold water or ice baths",
+    "poisoning": "Do not induce vomiting",
+    "pain": "Do not move them if a neck or back injury is possible"
+}
+
+EMERGENCY_STEPS = [
+    _step("Call emergency services",
+          "Call emergency services immediately and describe all symptoms.",
+          confirm=False, critical=True),
+    _step("Stay with patient",
+          "Do not leave the patient alone. Monitor their condition.",
+          critical=True),
+    _step("Follow dispatcher instructions",
+          "Listen carefully to emergency dispatcher and follow their guidance.",
+          critical=True)
+]
+
+NON_URGENT_STEPS = [
+    _step("Ensure safety",
+          "Make sure the environment is safe for both you and the patient."),
+    _step("Monitor patient",
+          "Stay with the patient and monitor their breathing and consciousness.",
+          duration=60, repeatable=True),
+    _step("Contact a doctor",
+          "Contact a doctor or clinic for advice, and call emergency services if it gets worse.")
+]
+
+RECHECK_STEPS = {
+    "yes": [
+        _step("Call emergency services",
+              "Call emergency services immediately. The condition has worsened and requires urgent medical evaluation.",
+              confirm=False, critical=True),
+        _step("Monitor vital signs",
+              "Continue monitoring breathing, consciousness, and any changes in symptoms until help arrives.",
+              duration=60, critical=True, repeatable=True),
+        _step("Stay with patient",
+              "Do not leave the patient alone. Be prepared to provide information to emergency responders.",
+              critical=True)
+    ],
+    "unsure": [
+        _step("Check vital signs",
+              "Check breathing rate, pulse, and level of consciousness carefully.",
+              duration=30, repeatable=True),
+        _step("Contact medical advice",
+              "Call a medical helpline or your doctor for professional guidance on next steps."),
+        _step("Continue monitoring",
+              "Keep watching for any changes and be ready to call emergency services if condition worsens.",
+              duration=120, repeatable=True)
+    ],
+    "no": [
+        _step("Continue monitoring",
+              "Keep monitoring the situation for any changes over the next few hours.",
+              repeatable=True),
+        _step("Follow medical advice",
+              "Follow up with healthcare provider as recommended for proper evaluation."),
+        _step("Watch for warning signs",
+              "Be alert for any new symptoms or worsening, and seek help immediately if needed.",
+              repeatable=True)
+    ]
+}
+
+REASSURANCE = {
+    "emergency": "Please seek immediate medical attention. Stay calm and stay with them.",
+    "non_urgent": "You're taking the right steps by seeking guidance. Stay calm and follow the actions carefully.",
+    "yes": "Medical attention is now more urgently needed.",
+    "unsure": "It's okay to be unsure. Check carefully and get professional advice.",
+    "no": "Continue monitoring the situation carefully."
+}
+
+
+def _build(category: str, severity: str, recheck: Optional[str]) -> FallbackPlan:
+    urgent = severity in ("high", "critical")
+    if recheck:
+        steps = list(RECHECK_STEPS[recheck])
+        reassurance = REASSURANCE[recheck]
+        # Not worse is still high/critical - keep emergency services as the first step
+        if urgent and recheck != "yes":
+            steps.insert(0, EMERGENCY_STEPS[0])
+        urgent = urgent or recheck == "yes"
+    elif urgent:
+        steps = list(EMERGENCY_STEPS)
+        reassurance = REASSURANCE["emergency"]
+    else:
+        steps = list(NON_URGENT_STEPS)
+        reassurance = REASSURANCE["non_urgent"]
+
+    # The category step goes right after the first (safety / call) step
+    if category in CATEGORY_STEPS:
+        steps.insert(1, CATEGORY_STEPS[category])
+    if recheck:
+        steps = steps[:RECHECK_MAX_STEPS[recheck]]
+
+    do_not_do = ["Do not give any medication without medical guidance"]
+    if category in CATEGORY_DO_NOT_DO:
+        do_not_do.insert(0, CATEGORY_DO_NOT_DO[category])
+    if urgent:
+        do_not_do.append("Do not delay seeking professional help")
+
+    actions = tuple(
+        MappingProxyType({"step_id": step_id, **step}) for step_id, step in enumerate(steps, 1)
+    )
+    return FallbackPlan(actions, tuple(do_not_do), reassurance)
+
+
+_PLANS = MappingProxyType({
+    (category, severity, recheck): _build(category, severity, recheck)
+    for category in CATEGORIES
+    for severity in SEVERITY_LEVELS
+    for recheck in RECHECK_RESPONSES
+})
+
+
+def crisis_category(*texts: str) -> str:
+    """Best-matching MEDICAL_CRISIS_KEYWORDS category for the texts, else "general" """
+    categories = match_categories(" ".join(t for t in texts if t))
+    if not categories:
+        return GENERAL_CATEGORY
+    return max(categories, key=lambda c: len(categories[c]))
+
+
+def get_fallback_plan(category: str = GENERAL_CATEGORY, severity: str = "high",
+                      recheck: Optional[str] = None) -> FallbackPlan:
+    """
+    O(1) lookup; unknown categories map to "general", unknown severities
+    to "high" (the conservative default) and unknown recheck answers to "unsure"
+    """
+    plan = _PLANS.get((category, severity, recheck))
+    if plan is not None:
+        return plan
+    category = category if category in CATEGORIES else GENERAL_CATEGORY
+    severity = severity if severity in SEVERITY_LEVELS else "high"
+    recheck = recheck if recheck in RECHECK_RESPONSES else "unsure"
+    return _PLANS[(category, severity, recheck)]
+
+
+def fallback_plan_for_state(state: dict, recheck: Optional[str] = None) -> FallbackPlan:
+    """Fallback plan for a graph state's crisis type, input and severity"""
+    category = crisis_category(state.get("crisis_type", ""), state.get("normalized_input", ""))
+    return get_fallback_plan(category, state.get("severity_level", "high"), recheck)
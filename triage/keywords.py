@@ -0,0 +1,114 @@
+"""
+Keyword Pre-Triage
+Cheap lexical matching over the medical lexicons in schema.py,
+used to skip or short-circuit LLM calls for obvious inputs
+"""
+
+import re
+
+from schema import MEDICAL_CRISIS_KEYWORDS, RED_FLAG_SYMPTOMS
+from runtime.near_duplicate import NEGATIONS
+
+
+# Common phrasings of each red-flag symptom as users actually write them
+RED_FLAG_VARIANTS = {
+    "chest pain": ["chest pain", "chest pressure", "chest tightness", "pain in chest"],
+    "difficulty breathing": ["difficulty breathing", "trouble breathing", "can't breathe",
+                             "cannot breathe", "not breathing", "stopped breathing",
+                             "struggling to breathe", "gasping"],
+    "unconscious": ["unconscious", "unresponsive", "not responding", "passed out",
+                    "collapsed", "won't wake up"],
+    "severe bleeding": ["severe bleeding", "heavy bleeding", "won't stop bleeding",
+                        "can't stop bleeding", "cannot stop bleeding", "can't stop the bleeding",
+                        "cannot stop the bleeding", "bleeding heavily", "lot of blood",
+                        "spurting blood"],
+    "stroke symptoms": ["stroke", "face drooping", "facial drooping", "slurred speech",
+                        "can't move her arm", "can't move his arm", "arm weakness"],
+    "severe allergic reaction": ["anaphylaxis", "anaphylactic", "throat swelling",
+                                 "tongue swelling", "severe allergic"],
+    "choking": ["choking", "choked"],
+    "seizure": ["seizure", "seizures", "seizing", "convulsing", "convulsions", "fitting"],
+    "suspected poisoning": ["poison", "poisoned", "overdose", "overdosed",
+                            "swallowed bleach", "ingested"],
+    "severe head injury": ["head injury", "hit their head", "hit his head", "hit her head",
+                           "hit my head", "skull"]
+}
+
+# Keywords that also occur often in non-medical text ("my tent collapsed",
+# "shoes fitting"): they still raise red flags, but never make text clearly medical
+AMBIGUOUS_KEYWORDS = {"hot", "temperature", "heart", "cut", "broken", "blood", "swelling",
+                      "collapsed", "choked", "fitting"}
+
+
+# A negation only counts when it governs the symptom directly: nothing but
+# these filler words may stand between them ("doesn't have any chest pain").
+# Any other word ends the scan - an earlier symptom ("no pulse and not
+# responding") or "stop" ("can't stop bleeding" is worse, not absent)
+NEGATION_FILLERS = {"any", "a", "an", "the", "signs", "sign", "of", "had", "have", "has",
+                    "having", "history", "more", "real"}
+_CLAUSE_BREAK = re.compile(r"[.,;:!?]|\b(?:but|however|now|except)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z']+")
+
+
+def is_negated(text: str, start: int) -> bool:
+    """True when the match starting at `start` is directly governed by a negation"""
+    clause = _CLAUSE_BREAK.split(text[:start])[-1]
+    for word in reversed(_WORD.findall(clause.lower())):
+        if word in NEGATIONS:
+            return True
+        if word not in NEGATION_FILLERS:
+            return False
+    return False
+
+
+def _compile(phrases) -> re.Pattern:
+    alternation = "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+
+_CATEGORY_PATTERNS = {
+    category: _compile(words) for category, words in MEDICAL_CRISIS_KEYWORDS.items()
+}
+_RED_FLAG_PATTERNS = {
+    symptom: _compile(RED_FLAG_VARIANTS.get(symptom, [symptom])) for symptom in RED_FLAG_SYMPTOMS
+}
+_CLEAR_RED_FLAG_PATTERNS = {
+    symptom: _compile([v for v in RED_FLAG_VARIANTS.get(symptom, [symptom]) if v not in AMBIGUOUS_KEYWORDS])
+    for symptom in RED_FLAG_SYMPTOMS
+}
+
+
+def match_categories(text: str) -> dict:
+    """Map each matching crisis category to the keywords found in `text`"""
+    matches = {}
+    for category, pattern in _CATEGORY_PATTERNS.items():
+        found = [m.group(0).lower() for m in pattern.finditer(text) if not is_negated(text, m.start())]
+        if found:
+            matches[category] = found
+    return matches
+
+
+def match_red_flags(text: str, unambiguous: bool = False) -> list:
+    """
+    Red-flag symptoms (as named in RED_FLAG_SYMPTOMS) present, and not negated,
+    in `text`; with `unambiguous`, variants in AMBIGUOUS_KEYWORDS don't count
+    """
+    patterns = _CLEAR_RED_FLAG_PATTERNS if unambiguous else _RED_FLAG_PATTERNS
+    return [
+        symptom for symptom, pattern in patterns.items()
+        if any(not is_negated(text, m.start()) for m in pattern.finditer(text))
+    ]
+
+
+def is_clearly_medical(text: str) -> bool:
+    """
+    True when the text contains a red-flag phrase or a medical keyword
+    that is not also common in everyday language
+    """
+    if match_red_flags(text, unambiguous=True):
+        return True
+    return any(
+        keyword not in AMBIGUOUS_KEYWORDS
+        for found in match_categories(text).values()
+        for keyword in found
+    )
@@ -0,0 +1,262 @@
+"""
+Local Crisis Classifier
+TF-IDF features + multinomial logistic regression (NumPy only), trained
+offline from archived graph outputs. Predicts crisis_type and
+severity_level so classify_crisis can skip the LLM when confident.
+
+Usage:
+    python -m triage.local_classifier train --archive assessments.jsonl --model models/crisis_classifier.npz
+    python -m triage.local_classifier eval --archive assessments.jsonl --model models/crisis_classifier.npz
+"""
+
+import argparse
+import json
+import random
+import re
+from collections import Counter
+
+import numpy as np
+
+from triage.keywords import match_red_flags
+
+SEVERITY_LEVELS = ["low", "moderate", "high", "critical"]
+
+# Added to severity logits before the softmax - biases toward higher severity
+SEVERITY_LOGIT_BIAS = np.array([-0.3, 0.0, 0.2, 0.4])
+
+# Pick the highest severity whose upper-tail probability reaches this mass
+SEVERITY_TAIL_MASS = 0.3
+
+
+def _tokens(text: str) -> list:
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def canonical_label(crisis_type: str) -> str:
+    return " ".join(crisis_type.lower().split())
+
+
+class TfidfVectorizer:
+    """Unigram + bigram TF-IDF with L2-normalized rows"""
+
+    def __init__(self, min_df: int = 2, max_features: int = 5000):
+        self.min_df = min_df
+        self.max_features = max_features
+        self.vocab = {}
+        self.idf = None
+
+    def fit(self, texts: list) -> "TfidfVectorizer":
+        df = Counter()
+        for text in texts:
+            df.update(set(_tokens(text)))
+        terms = [t for t, n in df.most_common(self.max_features) if n >= self.min_df]
+        self.vocab = {t: i for i, t in enumerate(sorted(terms))}
+        counts = np.array([df[t] for t in sorted(terms)], dtype=np.float64)
+        self.idf = np.log((1 + len(texts)) / (1 + counts)) + 1
+        return self
+
+    def transform(self, texts: list) -> np.ndarray:
+        X = np.zeros((len(texts), len(self.vocab)))
+        for row, text in enumerate(texts):
+            for token in _tokens(text):
+                col = self.vocab.get(token)
+                if col is not None:
+                    X[row, col] += 1
+        X *= self.idf
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        return X / np.where(norms == 0, 1, norms)
+
+
+class SoftmaxRegression:
+    """Multinomial logistic regression trained with full-batch gradient descent"""
+
+    def __init__(self, l2: float = 1e-3, learning_rate: float = 0.5, epochs: int = 300):
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.W = None
+        self.b = None
+
+    def fit(self, X: np.ndarray, y: np.ndarray, num_classes: int) -> "SoftmaxRegression":
+        n, d = X.shape
+        self.W = np.zeros((d, num_classes))
+        self.b = np.zeros(num_classes)
+        Y = np.eye(num_classes)[y]
+        for _ in range(self.epochs):
+            P = self.predict_proba(X)
+            grad = P - Y
+            self.W -= self.learning_rate * (X.T @ grad / n + self.l2 * self.W)
+            self.b -= self.learning_rate * grad.mean(axis=0)
+        return self
+
+    def logits(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.W + self.b
+
+    def predict_proba(self, X: np.ndarray, bias: np.ndarray = None) -> np.ndarray:
+        Z = self.logits(X)
+        if bias is not None:
+            Z = Z + bias
+        Z -= Z.max(axis=1, keepdims=True)
+        E = np.exp(Z)
+        return E / E.sum(axis=1, keepdims=True)
+
+
+class LocalCrisisClassifier:
+    """Two-head classifier: crisis_type and (conservatively biased) severity"""
+
+    def __init__(self, vectorizer: TfidfVectorizer, crisis_model: SoftmaxRegression,
+                 severity_model: SoftmaxRegression, crisis_labels: list, display_labels: list = None):
+        self.vectorizer = vectorizer
+        self.crisis_model = crisis_model
+        self.severity_model = severity_model
+        self.crisis_labels = crisis_labels
+        # What predict() returns: the LLM's own spelling of each canonical label
+        self.display_labels = display_labels or crisis_labels
+
+    @classmethod
+    def train(cls, records: list, min_label_count: int = 3) -> "LocalCrisisClassifier":
+        counts = Counter(canonical_label(r["crisis_type"]) for r in records)
+        labels = sorted(label for label, n in counts.items() if n >= min_label_count)
+        label_index = {label: i for i, label in enumerate(labels)}
+        records = [r for r in records if canonical_label(r["crisis_type"]) in label_index]
+        if not records:
+            raise ValueError("No crisis_type label has enough archived examples to train on")
+        spellings = {label: Counter() for label in labels}
+        for r in records:
+            spellings[canonical_label(r["crisis_type"])][" ".join(r["crisis_type"].split())] += 1
+        display_labels = [spellings[label].most_common(1)[0][0] for label in labels]
+
+        texts = [r["normalized_input"] for r in records]
+        vectorizer = TfidfVectorizer().fit(texts)
+        X = vectorizer.transform(texts)
+        crisis_y = np.array([label_index[canonical_label(r["crisis_type"])] for r in records])
+        severity_y = np.array([SEVERITY_LEVELS.index(r["severity_level"]) for r in records])
+        return cls(
+            vectorizer,
+            SoftmaxRegression().fit(X, crisis_y, len(labels)),
+            SoftmaxRegression().fit(X, severity_y, len(SEVERITY_LEVELS)),
+            labels,
+            display_labels
+        )
+
+    def predict(self, text: str) -> dict:
+        """
+        Predict crisis_type and severity_level for a normalized input
+
+        confidence is the lower of the two heads' top probabilities. The
+        returned severity is the highest level whose upper-tail probability
+        reaches SEVERITY_TAIL_MASS, raised to at least "high" when a red-flag
+        symptom is present.
+        """
+        X = self.vectorizer.transform([text])
+        crisis_p = self.crisis_model.predict_proba(X)[0]
+        severity_p = self.severity_model.predict_proba(X, SEVERITY_LOGIT_BIAS)[0]
+
+        tail = np.cumsum(severity_p[::-1])[::-1]
+        severity = max(i for i in range(len(SEVERITY_LEVELS)) if tail[i] >= SEVERITY_TAIL_MASS)
+        if match_red_flags(text):
+            severity = max(severity, SEVERITY_LEVELS.index("high"))
+
+        return {
+            "crisis_type": self.display_labels[int(crisis_p.argmax())],
+            "severity_level": SEVERITY_LEVELS[severity],
+            "confidence": float(min(crisis_p.max(), severity_p.max()))
+        }
+
+    def save(self, path: str) -> None:
+        """Vocabulary and labels as JSON, weights as float arrays - loadable without pickle"""
+        terms = sorted(self.vectorizer.vocab, key=self.vectorizer.vocab.get)
+        np.savez_compressed(
+            path,
+            meta=np.array(json.dumps({
+                "terms": terms,
+                "crisis_labels": self.crisis_labels,
+                "display_labels": self.display_labels
+            })),
+            idf=np.asarray(self.vectorizer.idf, dtype=np.float64),
+            crisis_W=np.asarray(self.crisis_model.W, dtype=np.float64),
+            crisis_b=np.asarray(self.crisis_model.b, dtype=np.float64),
+            severity_W=np.asarray(self.severity_model.W, dtype=np.float64),
+            severity_b=np.asarray(self.severity_model.b, dtype=np.float64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LocalCrisisClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            vectorizer = TfidfVectorizer()
+            vectorizer.vocab = {t: i for i, t in enumerate(meta["terms"])}
+            vectorizer.idf = data["idf"]
+            crisis_model, severity_model = SoftmaxRegression(), SoftmaxRegression()
+            crisis_model.W, crisis_model.b = data["crisis_W"], data["crisis_b"]
+            severity_model.W, severity_model.b = data["severity_W"], data["severity_b"]
+        return cls(vectorizer, crisis_model, severity_model, meta["crisis_labels"],
+                   meta.get("display_labels"))
+
+
+def load_archive(path: str) -> list:
+    """LLM-labelled records from the JSONL assessment archive"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if (record.get("classification_source") == "llm"
+                    and record.get("normalized_input")
+                    and record.get("severity_level") in SEVERITY_LEVELS):
+                records.append(record)
+    return records
+
+
+def evaluate(model: LocalCrisisClassifier, records: list, threshold: float) -> dict:
+    covered = crisis_ok = severity_ok = under_triage = 0
+    for record in records:
+        prediction = model.predict(record["normalized_input"])
+        if prediction["confidence"] < threshold:
+            continue
+        covered += 1
+        crisis_ok += canonical_label(prediction["crisis_type"]) == canonical_label(record["crisis_type"])
+        predicted = SEVERITY_LEVELS.index(prediction["severity_level"])
+        actual = SEVERITY_LEVELS.index(record["severity_level"])
+        severity_ok += predicted == actual
+        under_triage += predicted < actual
+    return {
+        "records": len(records),
+        "coverage": covered / len(records) if records else 0.0,
+        "crisis_type_accuracy": crisis_ok / covered if covered else None,
+        "severity_accuracy": severity_ok / covered if covered else None,
+        "under_triage_rate": under_triage / covered if covered else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate the local crisis classifier")
+    parser.add_argument("command", choices=["train", "eval"])
+    parser.add_argument("--archive", required=True, help="JSONL archive of graph outputs")
+    parser.add_argument("--model", default="models/crisis_classifier.npz")
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share held out for eval after training")
+    args = parser.parse_args()
+
+    records = load_archive(args.archive)
+    print(f"Loaded {len(records)} LLM-labelled assessments from {args.archive}")
+
+    if args.command == "train":
+        random.Random(0).shuffle(records)
+        split = int(len(records) * (1 - args.holdout))
+        train, holdout = records[:split], records[split:]
+        model = LocalCrisisClassifier.train(train)
+        model.save(args.model)
+        print(f"✅ Saved model with {len(model.crisis_labels)} crisis types to {args.model}")
+        records = holdout
+    else:
+        model = LocalCrisisClassifier.load(args.model)
+
+    if records:
+        print(json.dumps(evaluate(model, records, args.threshold), indent=2))
+
+
+if __name__ == "__main__":
+    main()
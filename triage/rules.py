@@ -0,0 +1,107 @@
+"""
+Rule-Based Risk Assessment
+Deterministic escalation decision from severity, crisis type and
+red-flag symptom matches - mirrors the rules in the assess_risk prompt
+"""
+
+from triage.keywords import match_categories, match_red_flags, AMBIGUOUS_KEYWORDS
+
+# Red flags where minutes matter - call an ambulance whatever the severity label
+AMBULANCE_RED_FLAGS = {
+    "chest pain",
+    "difficulty breathing",
+    "unconscious",
+    "severe bleeding",
+    "stroke symptoms",
+    "severe allergic reaction",
+    "choking",
+    "seizure"
+}
+
+# Crisis type reported for each MEDICAL_CRISIS_KEYWORDS category
+CATEGORY_CRISIS_TYPES = {
+    "cardiac": "Possible cardiac emergency",
+    "respiratory": "Breathing difficulty",
+    "neurological": "Neurological symptoms",
+    "trauma": "Injury or bleeding",
+    "allergic": "Allergic reaction",
+    "fever": "Fever",
+    "poisoning": "Suspected poisoning",
+    "pain": "Severe pain"
+}
+
+
+def evaluate_escalation(normalized_input: str, severity: str, crisis_type: str) -> dict:
+    """
+    Decide escalation without an LLM call
+
+    Returns a dict shaped like the assess_risk LLM response:
+    escalation_required, who_to_contact, reason, plus the red_flags matched.
+    """
+    red_flags = match_red_flags(f"{normalized_input} {crisis_type}")
+    urgent_flags = [flag for flag in red_flags if flag in AMBULANCE_RED_FLAGS]
+    flag_text = ", ".join(red_flags)
+
+    if severity == "critical" or urgent_flags:
+        required, contacts = True, ["ambulance", "relative"]
+        reason = (f"Red-flag symptoms present ({flag_text}) - call an ambulance now"
+                  if red_flags else "Critical severity - immediate emergency response needed")
+    elif severity == "high" or red_flags:
+        required, contacts = True, ["nearby hospital", "relative"]
+        reason = (f"Red-flag symptoms present ({flag_text}) - urgent medical care needed"
+                  if red_flags else "High severity - urgent medical care needed")
+    elif severity == "moderate":
+        required, contacts = False, ["relative", "friend"]
+        reason = "No red-flag symptoms - seek medical attention soon and keep someone informed"
+    else:
+        required, contacts = False, []
+        reason = "Low severity with no red-flag symptoms - monitor and follow the steps"
+
+    return {
+        "escalation_required": required,
+        "who_to_contact": contacts,
+        "reason": reason,
+        "red_flags": red_flags
+    }
+
+
+def triage_severity(normalized_input: str) -> str:
+    """
+    Keyword-only severity estimate: urgent red flag -> critical, other red
+    flag -> high, unambiguous medical keyword -> moderate, otherwise low
+    """
+    red_flags = match_red_flags(normalized_input)
+    if any(flag in AMBULANCE_RED_FLAGS for flag in red_flags):
+        return "critical"
+    if red_flags:
+        return "high"
+    categories = match_categories(normalized_input)
+    if any(kw not in AMBIGUOUS_KEYWORDS for found in categories.values() for kw in found):
+        return "moderate"
+    return "low"
+
+
+def classify_by_rules(normalized_input: str) -> dict:
+    """
+    Classify without an LLM call (degraded mode): crisis type from the
+    best-matching keyword category, severity from triage_severity
+    """
+    categories = match_categories(normalized_input)
+    red_flags = match_red_flags(normalized_input)
+    if categories:
+        category = max(categories, key=lambda c: len(categories[c]))
+        crisis_type = CATEGORY_CRISIS_TYPES.get(category, category.title())
+    elif red_flags:
+        crisis_type = red_flags[0].capitalize()
+    else:
+        crisis_type = "Unclassified health concern"
+    severity = triage_severity(normalized_input)
+    return {
+        "crisis_type": crisis_type,
+        "severity_level": severity,
+        "assessment": (
+            f"Quick keyword-based assessment ({crisis_type}, {severity} severity) - the full "
+            "analysis is unavailable right now. Follow the steps below and seek medical help "
+            "if anything gets worse."
+        )
+    }